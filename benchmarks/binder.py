@@ -0,0 +1,44 @@
+"""
+Micro-benchmark comparing the compiled Binder against Signature.bind.
+
+Usage:
+    python -m benchmarks.binder [--number N]
+"""
+
+import argparse
+import inspect
+import timeit
+from inspect import Signature
+from typing import Any, Callable, Dict, List, Tuple
+
+from router.packaging import Binder
+
+
+def keywords(self, context, *, name, count='1', verbose='false'): pass
+def positional(self, first, second, /, third='3'): pass
+def variadic(self, context, *args, scale='1', **kwargs): pass
+
+CASES: List[Tuple[str, Callable, Tuple[Any, ...], Dict[str, Any]]] = [
+    ('keywords', keywords, ('self', 'context'), {'name': 'value', 'count': '2'}),
+    ('positional', positional, ('self', 'first', 'second'), {'third': 'value'}),
+    ('variadic', variadic, ('self', 'context'), {'scale': '2', 'extra': 'value'}),
+]
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=200000, help='iterations per measurement')
+    options: argparse.Namespace = parser.parse_args()
+
+    print(f'{"case":<12}{"Signature.bind":>18}{"Binder.bind":>18}{"speedup":>10}')
+    for name, function, args, kwargs in CASES:
+        signature: Signature = inspect.signature(function)
+        binder: Binder = Binder(signature)
+        baseline: float = timeit.timeit(lambda: signature.bind(*args, **kwargs), number=options.number)
+        compiled: float = timeit.timeit(lambda: binder.bind(args, kwargs), number=options.number)
+        # report the per-call cost in nanoseconds
+        print(f'{name:<12}{baseline / options.number * 1e9:>15.0f} ns{compiled / options.number * 1e9:>15.0f} ns{baseline / compiled:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
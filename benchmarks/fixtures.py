@@ -0,0 +1,61 @@
+"""
+Synthetic package directories and message corpora for the benchmark suite.
+"""
+
+import random
+from pathlib import Path
+from typing import List
+
+# the parameter value shapes of each corpus
+CORPORA: List[str] = ['short', 'long', 'pathological']
+
+
+def command_name(file: int, component: int, command: int) -> str:
+    """
+    Get the name of a generated command; names are unique across the generated packages.
+    """
+    return f'command_{file}_{component}_{command}'
+
+
+def write_packages(directory: Path, files: int, components: int, commands: int) -> List[str]:
+    """
+    Write package files to a directory, returning the generated command names.
+    Each command accepts a context argument and a few keyword parameters.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    names: List[str] = list()
+    for file in range(files):
+        lines: List[str] = [f'"""Generated package {file}."""', '']
+        for component in range(components):
+            lines += [f'class Component{component}:', '', '    def __init__(self, *args, **kwargs):', '        pass', '']
+            for command in range(commands):
+                name: str = command_name(file, component, command)
+                lines += [f'    def {name}(self, context, first=None, second=None, third=None):', '        return first', '']
+                names.append(name)
+        directory.joinpath(f'package_{file}.py').write_text('\n'.join(lines))
+    return names
+
+
+def corpus(kind: str, names: List[str], count: int, seed: int = 0) -> List[str]:
+    """
+    Generate messages dispatching the provided command names.
+
+    - short: a few one-word parameter values
+    - long: multi-word parameter values of a few hundred characters
+    - pathological: long values full of dashes and punctuation, which defeat boundary scanning
+    """
+    generator: random.Random = random.Random(seed)
+    messages: List[str] = list()
+    for _ in range(count):
+        name: str = generator.choice(names)
+        if kind == 'short':
+            messages.append(f'{name} -first alpha -second beta')
+        elif kind == 'long':
+            words: str = ' '.join(generator.choice(['alpha', 'beta', 'gamma', 'delta', 'epsilon']) for _ in range(60))
+            messages.append(f'{name} -first {words} -second {words} -third {words}')
+        elif kind == 'pathological':
+            value: str = ' '.join(f'x-{index}-!' for index in range(100))
+            messages.append(f'{name} -first {value} -second {"- " * 100}end')
+        else:
+            raise ValueError(f'Unknown corpus {kind}; expected one of {", ".join(CORPORA)}')
+    return messages
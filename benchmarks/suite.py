@@ -0,0 +1,294 @@
+"""
+Benchmark suite for the parse, dispatch, load and configuration paths.
+
+Generates synthetic package directories and message corpora, then measures throughput,
+p50/p99 latency, load time and memory for each subsystem. Results are printed as a table
+and can be written as JSON, and compared against a previous run to track regressions.
+
+Usage:
+    python -m benchmarks.suite [--quick] [--only PREFIX] [--output FILE] [--compare FILE] [--threshold PERCENT]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from router import Handler, RegexParser, TokenParser
+from router.configuration import Configuration, MemoryBackend, Section, SQLiteBackend
+
+from .fixtures import CORPORA, corpus, write_packages
+
+Result = Dict[str, Any]
+
+# the generated workload sizes
+SIZES: Dict[str, Dict[str, int]] = {
+    'full': {'files': 50, 'components': 4, 'commands': 10, 'messages': 2000, 'keys': 5000, 'repeats': 5},
+    'quick': {'files': 5, 'components': 2, 'commands': 5, 'messages': 200, 'keys': 200, 'repeats': 2},
+}
+
+
+def summarize(durations: List[int]) -> Result:
+    """
+    Summarize per-operation durations in nanoseconds.
+    """
+    ordered: List[int] = sorted(durations)
+    total: int = sum(ordered)
+    return {
+        'samples': len(ordered),
+        'ops_per_sec': len(ordered) / (total / 1e9) if total else None,
+        'mean_us': total / len(ordered) / 1e3,
+        'p50_us': ordered[len(ordered) // 2] / 1e3,
+        'p99_us': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] / 1e3,
+    }
+
+
+def measure(operation: Callable[[Any], Any], items: Iterable[Any]) -> Result:
+    """
+    Time an operation once per item.
+    """
+    durations: List[int] = list()
+    for item in items:
+        start: int = time.perf_counter_ns()
+        operation(item)
+        durations.append(time.perf_counter_ns() - start)
+    return summarize(durations)
+
+
+async def measure_async(operation: Callable[[Any], Awaitable[Any]], items: Iterable[Any]) -> Result:
+    """
+    Time an asynchronous operation once per item.
+    """
+    durations: List[int] = list()
+    for item in items:
+        start: int = time.perf_counter_ns()
+        await operation(item)
+        durations.append(time.perf_counter_ns() - start)
+    return summarize(durations)
+
+
+def allocations(operation: Callable[[], Any]) -> Result:
+    """
+    Measure the memory an operation retains and its peak allocation, in bytes.
+    The result of the operation is kept alive until measured.
+    """
+    tracemalloc.start()
+    try:
+        baseline: int = tracemalloc.get_traced_memory()[0]
+        result: Any = operation()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {'retained_bytes': current - baseline, 'peak_bytes': peak - baseline}
+
+
+def bench_parse(sizes: Dict[str, int], names: List[str]) -> Dict[str, Result]:
+    results: Dict[str, Result] = dict()
+    for kind in CORPORA:
+        messages: List[str] = corpus(kind, names, sizes['messages'])
+        for parser in (TokenParser(), RegexParser()):
+            results[f'parse.{type(parser).__name__}.{kind}'] = measure(parser.parse, messages)
+    return results
+
+
+def bench_dispatch(sizes: Dict[str, int], names: List[str], directory: Path) -> Dict[str, Result]:
+    handler: Handler = Handler()
+    handler.load(directory)
+    cached: Handler = Handler(message_cache=1024)
+    cached.load(directory)
+    context: List[Any] = [object()]
+    results: Dict[str, Result] = dict()
+
+    async def run() -> None:
+        for kind in CORPORA:
+            messages: List[str] = corpus(kind, names, sizes['messages'])
+            results[f'dispatch.process.{kind}'] = await measure_async(lambda message: handler.process(message, args=context), messages)
+        # measure batch throughput through process_many
+        messages: List[str] = corpus('short', names, sizes['messages'])
+        start: int = time.perf_counter_ns()
+        async for _ in handler.process_many(messages, args=context): pass
+        elapsed: int = time.perf_counter_ns() - start
+        results['dispatch.process_many.short'] = {'samples': len(messages), 'ops_per_sec': len(messages) / (elapsed / 1e9)}
+        # measure repeated messages through the message cache
+        repeated: List[str] = corpus('short', names[:16], sizes['messages'])
+        results['dispatch.process.repeated'] = await measure_async(lambda message: handler.process(message, args=context), repeated)
+        results['dispatch.cached.repeated'] = await measure_async(lambda message: cached.process(message, args=context), repeated)
+
+    asyncio.run(run())
+    # measure the peak allocation of dispatching the short corpus
+    messages: List[str] = corpus('short', names, sizes['messages'])
+    results['dispatch.process.short'].update(allocations(lambda: asyncio.run(_process_all(handler, messages, context))))
+    handler.shutdown()
+    cached.shutdown()
+    return results
+
+
+async def _process_all(handler: Handler, messages: List[str], context: List[Any]) -> None:
+    for message in messages: await handler.process(message, args=context)
+
+
+def bench_load(sizes: Dict[str, int], directory: Path) -> Dict[str, Result]:
+    modes: Dict[str, Callable[[], Handler]] = {
+        'eager': lambda: Handler(),
+        'parallel': lambda: Handler(load_workers=4),
+        'lazy': lambda: Handler(lazy=True),
+        'lazy_manifest': lambda: Handler(lazy=True, manifest=True),
+    }
+    # write the manifest once so lazy manifest loads read fresh records
+    Handler(manifest=True).load(directory)
+    results: Dict[str, Result] = dict()
+    for mode, factory in modes.items():
+        durations: List[int] = list()
+        for _ in range(sizes['repeats']):
+            handler: Handler = factory()
+            start: int = time.perf_counter_ns()
+            handler.load(directory)
+            durations.append(time.perf_counter_ns() - start)
+        result: Result = summarize(durations)
+        result['packages'] = sizes['files']
+        result['commands'] = sizes['files'] * sizes['components'] * sizes['commands']
+        result.update(allocations(lambda: _loaded(factory(), directory)))
+        results[f'load.{mode}'] = result
+    return results
+
+
+def _loaded(handler: Handler, directory: Path) -> Handler:
+    handler.load(directory)
+    return handler
+
+
+def bench_configuration(sizes: Dict[str, int], directory: Path) -> Dict[str, Result]:
+    keys: List[str] = [f'key_{index}' for index in range(sizes['keys'])]
+    source: Path = directory.joinpath('source.ini')
+    source.write_text('[general]\n' + ''.join(f'{key} = value {key}\n' for key in keys))
+    lookups: List[str] = random.Random(0).choices(keys, k=sizes['messages'])
+
+    def sqlite() -> Configuration:
+        backend: SQLiteBackend = SQLiteBackend(directory.joinpath('settings.db'))
+        backend.import_ini(source)
+        return Configuration(directory.joinpath('settings.db'), backend=backend)
+
+    def memory() -> Configuration:
+        backend: MemoryBackend = MemoryBackend()
+        backend.import_ini(source)
+        return Configuration(directory.joinpath('memory'), backend=backend)
+
+    backends: Dict[str, Callable[[], Configuration]] = {
+        'ini': lambda: Configuration(source),
+        'ini_cached': lambda: Configuration(source, cached=True),
+        'sqlite': sqlite,
+        'memory': memory,
+    }
+    results: Dict[str, Result] = dict()
+    for name, factory in backends.items():
+        configuration: Configuration = factory()
+        section: Section = configuration['general']
+        results[f'configuration.{name}.get'] = measure(section.__getitem__, lookups)
+        # writes rewrite the whole file for uncached INI configurations, so fewer are measured
+        writes: List[str] = lookups[:max(1, len(lookups) // 20)] if name == 'ini' else lookups
+        results[f'configuration.{name}.set'] = measure(lambda key: section.__setitem__(key, 'changed'), writes)
+        configuration.close()
+        results[f'configuration.{name}.get'].update(allocations(factory))
+    return results
+
+
+def run(sizes: Dict[str, int], only: Optional[str] = None) -> Dict[str, Result]:
+    """
+    Run the benchmarks whose names start with the provided prefix, or all of them.
+    """
+    results: Dict[str, Result] = dict()
+    with tempfile.TemporaryDirectory() as temporary:
+        root: Path = Path(temporary)
+        packages: Path = root.joinpath('packages')
+        names: List[str] = write_packages(packages, sizes['files'], sizes['components'], sizes['commands'])
+        suites: Dict[str, Callable[[], Dict[str, Result]]] = {
+            'parse': lambda: bench_parse(sizes, names),
+            'dispatch': lambda: bench_dispatch(sizes, names, packages),
+            'load': lambda: bench_load(sizes, packages),
+            'configuration': lambda: bench_configuration(sizes, root),
+        }
+        for name, suite in suites.items():
+            if only and not (name.startswith(only) or only.startswith(name)): continue
+            results.update({key: value for key, value in suite().items() if not only or key.startswith(only)})
+    return results
+
+
+def metadata(options: argparse.Namespace) -> Result:
+    """
+    Describe the environment, so results from different commits can be compared.
+    """
+    try:
+        commit: Optional[str] = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': 'quick' if options.quick else 'full',
+    }
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, Result], threshold: float) -> List[str]:
+    """
+    Print the throughput change of each benchmark against a baseline, returning the regressions.
+    """
+    regressions: List[str] = list()
+    print(f'\n{"benchmark":<44}{"baseline":>14}{"current":>14}{"change":>10}')
+    for name, result in results.items():
+        previous: Optional[float] = baseline.get(name, dict()).get('ops_per_sec')
+        current: Optional[float] = result.get('ops_per_sec')
+        if not previous or not current: continue
+        change: float = (current - previous) / previous * 100
+        flag: str = ''
+        if change < -threshold:
+            regressions.append(name)
+            flag = '  regression'
+        print(f'{name:<44}{previous:>14.0f}{current:>14.0f}{change:>9.1f}%{flag}')
+    return regressions
+
+
+def report(results: Dict[str, Result]) -> None:
+    print(f'{"benchmark":<44}{"ops/sec":>12}{"p50 us":>10}{"p99 us":>10}{"retained KiB":>14}{"peak KiB":>10}')
+    for name, result in results.items():
+        columns: List[str] = [
+            f'{result["ops_per_sec"]:>12.0f}' if result.get('ops_per_sec') else f'{"-":>12}',
+            f'{result["p50_us"]:>10.1f}' if 'p50_us' in result else f'{"-":>10}',
+            f'{result["p99_us"]:>10.1f}' if 'p99_us' in result else f'{"-":>10}',
+            f'{result["retained_bytes"] / 1024:>14.1f}' if 'retained_bytes' in result else f'{"-":>14}',
+            f'{result["peak_bytes"] / 1024:>10.1f}' if 'peak_bytes' in result else f'{"-":>10}',
+        ]
+        print(f'{name:<44}{"".join(columns)}')
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help='use small workloads')
+    parser.add_argument('--only', help='only run benchmarks whose names start with this prefix, e.g. parse or load.lazy')
+    parser.add_argument('--output', type=Path, help='write the results as JSON to this file')
+    parser.add_argument('--compare', type=Path, help='compare throughput against a previous JSON output')
+    parser.add_argument('--threshold', type=float, default=10.0, help='the throughput drop, in percent, reported as a regression')
+    options: argparse.Namespace = parser.parse_args()
+
+    results: Dict[str, Result] = run(SIZES['quick' if options.quick else 'full'], options.only)
+    report(results)
+    if options.output:
+        options.output.write_text(json.dumps({'meta': metadata(options), 'results': results}, indent=2, sort_keys=True))
+    if options.compare:
+        baseline: Dict[str, Result] = json.loads(options.compare.read_text())['results']
+        if compare(results, baseline, options.threshold): sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
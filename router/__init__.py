@@ -1,6 +1,12 @@
 from typing import List
 
+from .footprint import Footprint
 from .handler import Handler, HandlerError
+from .index import CommandIndex
+from .instrumentation import Call, Histogram, Hook, Metrics
+from .messages import MessageCache, MessageCacheInfo
+from .parsing import Parser, RegexParser, TokenParser
+from .supervisor import Routing, Supervisor
 
 """
 Command Router
@@ -13,6 +19,25 @@ __author__ = 'Nathan Latchaw'
 
 __all__: List[str] = [
     "Handler",
+    "CommandIndex",
+    "Supervisor",
+    "Routing",
+    "MessageCache",
+    "MessageCacheInfo",
+
+    # Parsers
+    "Parser",
+    "RegexParser",
+    "TokenParser",
+
+    # Instrumentation
+    "Hook",
+    "Call",
+    "Metrics",
+    "Histogram",
+
+    # Memory
+    "Footprint",
     
     # Handler Errors
     "HandlerError",
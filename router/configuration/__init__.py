@@ -1,9 +1,22 @@
 from typing import List
 
+from .backend import Backend
 from .configuration import Configuration
+from .file import ConfigurationFile
+from .memory import MemoryBackend
 from .section import Section
+from .shared import FileLock, SharedConfigurationFile
+from .sqlite import SQLiteBackend
 
 __all__: List[str] = [
     "Configuration",
-    "Section"
+    "ConfigurationFile",
+    "Section",
+    "SharedConfigurationFile",
+    "FileLock",
+
+    # Backends
+    "Backend",
+    "MemoryBackend",
+    "SQLiteBackend",
 ]
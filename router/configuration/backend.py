@@ -0,0 +1,187 @@
+import configparser
+import logging
+from configparser import ConfigParser
+from logging import Logger
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List
+
+__all__: List[str] = [
+    "Backend"
+]
+
+log: Logger = logging.getLogger(__name__)
+
+class Backend():
+    """
+    Base class for the storage behind a configuration and its sections.
+
+    A backend stores string entries in named sections. Entry keys are case-insensitive,
+    as with configparser. Each set or delete is committed when it is made, unless it is made
+    within a transaction, which commits all of its changes on exit or discards them on error.
+    """
+
+    @property
+    def reference(self) -> Path:
+        return self._reference
+
+    @property
+    def lock(self) -> ContextManager[Any]:
+        """
+        The lock to hold while changing the backend.
+        """
+        raise NotImplementedError()
+
+
+    def __init__(self, reference: Path) -> None:
+        # set the location of the stored configuration
+        self._reference: Path = reference
+        # the callbacks notified when changes made by others are read
+        self._subscribers: List[Callable[[Any], None]] = list()
+
+
+    def reading(self) -> ContextManager[Any]:
+        """
+        Get the lock to hold while reading from the backend.
+        """
+        return self.lock
+
+
+    def read(self) -> None:
+        """
+        Refresh the backend with changes made by others.
+        """
+        pass
+
+
+    def write(self) -> None:
+        """
+        Commit section additions and removals.
+        """
+        pass
+
+
+    def flush(self) -> None:
+        """
+        Write pending changes to storage.
+        """
+        pass
+
+
+    def close(self) -> None:
+        """
+        Write pending changes and release the backend's resources.
+        """
+        pass
+
+
+    def sections(self) -> List[str]:
+        """
+        Get the names of the sections.
+        """
+        raise NotImplementedError()
+
+
+    def add_section(self, section: str) -> None:
+        """
+        Add an empty section if it does not exist.
+        """
+        raise NotImplementedError()
+
+
+    def remove_section(self, section: str) -> None:
+        """
+        Remove a section and its entries.
+        """
+        raise NotImplementedError()
+
+
+    def get(self, section: str, key: str) -> str:
+        """
+        Get the value of an entry.
+
+        Raises:
+        - KeyError
+            upon a missing entry
+        - NoSectionError
+            upon a missing section
+        """
+        raise NotImplementedError()
+
+
+    def set(self, section: str, key: str, value: str) -> None:
+        """
+        Set the value of an entry.
+
+        Raises:
+        - NoSectionError
+            upon a missing section
+        """
+        raise NotImplementedError()
+
+
+    def delete(self, section: str, key: str) -> None:
+        """
+        Delete an entry.
+
+        Raises:
+        - KeyError
+            upon a missing entry
+        """
+        raise NotImplementedError()
+
+
+    def items(self, section: str) -> Dict[str, str]:
+        """
+        Get the entries of a section.
+        """
+        raise NotImplementedError()
+
+
+    def transaction(self) -> ContextManager[None]:
+        """
+        Group changes so they are committed together.
+        If the block raises, the changes are discarded. Nested transactions commit with the outermost one.
+        """
+        raise NotImplementedError()
+
+
+    def subscribe(self, callback: Callable[[Any], None]) -> None:
+        """
+        Register a callback notified with the new version when changes made by others are read.
+        """
+        self._subscribers.append(callback)
+
+
+    def import_ini(self, reference: Path) -> int:
+        """
+        Import the sections and entries of an INI file in one transaction, returning the number of entries.
+        Values are imported raw, without interpolation.
+        """
+        parser: ConfigParser = configparser.ConfigParser(interpolation=None)
+        parser.read(reference)
+        count: int = 0
+        with self.transaction():
+            for section in parser.sections():
+                self.add_section(section)
+                for key, value in parser.items(section, raw=True):
+                    self.set(section, key, value)
+                    count += 1
+            self.write()
+        log.debug('Imported %s entries from %s', count, reference.name)
+        return count
+
+
+    def __notify__(self, version: Any) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(version)
+            except Exception as error:
+                log.warning('Configuration change callback for %s failed: %s', self._reference.name, error)
+
+
+    @staticmethod
+    def __option__(key: str) -> str:
+        """
+        Normalize an entry key like configparser.
+        """
+        return key.lower()
@@ -2,11 +2,15 @@ import configparser
 import logging
 from collections.abc import MutableMapping
 from configparser import ConfigParser
+from contextlib import contextmanager
 from logging import Logger
 from pathlib import Path
-from typing import Dict, Iterator, List, MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Optional
 
+from .backend import Backend
+from .file import ConfigurationFile
 from .section import Section
+from .shared import SharedConfigurationFile
 
 __all__: List[str] = [
     "Configuration"
@@ -18,17 +22,19 @@ class Configuration(MutableMapping[str, str]):
 
     def __setitem__(self, key: str, value: Section) -> None:
         try:
-            self.__read__()
-            self._sections.__setitem__(key, value)
-            self.__write__()
+            with self._backend.lock:
+                self.__read__()
+                self._sections.__setitem__(key, value)
+                self.__write__()
             log.debug('Set entry %s:%s', self._name, key)
         except:
             raise
 
     def __getitem__(self, key: str) -> Section:
         try:
-            self.__read__()
-            section: Section = self._sections.__getitem__(key)
+            with self._backend.reading():
+                self.__read__()
+                section: Section = self._sections.__getitem__(key)
             log.debug('Get entry %s:%s', self._name, key)
             return section
         except KeyError:
@@ -36,11 +42,12 @@ class Configuration(MutableMapping[str, str]):
 
     def __delitem__(self, key: str) -> None:
         try:
-            section: Section = self.__getitem__(key)
-            section.clear()
-            self._parser.remove_section(section.name)
-            self._sections.__delitem__(key)
-            self.__write__()
+            with self._backend.lock:
+                section: Section = self.__getitem__(key)
+                # removing the section removes its entries
+                self._backend.remove_section(section.name)
+                self._sections.__delitem__(key)
+                self.__write__()
             log.debug('Del entry %s:%s', self._name, key)
         except:
             raise
@@ -55,19 +62,84 @@ class Configuration(MutableMapping[str, str]):
         return self._sections.__str__()
 
     def __write__(self) -> None:
-        with open(self._reference, 'w') as file:
-            self._parser.write(file)
-        log.debug('Wrote configuration state to %s', self._reference.name)
+        self._backend.write()
 
     def __read__(self) -> None:
-        self._parser.read(self._reference)
-        log.debug('Read configuration state from %s', self._reference.name)
+        self._backend.read()
 
-    def __init__(self, reference: Path) -> None:
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group section and entry changes so they are committed together.
+        If the block raises, the changes are discarded.
+        """
+        sections: Dict[str, Section] = dict(self._sections)
+        try:
+            with self._backend.transaction():
+                yield
+        except BaseException:
+            self._sections = sections
+            raise
+
+    def flush(self) -> None:
+        """Write pending changes to the configuration file."""
+        self._backend.flush()
+
+    def close(self) -> None:
+        """Flush pending changes and stop any scheduled flush or watcher."""
+        self._backend.close()
+
+    def subscribe(self, callback: Callable[[Any], None]) -> None:
+        """Register a callback notified when changes committed by other processes are read."""
+        self._backend.subscribe(callback)
+
+    def watch(self, interval: float = 1.0) -> None:
+        """
+        Poll for changes committed by other processes, notifying subscribers.
+        Only available for shared configurations.
+        """
+        if not isinstance(self._backend, SharedConfigurationFile): raise TypeError(f'Configuration {self._name} is not shared')
+        self._backend.watch(interval)
+
+    def __synchronize__(self, version: Any) -> None:
+        """Synchronize the sections with sections added or removed by other processes."""
+        sections: Dict[str, Section] = {name: self._sections.get(name) or Section(name, self._parser, self._reference, self._backend) for name in self._backend.sections()}
+        self._sections = sections
+        log.debug('Synchronized %s sections for configuration file %s at version %s', len(sections), self._reference.name, version)
+
+    def __init__(self, reference: Path, *, cached: bool = False, flush_interval: Optional[float] = None, shared: bool = False, backend: Optional[Backend] = None) -> None:
+        """
+        Initialize a configuration via its file path.
+
+        Parameters:
+        - cached:
+            serve reads from memory until the file changes, and defer writes until flushed
+        - flush_interval:
+            in cached mode, the seconds after a write before pending changes are flushed;
+            None flushes only on flush(), close() and at interpreter exit
+        - shared:
+            lock the file for safe use by several processes, re-reading it only when another
+            process commits a change; writes are never deferred in this mode
+        - backend:
+            the storage of the configuration, such as a SQLiteBackend or a MemoryBackend,
+            in place of the INI file at the reference; the other options then do not apply
+        """
         self._parser: ConfigParser = configparser.ConfigParser()
         self._reference: Path = reference.resolve()
         log.debug('Determined target configuration file %s at %s', self._reference.name, self._reference.parent)
         self._name: str = self._reference.stem
+        if backend: self._backend: Backend = backend
+        else: self._backend: Backend = self.__open__(cached, flush_interval, shared)
+        self.__read__()
+        log.debug('Completed initial configuration read for %s', self._reference.name)
+        sections: List[Section] = [Section(section, self._parser, self._reference, self._backend) for section in self._backend.sections()]
+        self._sections: Dict[str, Section] = {section.name: section for section in sections}
+        log.debug('Loaded %s sections for configuration file %s', len(self._sections), self._reference.name)
+        # follow sections added or removed by other processes
+        self._backend.subscribe(self.__synchronize__)
+
+    def __open__(self, cached: bool, flush_interval: Optional[float], shared: bool) -> ConfigurationFile:
+        """Create the configuration file if missing and open it."""
         if not self._reference.parent.exists():
             log.debug('Missing target configuration directory at %s', self._reference.parent)
             self._reference.parent.mkdir(parents=True, exist_ok=True)
@@ -76,11 +148,8 @@ class Configuration(MutableMapping[str, str]):
             log.debug('Missing target configuration file %s at %s', self._reference.name, self._reference.parent)
             self._reference.touch(exist_ok=True)
             log.debug('Created target configuration file %s at %s', self._reference.name, self._reference.parent)
-        self.__read__()
-        log.debug('Completed initial configuration read for %s', self._reference.name)
-        sections: List[Section] = [Section(section, self._parser, self._reference) for section in self._parser.sections()]
-        self._sections: Dict[str, Section] = {section.name: section for section in sections}
-        log.debug('Loaded %s sections for configuration file %s', len(self._sections), self._reference.name)
+        if shared: return SharedConfigurationFile(self._reference, self._parser)
+        return ConfigurationFile(self._reference, self._parser, cached, flush_interval)
 
     @property
     def name(self) -> str:
@@ -0,0 +1,240 @@
+import atexit
+import io
+import logging
+import os
+import stat
+import tempfile
+import threading
+import weakref
+from configparser import ConfigParser, NoOptionError
+from contextlib import contextmanager
+from logging import Logger
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .backend import Backend
+
+__all__: List[str] = [
+    "ConfigurationFile"
+]
+
+log: Logger = logging.getLogger(__name__)
+
+class ConfigurationFile(Backend):
+    """
+    The INI file backing a configuration, shared by the configuration and its sections.
+
+    By default every read parses the file and every write rewrites it.
+    In cached mode, reads are served from memory until the file's mtime or size changes,
+    and writes are coalesced and flushed after flush_interval seconds, on flush(), on close()
+    or at interpreter exit.
+
+    Within a transaction, the file is read once on entry and written once on exit.
+    Files are always written atomically via a temporary file that replaces the original.
+    """
+
+    @property
+    def parser(self) -> ConfigParser:
+        return self._parser
+
+    @property
+    def cached(self) -> bool:
+        return self._cached
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+
+    def __init__(self, reference: Path, parser: ConfigParser, cached: bool = False, flush_interval: Optional[float] = None) -> None:
+        super().__init__(reference.resolve())
+        self._parser: ConfigParser = parser
+        self._cached: bool = cached
+        self._flush_interval: Optional[float] = flush_interval
+        # the file's (mtime, size) when it was last read or written
+        self._stat: Optional[Tuple[int, int]] = None
+        # whether the parser holds changes not yet written to the file
+        self._dirty: bool = False
+        # the pending debounced flush
+        self._timer: Optional[threading.Timer] = None
+        # serializes parser changes with flushes from the timer thread
+        self._lock: threading.RLock = threading.RLock()
+        # the depth of nested transactions
+        self._depth: int = 0
+        # whether a transaction holds changes to commit on exit
+        self._pending: bool = False
+        # flush pending writes at interpreter exit without keeping the file alive
+        if self._cached: atexit.register(ConfigurationFile.__exit_flush__, weakref.ref(self))
+
+
+    def read(self) -> None:
+        """
+        Read the file into the parser.
+        In cached mode the file is only read if it changed since it was last read or written,
+        and pending writes take precedence over changes made by others.
+        """
+        with self._lock:
+            # a transaction reads the file once on entry
+            if self._depth: return
+            if self._cached:
+                if self._dirty: return
+                current: Optional[Tuple[int, int]] = self.__stat__()
+                if current == self._stat: return
+                self._stat = current
+            self._parser.read(self._reference)
+            log.debug('Read configuration state from %s', self._reference.name)
+
+
+    def write(self) -> None:
+        """
+        Write the parser to the file.
+        In cached mode the write is deferred until the next flush.
+        """
+        with self._lock:
+            # a transaction writes the file once on exit
+            if self._depth:
+                self._pending = True
+                return
+            if not self._cached:
+                self.__write__()
+                return
+            self._dirty = True
+            self.__schedule__()
+
+
+    def flush(self) -> None:
+        """
+        Write pending changes to the file.
+        """
+        with self._lock:
+            if self._timer: self._timer.cancel()
+            self._timer = None
+            if not self._dirty: return
+            self.__write__()
+            self._dirty = False
+            self._stat = self.__stat__()
+
+
+    def sections(self) -> List[str]:
+        return self._parser.sections()
+
+
+    def add_section(self, section: str) -> None:
+        if not self._parser.has_section(section): self._parser.add_section(section)
+
+
+    def remove_section(self, section: str) -> None:
+        self._parser.remove_section(section)
+
+
+    def get(self, section: str, key: str) -> str:
+        with self.reading():
+            self.read()
+            try:
+                return self._parser.get(section, key)
+            except NoOptionError:
+                raise KeyError(key)
+
+
+    def set(self, section: str, key: str, value: str) -> None:
+        with self._lock:
+            self.read()
+            self._parser.set(section, key, value)
+            self.write()
+
+
+    def delete(self, section: str, key: str) -> None:
+        with self._lock:
+            self.read()
+            if not self._parser.remove_option(section, key): raise KeyError(key)
+            self.write()
+
+
+    def items(self, section: str) -> Dict[str, str]:
+        return dict(self._parser.items(section))
+
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group changes so they are committed with one read and one write.
+        If the block raises, the parser is restored to its state on entry and nothing is written.
+        Nested transactions commit with the outermost one.
+        """
+        with self._lock:
+            if not self._depth:
+                self.read()
+                # snapshot the parser to roll back to
+                snapshot: io.StringIO = io.StringIO()
+                self._parser.write(snapshot)
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if not self._depth:
+                    self._pending = False
+                    self.__restore__(snapshot.getvalue())
+                raise
+            self._depth -= 1
+            if not self._depth and self._pending:
+                self._pending = False
+                self.write()
+
+
+    def close(self) -> None:
+        """
+        Flush pending changes and stop any scheduled flush.
+        """
+        self.flush()
+
+
+    def __write__(self) -> None:
+        # write to a temporary file in the same directory, then atomically replace the original
+        descriptor, temporary = tempfile.mkstemp(prefix=f'.{self._reference.name}.', suffix='.tmp', dir=self._reference.parent)
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                self._parser.write(file)
+            # keep the permissions of the original file
+            if self._reference.exists(): os.chmod(temporary, stat.S_IMODE(self._reference.stat().st_mode))
+            os.replace(temporary, self._reference)
+        except BaseException:
+            if os.path.exists(temporary): os.unlink(temporary)
+            raise
+        log.debug('Wrote configuration state to %s', self._reference.name)
+
+
+    def __restore__(self, state: str) -> None:
+        """
+        Replace the parser's contents with a previously written state.
+        """
+        for section in self._parser.sections(): self._parser.remove_section(section)
+        self._parser.read_string(state)
+
+
+    def __schedule__(self) -> None:
+        """
+        Schedule a debounced flush if a flush interval is set and none is pending.
+        """
+        if self._flush_interval is None or self._timer: return
+        self._timer = threading.Timer(self._flush_interval, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+    def __stat__(self) -> Optional[Tuple[int, int]]:
+        try:
+            result: os.stat_result = self._reference.stat()
+        except FileNotFoundError:
+            return None
+        return result.st_mtime_ns, result.st_size
+
+
+    @staticmethod
+    def __exit_flush__(reference: 'weakref.ReferenceType[ConfigurationFile]') -> None:
+        file: Optional[ConfigurationFile] = reference()
+        if file: file.flush()
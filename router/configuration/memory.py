@@ -0,0 +1,90 @@
+import copy
+import logging
+import threading
+from configparser import NoSectionError
+from contextlib import contextmanager
+from logging import Logger
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .backend import Backend
+
+__all__: List[str] = [
+    "MemoryBackend"
+]
+
+log: Logger = logging.getLogger(__name__)
+
+class MemoryBackend(Backend):
+    """
+    A configuration backend held in memory, for tests and throwaway configurations.
+    Nothing is persisted.
+    """
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+
+    def __init__(self, reference: Optional[Path] = None, sections: Optional[Dict[str, Dict[str, str]]] = None) -> None:
+        super().__init__(reference if reference else Path('memory'))
+        # the entries of each section, keyed by normalized key
+        self._sections: Dict[str, Dict[str, str]] = {name: {self.__option__(key): value for key, value in entries.items()} for name, entries in (sections or dict()).items()}
+        self._lock: threading.RLock = threading.RLock()
+        # the depth of nested transactions
+        self._depth: int = 0
+
+
+    def sections(self) -> List[str]:
+        return list(self._sections)
+
+
+    def add_section(self, section: str) -> None:
+        with self._lock:
+            self._sections.setdefault(section, dict())
+
+
+    def remove_section(self, section: str) -> None:
+        with self._lock:
+            self._sections.pop(section, None)
+
+
+    def get(self, section: str, key: str) -> str:
+        return self.__section__(section)[self.__option__(key)]
+
+
+    def set(self, section: str, key: str, value: str) -> None:
+        if not isinstance(value, str): raise TypeError('option values must be strings')
+        with self._lock:
+            self.__section__(section)[self.__option__(key)] = value
+
+
+    def delete(self, section: str, key: str) -> None:
+        with self._lock:
+            del self.__section__(section)[self.__option__(key)]
+
+
+    def items(self, section: str) -> Dict[str, str]:
+        return dict(self.__section__(section))
+
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            # snapshot the sections to roll back to
+            if not self._depth: snapshot: Dict[str, Dict[str, str]] = copy.deepcopy(self._sections)
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if not self._depth: self._sections = snapshot
+                raise
+            self._depth -= 1
+
+
+    def __section__(self, section: str) -> Dict[str, str]:
+        try:
+            return self._sections[section]
+        except KeyError:
+            raise NoSectionError(section)
@@ -1,9 +1,12 @@
 import logging
 from collections.abc import MutableMapping
-from configparser import ConfigParser, NoOptionError
+from configparser import ConfigParser
 from logging import Logger
 from pathlib import Path
-from typing import Dict, Iterator, List
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+from .backend import Backend
+from .file import ConfigurationFile
 
 __all__: List[str] = [
     "Section"
@@ -15,55 +18,49 @@ class Section(MutableMapping[str, str]):
 
     def __setitem__(self, key: str, value: str) -> None:
         try:
-            self.__read__()
-            self._parser.set(self._name, key, value)
-            self.__write__()
+            self._backend.set(self._name, key, value)
             log.debug('Set entry %s:%s:%s', self._reference.name, self._name, key)
         except:
             raise
 
     def __getitem__(self, key: str) -> str | None:
         try:
-            self.__read__()
-            entry: str = self._parser.get(self._name, key)
+            entry: str = self._backend.get(self._name, key)
             log.debug('Get entry %s:%s:%s', self._reference.name, self._name, key)
             return entry
-        except NoOptionError:
-            raise KeyError(key)
+        except KeyError:
+            raise
 
     def __delitem__(self, key: str) -> None:
         try:
-            key: str = self.__getitem__(key)
-            self._parser.remove_option(self._name, key)
-            self.__write__()
+            self._backend.delete(self._name, key)
             log.debug('Del entry %s:%s:%s', self._reference.name, self._name, key)
         except:
             raise
 
     def __iter__(self) -> Iterator[Dict[str, str]]:
-        return iter({key: value for key, value in self._parser.items(self._name)})
+        return iter(self._backend.items(self._name))
 
     def __len__(self) -> int:
-        return len({key: value for key, value in self._parser.items(self._name)})
+        return len(self._backend.items(self._name))
 
     def __str__(self) -> str:
-        return str({key: value for key, value in self._parser.items(self._name)})
+        return str(self._backend.items(self._name))
 
-    def __write__(self) -> None:
-        with open(self._reference, 'w') as file:
-            self._parser.write(file)
+    def batch(self) -> ContextManager[None]:
+        """
+        Group sets and deletes so they are committed together.
+        """
+        return self._backend.transaction()
 
-    def __read__(self) -> None:
-        self._parser.read(self._reference)
-
-    def __init__(self, name: str, parser: ConfigParser, reference: Path) -> None:
-        self._parser: ConfigParser = parser
+    def __init__(self, name: str, parser: Optional[ConfigParser], reference: Path, backend: Optional[Backend] = None) -> None:
         self._reference: Path = reference.resolve()
+        self._backend: Backend = backend if backend else ConfigurationFile(self._reference, parser)
         self._name: str = name
-        if not self._parser.has_section(self._name):
-            log.debug('Missing target configuration section %s:%s', self._reference.name, self._name)
-            self._parser.add_section(self._name)
+        if self._name not in self._backend.sections():
             log.debug('Missing target configuration section %s:%s', self._reference.name, self._name)
+            self._backend.add_section(self._name)
+            log.debug('Created target configuration section %s:%s', self._reference.name, self._name)
 
     @property
     def name(self) -> str:
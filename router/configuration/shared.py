@@ -0,0 +1,238 @@
+import logging
+import threading
+from configparser import ConfigParser
+from contextlib import contextmanager
+from logging import Logger
+from pathlib import Path
+from typing import IO, Any, ContextManager, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+from .file import ConfigurationFile
+
+__all__: List[str] = [
+    "FileLock",
+    "SharedConfigurationFile",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+class FileLock():
+    """
+    An inter-process advisory lock on a lock file, reentrant within the process.
+
+    The lock file also holds the version of the configuration file it guards,
+    which writers increment under the exclusive lock.
+    Shared locks fall back to exclusive locks on platforms without shared file locks.
+    """
+
+    @property
+    def reference(self) -> Path:
+        return self._reference
+
+
+    def __init__(self, reference: Path) -> None:
+        self._reference: Path = reference
+        # serializes threads of this process; the file lock serializes processes
+        self._lock: threading.RLock = threading.RLock()
+        # the number of nested acquisitions by the owning thread
+        self._depth: int = 0
+        self._file: Optional[IO[str]] = None
+
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+    def acquire(self, shared: bool = False) -> None:
+        """
+        Acquire the lock, blocking until it is available.
+        Nested acquisitions by the owning thread keep the outermost lock mode.
+        """
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self._reference, 'a+')
+                self.__lock__(shared)
+            except BaseException:
+                if self._file: self._file.close()
+                self._file = None
+                self._lock.release()
+                raise
+        self._depth += 1
+
+
+    def release(self) -> None:
+        """
+        Release one acquisition of the lock.
+        """
+        self._depth -= 1
+        if self._depth == 0:
+            self.__unlock__()
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+
+    @contextmanager
+    def shared(self) -> Iterator['FileLock']:
+        """
+        Hold the lock in shared mode, or nest within an exclusive lock already held.
+        """
+        self.acquire(shared=True)
+        try:
+            yield self
+        finally:
+            self.release()
+
+
+    def version(self) -> int:
+        """
+        Get the version recorded in the lock file. The lock must be held.
+        """
+        self._file.seek(0)
+        content: str = self._file.read().strip()
+        return int(content) if content.isdigit() else 0
+
+
+    def increment(self) -> int:
+        """
+        Increment the version recorded in the lock file. The exclusive lock must be held.
+        """
+        version: int = self.version() + 1
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(str(version))
+        self._file.flush()
+        return version
+
+
+    def __lock__(self, shared: bool) -> None:
+        if fcntl:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        elif msvcrt:
+            self._file.seek(0)
+            # LK_LOCK gives up after ten one-second attempts; keep retrying so the lock blocks like flock
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    self._file.seek(0)
+
+
+    def __unlock__(self) -> None:
+        if fcntl:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        elif msvcrt:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SharedConfigurationFile(ConfigurationFile):
+    """
+    A configuration file shared safely between processes.
+
+    Reads hold a shared file lock and only parse the file when its version changed.
+    Writes hold an exclusive file lock, re-read the file if another process changed it,
+    and increment the version when committed. Subscribers are notified when a read
+    observes a change committed by another process; watch() polls for such changes.
+    Writes are never deferred, so other processes always observe committed changes.
+    """
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+
+    def __init__(self, reference: Path, parser: ConfigParser) -> None:
+        super().__init__(reference, parser)
+        # replace the thread lock with the inter-process lock
+        self._lock: FileLock = FileLock(self._reference.with_name(f'{self._reference.name}.lock'))
+        # the version of the file last read or written; None until the first read
+        self._version: Optional[int] = None
+        # the polling watcher thread and its stop signal
+        self._watcher: Optional[threading.Thread] = None
+        self._stopped: threading.Event = threading.Event()
+
+
+    @property
+    def lock(self) -> FileLock:
+        return self._lock
+
+
+    def reading(self) -> ContextManager[Any]:
+        return self._lock.shared()
+
+
+    def read(self) -> None:
+        """
+        Read the file into the parser if another process committed a change since it was last read.
+        """
+        with self._lock.shared():
+            # a transaction reads the file once on entry
+            if self._depth: return
+            version: int = self._lock.version()
+            if version == self._version: return
+            # replace the parser's contents so removals by other processes are observed
+            for section in self._parser.sections(): self._parser.remove_section(section)
+            self._parser.read(self._reference)
+            previous, self._version = self._version, version
+            log.debug('Read configuration state version %s from %s', version, self._reference.name)
+        if previous is not None: self.__notify__(version)
+
+
+    def write(self) -> None:
+        """
+        Write the parser to the file and commit a new version.
+        """
+        with self._lock:
+            # a transaction writes the file once on exit
+            if self._depth:
+                self._pending = True
+                return
+            self.__write__()
+            self._version = self._lock.increment()
+
+
+    def flush(self) -> None:
+        # writes are committed immediately
+        pass
+
+
+    def close(self) -> None:
+        """
+        Stop the watcher, if any.
+        """
+        self._stopped.set()
+        if self._watcher and self._watcher is not threading.current_thread(): self._watcher.join()
+        self._watcher = None
+
+
+    def watch(self, interval: float = 1.0) -> None:
+        """
+        Poll for changes committed by other processes on a background thread, notifying subscribers.
+        """
+        if self._watcher: return
+        self._stopped.clear()
+        self._watcher = threading.Thread(target=self.__poll__, args=(interval,), name=f'router-watch-{self._reference.name}', daemon=True)
+        self._watcher.start()
+
+
+    def __poll__(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            try:
+                self.read()
+            except Exception as error:
+                log.warning('Failed to poll configuration %s: %s', self._reference.name, error)
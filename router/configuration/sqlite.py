@@ -0,0 +1,154 @@
+import configparser
+import logging
+import sqlite3
+import threading
+from configparser import ConfigParser, NoSectionError
+from contextlib import contextmanager
+from logging import Logger
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .backend import Backend
+
+__all__: List[str] = [
+    "SQLiteBackend"
+]
+
+log: Logger = logging.getLogger(__name__)
+
+SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS sections (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS entries (
+    section TEXT NOT NULL REFERENCES sections (name) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (section, key)
+);
+'''
+
+UPSERT: str = 'INSERT INTO entries (section, key, value) VALUES (?, ?, ?) ON CONFLICT (section, key) DO UPDATE SET value = excluded.value'
+
+class SQLiteBackend(Backend):
+    """
+    A configuration backend stored in a SQLite database.
+
+    Each get, set and delete reads or writes a single row, so changes never rewrite the file
+    and large configurations stay fast. The database uses write-ahead logging, so several
+    processes can read while one writes. Values are stored raw, without interpolation.
+    """
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+
+    def __init__(self, reference: Path, timeout: float = 5.0) -> None:
+        """
+        Open or create the database at the reference.
+
+        Parameters:
+        - timeout:
+            the seconds to wait for another process's write to complete
+        """
+        super().__init__(reference.resolve())
+        self._reference.parent.mkdir(parents=True, exist_ok=True)
+        # serializes use of the connection between threads
+        self._lock: threading.RLock = threading.RLock()
+        # the depth of nested transactions
+        self._depth: int = 0
+        # autocommit each statement unless a transaction is open
+        self._connection: sqlite3.Connection = sqlite3.connect(self._reference, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode = WAL')
+        self._connection.execute('PRAGMA synchronous = NORMAL')
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        self._connection.executescript(SCHEMA)
+        log.debug('Opened configuration database %s', self._reference.name)
+
+
+    def sections(self) -> List[str]:
+        with self._lock:
+            return [name for name, in self._connection.execute('SELECT name FROM sections ORDER BY rowid')]
+
+
+    def add_section(self, section: str) -> None:
+        with self._lock:
+            self._connection.execute('INSERT OR IGNORE INTO sections (name) VALUES (?)', (section,))
+
+
+    def remove_section(self, section: str) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM sections WHERE name = ?', (section,))
+
+
+    def get(self, section: str, key: str) -> str:
+        with self._lock:
+            row: Optional[Tuple[str]] = self._connection.execute('SELECT value FROM entries WHERE section = ? AND key = ?', (section, self.__option__(key))).fetchone()
+            if row is None:
+                self.__require__(section)
+                raise KeyError(key)
+            return row[0]
+
+
+    def set(self, section: str, key: str, value: str) -> None:
+        if not isinstance(value, str): raise TypeError('option values must be strings')
+        with self._lock:
+            try:
+                self._connection.execute(UPSERT, (section, self.__option__(key), value))
+            except sqlite3.IntegrityError:
+                raise NoSectionError(section)
+
+
+    def delete(self, section: str, key: str) -> None:
+        with self._lock:
+            cursor: sqlite3.Cursor = self._connection.execute('DELETE FROM entries WHERE section = ? AND key = ?', (section, self.__option__(key)))
+            if not cursor.rowcount:
+                self.__require__(section)
+                raise KeyError(key)
+
+
+    def items(self, section: str) -> Dict[str, str]:
+        with self._lock:
+            entries: Dict[str, str] = dict(self._connection.execute('SELECT key, value FROM entries WHERE section = ? ORDER BY rowid', (section,)))
+            if not entries: self.__require__(section)
+            return entries
+
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            # take the write lock up front so the transaction cannot fail to upgrade later
+            if not self._depth: self._connection.execute('BEGIN IMMEDIATE')
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if not self._depth: self._connection.execute('ROLLBACK')
+                raise
+            self._depth -= 1
+            if not self._depth: self._connection.execute('COMMIT')
+
+
+    def import_ini(self, reference: Path) -> int:
+        parser: ConfigParser = configparser.ConfigParser(interpolation=None)
+        parser.read(reference)
+        rows: List[Tuple[str, str, str]] = [(section, key, value) for section in parser.sections() for key, value in parser.items(section, raw=True)]
+        with self.transaction():
+            self._connection.executemany('INSERT OR IGNORE INTO sections (name) VALUES (?)', [(section,) for section in parser.sections()])
+            self._connection.executemany(UPSERT, rows)
+        log.debug('Imported %s entries from %s into %s', len(rows), reference.name, self._reference.name)
+        return len(rows)
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+    def __require__(self, section: str) -> None:
+        """
+        Raise NoSectionError upon a missing section.
+        """
+        if self._connection.execute('SELECT 1 FROM sections WHERE name = ?', (section,)).fetchone() is None: raise NoSectionError(section)
@@ -0,0 +1,95 @@
+import gc
+import json
+import sys
+from types import BuiltinFunctionType, CodeType, FunctionType, ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+__all__: List[str] = [
+    "Footprint",
+    "sizeof",
+]
+
+# objects shared with the interpreter, which are never attributed to a router object
+SHARED: Tuple[type, ...] = (type, ModuleType, FunctionType, BuiltinFunctionType, CodeType)
+
+# the key of each level's children in a snapshot
+CHILDREN: Dict[str, str] = {
+    'handler': 'packages',
+    'package': 'components',
+    'component': 'commands',
+}
+
+
+def sizeof(obj: Any, seen: Set[int]) -> int:
+    """
+    Get the bytes of an object and every object it references that has not been seen yet.
+
+    Seen objects are skipped and newly measured objects are added to the set, so objects
+    referenced from several places are attributed to the first one measured. Classes, modules,
+    functions and code objects are shared with the interpreter and never counted.
+    The object itself is always counted, even if it was seen.
+    """
+    seen.add(id(obj))
+    total: int = sys.getsizeof(obj)
+    pending: List[Any] = gc.get_referents(obj)
+    while pending:
+        current: Any = pending.pop()
+        if id(current) in seen or isinstance(current, SHARED): continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        pending.extend(gc.get_referents(current))
+    return total
+
+
+class Footprint():
+    """
+    The memory attributed to a handler, package, component or command, in bytes.
+
+    Each object's own bytes exclude its children, which are reported separately;
+    use total for the bytes including children.
+    """
+
+    __slots__ = ('_kind', '_name', '_bytes', '_children')
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def children(self) -> Dict[str, 'Footprint']:
+        return self._children
+
+    @property
+    def total(self) -> int:
+        return self._bytes + sum(child.total for child in self._children.values())
+
+
+    def __init__(self, kind: str, name: str, bytes: int = 0, children: Optional[Iterable['Footprint']] = None) -> None:
+        self._kind: str = kind
+        self._name: str = name
+        self._bytes: int = bytes
+        self._children: Dict[str, Footprint] = {child.name: child for child in children} if children else dict()
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the footprint and its children's footprints.
+        """
+        snapshot: Dict[str, Any] = {'bytes': self._bytes, 'total': self.total}
+        if self._kind in CHILDREN: snapshot[CHILDREN[self._kind]] = {name: child.snapshot() for name, child in self._children.items()}
+        return snapshot
+
+
+    def export(self) -> str:
+        """
+        Get the footprint as JSON.
+        """
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
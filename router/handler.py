@@ -1,71 +1,418 @@
+import asyncio
+import functools
 import logging
-import re
-from inspect import BoundArguments
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import AsyncIterable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.context import BaseContext
+from inspect import Signature
 from logging import Logger
 from pathlib import Path
-from typing import Any, Dict, List, Match, Optional, Pattern, Tuple
+from types import MappingProxyType, MethodType, ModuleType
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
-from .packaging import Command, CommandError, Component, Package
+from .footprint import Footprint, sizeof
+from .index import CommandIndex
+from .instrumentation import Call, Hook
+from .messages import MessageCache, Plan
+from .packaging import Binder, Command, CommandError, CommandTimeoutError, Component, ExecutionPolicy, Limiter, LoadShedError, Manifest, Package, ResultCache, Stream, discover
+from .parsing import Parser, compile_parser
 
 log: Logger = logging.getLogger(__name__)
 
 class Handler():
 
-    def __init__(self, parameter_prefix: str = '-'):
+    @property
+    def parser(self) -> Parser:
+        return self._parser
+
+    @property
+    def index(self) -> CommandIndex['Entry']:
+        return self._index
+
+    @property
+    def hooks(self) -> Tuple[Hook, ...]:
+        return self._hooks
+
+    @property
+    def message_cache(self) -> Optional[MessageCache]:
+        return self._messages
+
+
+    def __init__(self, parameter_prefix: str = '-', *, parser: Optional[Parser] = None, thread_workers: Optional[int] = None, process_workers: Optional[int] = None, load_workers: Optional[int] = None, lazy: bool = False, manifest: bool = False, prefix_matching: bool = False, message_cache: int = 0, timeout: Optional[float] = None):
         # set the parameter prefix
         self._parameter_prefix: str = parameter_prefix
         # initialize the registry
         self._registry: Dict[str, Entry] = dict()
         # initialize the package dictionary
         self._packages: Dict[str, Package] = dict()
-        # compile regex patterns
-        self.__compile__()
+        # initialize the dispatch table
+        self._dispatch: Mapping[str, Invoker] = MappingProxyType(dict())
+        # set the message parser
+        self._parser: Parser = parser if parser else self.__compile__()
+        # set the worker pool sizes; None uses the executor defaults
+        self._thread_workers: Optional[int] = thread_workers
+        self._process_workers: Optional[int] = process_workers
+        # set the package loader pool size; None loads packages sequentially
+        self._load_workers: Optional[int] = load_workers
+        # set whether packages are imported on first dispatch instead of at load
+        self._lazy: bool = lazy
+        # set whether package metadata is cached in a manifest next to each loaded directory
+        self._manifest: bool = manifest
+        # initialize the manifests, keyed by package directory
+        self._manifests: Dict[Path, Manifest] = dict()
+        # initialize the loaded directories and their load arguments, used when reloading
+        self._directories: Dict[Path, Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = dict()
+        # initialize the package file references, keyed by package name in registration order
+        self._references: Dict[str, Path] = dict()
+        # initialize the package file stats, used to detect changed files
+        self._stats: Dict[Path, Tuple[int, int]] = dict()
+        # initialize the placeholders of packages that have not been imported, keyed by package name
+        self._placeholders: Dict[str, List[Placeholder]] = dict()
+        # initialize the executors lazily, keyed by execution policy
+        self._executors: Dict[ExecutionPolicy, Executor] = dict()
+        # initialize the command name index used to resolve aliases, namespaced names and misses
+        self._index: CommandIndex[Entry] = CommandIndex(dict())
+        # set whether a unique prefix of a command name resolves to the command
+        self._prefix_matching: bool = prefix_matching
+        # initialize the instrumentation hooks; calls are only observed while any are registered
+        self._hooks: Tuple[Hook, ...] = tuple()
+        # set the cache of parsed messages, if sized; it is invalidated whenever the registry changes
+        self._messages: Optional[MessageCache] = MessageCache(message_cache) if message_cache else None
+        # set the timeout of commands that do not declare their own; None lets them run indefinitely
+        self._timeout: Optional[float] = timeout
 
 
-    def __compile__(self) -> None:
+    def __compile__(self) -> Parser:
         """
-        Compile regex patterns used in message analyzation.
+        Get the precompiled single-pass parser used in message analyzation.
         """
         
-        # compile the command pattern
-        self._command_pattern: Pattern = re.compile(rf'^[\w]+')
-        # compile the parameter pattern
-        self._parameter_pattern: Pattern = re.compile(rf'{self._parameter_prefix}([\w]+)[\s]+((?:(?!\s\-)[\s\S])+\b)')
+        return compile_parser(self._parameter_prefix)
+
+
+    def __get_executor__(self, policy: ExecutionPolicy) -> Optional[Executor]:
+        """
+        Get the executor for an execution policy, creating its pool on first use or once it broke.
+        """
+
+        if policy is ExecutionPolicy.INLINE: return None
+        executor: Optional[Executor] = self._executors.get(policy)
+        # a process pool whose worker died refuses every later call
+        if executor and not getattr(executor, '_broken', False): return executor
+        if executor: log.warning('Replacing broken %s executor', policy.value)
+
+        if policy is ExecutionPolicy.THREAD:
+            executor = ThreadPoolExecutor(max_workers=self._thread_workers, thread_name_prefix='router')
+        elif policy is ExecutionPolicy.PROCESS:
+            # fork where available so workers inherit the loaded packages
+            methods: List[str] = multiprocessing.get_all_start_methods()
+            context: BaseContext = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            executor = ProcessPoolExecutor(max_workers=self._process_workers, mp_context=context)
+        self._executors[policy] = executor
+        log.debug('Created %s executor', policy.value)
+        return executor
+
+
+    def add_hook(self, hook: Hook) -> Hook:
+        """
+        Register an instrumentation hook, returning it.
+        """
+        self._hooks = self._hooks + (hook,)
+        return hook
+
+
+    def remove_hook(self, hook: Hook) -> None:
+        """
+        Unregister an instrumentation hook.
+        """
+        self._hooks = tuple(registered for registered in self._hooks if registered is not hook)
+
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the worker pools used by thread and process execution policies.
+        """
+        executors: List[Executor] = list(self._executors.values())
+        self._executors.clear()
+        for executor in executors: executor.shutdown(wait=wait)
+
+
+    def __recycle__(self) -> None:
+        """
+        Retire the process pool once packages are added or rebuilt, since its workers forked with the previous packages.
+        Calls already submitted finish in the retired workers; the next process command forks new ones.
+        """
+        executor: Optional[Executor] = self._executors.pop(ExecutionPolicy.PROCESS, None)
+        if executor:
+            log.debug('Recycling %s executor', ExecutionPolicy.PROCESS.value)
+            executor.shutdown(wait=False)
+
+
+    def __after_fork__(self) -> None:
+        """
+        Reset per-process state in a forked child process.
+        The worker pools' threads and processes belong to the parent, so the child creates its own on demand.
+        """
+        self._executors = dict()
+
+
+    def footprint(self) -> Footprint:
+        """
+        Measure the memory of the loaded packages, components and commands, and of the registry.
+
+        A command's bytes include its invoker and registry entry, a component's include its instance
+        and a package's include its module spec; the handler's own bytes are its registry, dispatch table,
+        name index and placeholders. Objects shared by several owners are attributed to the first measured.
+        """
+        # mark the owners as seen, so measuring a command stops at its component and package
+        seen: Set[int] = set()
+        for package in self._packages.values():
+            seen.add(id(package))
+            for component in package.values():
+                seen.update(id(owned) for owned in (component, component.instance, component.limiter) if owned is not None)
+
+        packages: List[Footprint] = list()
+        for package in self._packages.values():
+            components: List[Footprint] = list()
+            for component in package.values():
+                commands: List[Footprint] = list()
+                for command in component.values():
+                    size: int = sizeof(command, seen)
+                    invoker: Optional[Invoker] = self._dispatch.get(f'{package.name}.{component.name}.{command.name}')
+                    if invoker is not None and invoker.command is command: size += sizeof(invoker, seen)
+                    commands.append(Footprint('command', command.name, size))
+                size: int = sizeof(component, seen) + sizeof(component.instance, seen)
+                if component.limiter is not None: size += sizeof(component.limiter, seen)
+                components.append(Footprint('component', component.name, size, commands))
+            packages.append(Footprint('package', package.name, sizeof(package, seen), components))
+        # measure the tables that remain
+        tables: Tuple[Any, ...] = (self._registry, self._dispatch, self._index, self._placeholders, self._references, self._manifests)
+        return Footprint('handler', 'handler', sum(sizeof(table, seen) for table in tables), packages)
 
 
-    def __add_package__(self, package: Package) -> None:
+    def __add_package__(self, package: Package, claimed: bool = False) -> None:
+        """
+        Register a package's commands and rebuild the dispatch table.
+
+        Parameters:
+        - claimed:
+            only register commands that are unregistered or registered to this package,
+            used when a lazily registered package is imported
+        """
+        # copy the current dispatch table so in-flight lookups never observe a partial update
+        dispatch: Dict[str, Invoker] = dict(self._dispatch)
+        # the names the package registers, for the index
+        names: Dict[str, Entry] = dict()
+        invokers: List[Invoker] = list()
         for component in package.values():
             for command in component.values():
-                self._registry[command.name] = Entry(package.name, component.name, command.name)
-                log.info('Added command %s.%s.%s', package.name, component.name, command.name)
+                entry: Entry = Entry(package.name, component.name, command.name)
+                invoker: Invoker = Invoker(entry, command, component.limiter, self._timeout)
+                # the namespaced name always reaches the command
+                dispatch[entry.qualified_name] = invoker
+                names[entry.qualified_name] = entry
+                invokers.append(invoker)
+                current: Optional[Entry] = self._registry.get(command.name)
+                if current and current.package != package.name:
+                    # keep commands claimed by packages registered after this one
+                    if claimed: continue
+                    log.warning('Command %s of package %s overrides package %s; use %s or %s to dispatch either', command.name, package.name, current.package, entry.qualified_name, current.qualified_name)
+                self._registry[command.name] = entry
+                dispatch[command.name] = invoker
+                names[command.name] = entry
+                log.info('Added command %s', entry.qualified_name)
+        # swap in the rebuilt dispatch table
+        self._dispatch = MappingProxyType(dispatch)
+        # drop placeholders the package did not provide a command for
+        self.__remove_placeholders__(package.name)
+        self.__index__(names, invokers)
+        self.__recycle__()
+
+
+    def __add_placeholders__(self, reference: Path, args: Tuple[Any, ...], kwargs: Dict[str, Any], components: Optional[Dict[str, List[str]]] = None) -> None:
+        """
+        Register placeholders for the commands of a package file, discovering them unless provided.
+        """
+        if components is None: components = self.__discover__(reference)
+        # register in the order the package would register its commands once imported
+        placeholders: List[Placeholder] = list()
+        names: Dict[str, Entry] = dict()
+        for component_name in sorted(components):
+            for command_name in sorted(components[component_name]):
+                placeholder: Placeholder = Placeholder(reference.stem, component_name, command_name, reference, args, kwargs)
+                current: Optional[Entry] = self._registry.get(command_name)
+                if current and current.package != placeholder.package:
+                    log.warning('Command %s of package %s overrides package %s; use %s or %s to dispatch either', command_name, placeholder.package, current.package, placeholder.qualified_name, current.qualified_name)
+                self._registry[command_name] = placeholder
+                placeholders.append(placeholder)
+                names[placeholder.qualified_name] = names[command_name] = placeholder
+                log.info('Added placeholder %s.%s.%s', reference.stem, component_name, command_name)
+        self._placeholders[reference.stem] = placeholders
+        self.__index__(names)
+
+
+    def __discover__(self, reference: Path) -> Dict[str, List[str]]:
+        """
+        Get the command names of each component of a package file without importing it.
+        Command names are read from a fresh manifest record if available, otherwise discovered statically.
+        """
+        manifest: Optional[Manifest] = self._manifests.get(reference.parent)
+        components: Optional[Dict[str, List[str]]] = manifest.commands(reference) if manifest else None
+        return discover(reference) if components is None else components
+
+
+    def __remove_placeholders__(self, package_name: str) -> None:
+        """
+        Remove the placeholders registered for a package.
+        """
+        for placeholder in self._placeholders.pop(package_name, list()):
+            # namespaced names the imported package registered are retargeted when it is indexed
+            if self._index.get(placeholder.qualified_name) is placeholder and placeholder.qualified_name not in self._dispatch: self._index.discard(placeholder.qualified_name)
+            if self._registry.get(placeholder.command) is not placeholder: continue
+            del self._registry[placeholder.command]
+            # the command name falls back to the command it overrode, if still dispatchable
+            invoker: Optional[Invoker] = self._dispatch.get(placeholder.command)
+            if invoker: self._index.add(placeholder.command, invoker.entry)
+            else: self._index.discard(placeholder.command)
+
+
+    def __rebuild__(self) -> None:
+        """
+        Rebuild the registry and dispatch table from the registered packages and placeholders.
+        Packages are applied in registration order, so later packages keep precedence.
+        Invokers of unchanged commands are reused, and both tables are swapped in at once.
+        """
+        registry: Dict[str, Entry] = dict()
+        dispatch: Dict[str, Invoker] = dict()
+        for package_name in self._references:
+            package: Optional[Package] = self._packages.get(package_name)
+            # register the commands of imported packages
+            if package:
+                for component in package.values():
+                    for command in component.values():
+                        qualified_name: str = f'{package.name}.{component.name}.{command.name}'
+                        invoker: Optional[Invoker] = self._dispatch.get(qualified_name)
+                        if not invoker or invoker.command is not command:
+                            invoker = Invoker(Entry(package.name, component.name, command.name), command, component.limiter, self._timeout)
+                        registry[command.name] = invoker.entry
+                        dispatch[command.name] = invoker
+                        dispatch[qualified_name] = invoker
+            # register the placeholders of packages that have not been imported
+            for placeholder in self._placeholders.get(package_name, list()):
+                registry[placeholder.command] = placeholder
+                dispatch.pop(placeholder.command, None)
+        self._registry = registry
+        self._dispatch = MappingProxyType(dispatch)
+        self.__reindex__()
+        self.__recycle__()
+
+
+    def __index__(self, names: Mapping[str, 'Entry'], invokers: Iterable['Invoker'] = ()) -> None:
+        """
+        Add the names of newly registered commands and placeholders to the command name index, then the commands' aliases.
+        Command names take precedence over aliases, and later commands claim shared aliases.
+        """
+        for name, entry in names.items(): self._index.add(name, entry)
+        for invoker in invokers:
+            for alias in invoker.command.aliases:
+                current: Optional[Entry] = self._index.get(alias)
+                # the alias names another command, or a namespaced placeholder
+                if alias in self._registry or alias in self._dispatch or (current is not None and current.qualified_name == alias):
+                    if current is not invoker.entry: log.warning('Ignoring alias %s of command %s, which names another command', alias, invoker.entry.qualified_name)
+                    continue
+                self._index.add(alias, invoker.entry)
+        # drop cached messages, which may resolve differently now
+        if self._messages is not None: self._messages.__invalidate__()
+
+
+    def __reindex__(self) -> None:
+        """
+        Rebuild the command name index from the registry, dispatch table and placeholders, e.g. once the tables are rebuilt.
+        Command names take precedence over namespaced names' prefixes and over aliases.
+        """
+        names: Dict[str, Entry] = {name: invoker.entry for name, invoker in self._dispatch.items()}
+        for placeholders in self._placeholders.values():
+            for placeholder in placeholders: names[placeholder.qualified_name] = placeholder
+        names.update(self._registry)
+        # register aliases in registration order, so later commands claim shared aliases
+        aliases: Dict[str, Entry] = dict()
+        for invoker in self._dispatch.values():
+            for alias in invoker.command.aliases:
+                if alias in names:
+                    if names[alias] is not invoker.entry: log.warning('Ignoring alias %s of command %s, which names another command', alias, invoker.entry.qualified_name)
+                    continue
+                aliases[alias] = invoker.entry
+        names.update(aliases)
+        # swap in the rebuilt index
+        self._index = CommandIndex(names)
+        # drop cached messages, which may resolve differently now
+        if self._messages is not None: self._messages.__invalidate__()
+
+
+    def __resolve__(self, command_name: str) -> Optional['Invoker']:
+        """
+        Resolve a command name that missed the dispatch table: an alias, a unique prefix when
+        prefix matching is enabled, or a lazily registered command whose package is then imported.
+        """
+        entry: Optional[Entry] = self._registry.get(command_name) or self._index.resolve(command_name, self._prefix_matching)
+        if entry is None: return None
+        if not isinstance(entry, Placeholder): return self._dispatch.get(entry.qualified_name)
+
+        log.debug('Importing package %s on first dispatch of %s', entry.package, command_name)
+        package: Optional[Package] = self.__build_package__(entry.reference, *entry.args, **entry.kwargs)
+        # drop the placeholders of a failed package so later dispatches fail fast
+        if not package:
+            self.__remove_placeholders__(entry.package)
+            if self._messages is not None: self._messages.__invalidate__()
+            return None
+        # add package to dictionary
+        self._packages[package.name] = package
+        # register package without overriding commands claimed by other packages
+        self.__add_package__(package, claimed=True)
+        # record the introspected metadata for later starts
+        manifest: Optional[Manifest] = self._manifests.get(entry.reference.parent)
+        if manifest: self.__save_manifest__(manifest, [package])
+        return self._dispatch.get(entry.qualified_name)
 
 
     def __get_name__(self, message: str) -> Optional[str]:
         """
-        Searches the message for the command name using the command pattern
+        Searches the message for the command name using the parser
         """
-        # find command name matches in the message
-        command_match: Match = re.match(self._command_pattern, message)
-        # get the command name from the match
-        command_name: Optional[str] = command_match.group(0) if command_match else None
-        return command_name
+        return self._parser.get_name(message)
 
 
     def __get_kwargs__(self, message: str) -> Dict[str, str]:
         """
-        Searches the message for parameter key-value pairs using the parameter pattern
+        Searches the message for parameter key-value pairs using the parser
         """
-        # find all parameter name-value pairs in the message
-        parameters: List[Tuple[str, str]] = re.findall(self._parameter_pattern, message)
-        # convert parameter name-value pairs into kwargs dictionary
-        kwargs: Dict[str, str] = {parameter_name: parameter_value for parameter_name, parameter_value in parameters}
-        return kwargs
+        return self._parser.get_kwargs(message)
 
 
-    def load(self, directory: Path, extension: str = 'py', *args: Any, **kwargs: Any):
+    def load(self, directory: Path, extension: str = 'py', *args: Any, **kwargs: Any) -> Dict[str, float]:
         """
         Load package files from a directory.
         Failed package assemblies are logged as warning messages.
+
+        Packages are built concurrently when the handler was created with load_workers.
+        Packages are registered in filename order either way, so a command defined by
+        several packages always resolves to the one loaded last.
+
+        When the handler was created with lazy set, package files are only scanned for
+        command names; each package is imported on the first dispatch of one of its commands.
+
+        When the handler was created with manifest set, package metadata is cached in a manifest
+        file next to the directory. Lazy loads read command names from fresh manifest records
+        instead of scanning unchanged package files, and eager loads only look up the recorded
+        components and commands instead of introspecting every member.
+
+        Returns the time taken to build (or scan) each package, in seconds, keyed by filename.
         """
 
         # resolve the provided directory path
@@ -75,26 +422,223 @@ class Handler():
 
         # define the filename pattern to search for
         pattern: str = f'*.{extension}'
-        # get all paths for files with filenames matching the pattern in the provided directory
-        references: List[Path] = [reference for reference in directory.glob(pattern) if reference.is_file()]
-        # for each reference
+        # get all paths for files with filenames matching the pattern in the provided directory, in a deterministic order
+        references: List[Path] = sorted(reference for reference in directory.glob(pattern) if reference.is_file())
+
+        # record the directory and package files for reloading
+        self._directories[directory] = (extension, args, kwargs)
         for reference in references:
-            # instantiate package
-            package: Optional[Package] = self.__build_package__(reference, *args, **kwargs)
+            self._references[reference.stem] = reference
+            self._stats[reference] = self.__stat__(reference)
+
+        # read the manifest cached for the directory
+        manifest: Optional[Manifest] = None
+        if self._manifest:
+            manifest = self._manifests.setdefault(directory, Manifest.for_directory(directory))
+            manifest.prune(references)
+
+        # register placeholders instead of building packages
+        if self._lazy:
+            timings: Dict[str, float] = self.__load_placeholders__(references, args, kwargs)
+            if manifest: self.__save_manifest__(manifest, [])
+            return timings
+
+        # build the packages, preserving reference order
+        results: Iterable[Tuple[Optional[Package], float]]
+        if self._load_workers and self._load_workers > 1 and len(references) > 1:
+            with ThreadPoolExecutor(max_workers=self._load_workers, thread_name_prefix='router-loader') as executor:
+                results = list(executor.map(lambda reference: self.__time_package__(reference, *args, **kwargs), references))
+        else:
+            results = (self.__time_package__(reference, *args, **kwargs) for reference in references)
+
+        timings: Dict[str, float] = dict()
+        packages: List[Package] = list()
+        # for each reference
+        for reference, (package, elapsed) in zip(references, results):
+            timings[reference.name] = elapsed
+            log.debug('Built package %s in %.3fs', reference.name, elapsed)
             # if the package is None, continue to next reference
             if not package: continue
             # add package to dictionary
             self._packages[package.name] = package
+            packages.append(package)
             # register package
             self.__add_package__(package)
+        # record the metadata of the assembled packages
+        if manifest: self.__save_manifest__(manifest, packages)
+        return timings
+
+
+    def reload(self) -> Dict[str, str]:
+        """
+        Reload the package files that were added, changed or removed in the loaded directories.
+
+        Only affected packages are rebuilt; the registry and dispatch table are then swapped
+        in at once. Commands already running finish against the previous version. A changed
+        package that fails to build keeps its previous version until it is changed again.
+
+        Returns the change applied to each affected package file, keyed by filename:
+        'added', 'changed' or 'removed'.
+        """
+
+        return self.__apply__(*self.__prepare__())
+
+
+    async def watch(self, interval: float = 1.0) -> None:
+        """
+        Poll the loaded directories for changes, reloading affected packages until cancelled.
+        Packages are imported in the loop's default executor, so dispatch continues meanwhile;
+        the rebuilt tables are then swapped in on the loop.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # import affected packages off the event loop, then swap them in on it
+                prepared: Tuple[Dict[Path, List[Path]], List[Change]] = await loop.run_in_executor(None, self.__prepare__)
+                self.__apply__(*prepared)
+            except Exception as error:
+                log.error('Failed to reload packages: %s', error)
+
+
+    def __prepare__(self) -> Tuple[Dict[Path, List[Path]], List['Change']]:
+        """
+        Find the package files that were added, changed or removed in the loaded directories,
+        building added and changed packages, or scanning them for lazy loads.
+        The handler's tables are only read, so packages can be prepared off the event loop.
+
+        Returns the current package files of each directory, and the changes to apply.
+        """
+        files: Dict[Path, List[Path]] = dict()
+        changes: List[Change] = list()
+        for directory, (extension, args, kwargs) in list(self._directories.items()):
+            # get the current package files and their stats
+            current: Dict[Path, Tuple[int, int]] = {reference: self.__stat__(reference) for reference in sorted(directory.glob(f'*.{extension}')) if reference.is_file()}
+            files[directory] = list(current)
+            # find removed packages
+            for reference in list(self._stats):
+                if reference.parent == directory and reference not in current: changes.append(Change(reference, 'removed'))
+            # prepare added and changed packages
+            for reference, stat in current.items():
+                previous: Optional[Tuple[int, int]] = self._stats.get(reference)
+                if previous == stat: continue
+                change: Change = Change(reference, 'changed' if previous else 'added', stat)
+                # packages that have not been imported are rediscovered
+                if self._lazy and reference.stem not in self._packages:
+                    try:
+                        change.components = self.__discover__(reference)
+                    except Exception as error:
+                        log.error(HandlerLoadError(reference, error))
+                else:
+                    change.package = self.__build_package__(reference, *args, **kwargs)
+                changes.append(change)
+        return files, changes
+
+
+    def __apply__(self, files: Dict[Path, List[Path]], changes: List['Change']) -> Dict[str, str]:
+        """
+        Apply prepared package changes, then swap in the rebuilt registry and dispatch table.
+        A package that failed to build or scan keeps its previous version until it is changed again.
+        """
+        applied: Dict[str, str] = dict()
+        for change in changes:
+            reference: Path = change.reference
+            # unregister removed packages
+            if change.change == 'removed':
+                self._stats.pop(reference, None)
+                self._references.pop(reference.stem, None)
+                removed: Optional[Package] = self._packages.pop(reference.stem, None)
+                if removed: removed.unregister()
+                self._placeholders.pop(reference.stem, None)
+                applied[reference.name] = change.change
+                continue
+            self._stats[reference] = change.stat
+            if change.package:
+                self._packages[change.package.name] = change.package
+                manifest: Optional[Manifest] = self._manifests.get(reference.parent)
+                if manifest: self.__save_manifest__(manifest, [change.package])
+            elif change.components is not None:
+                _, args, kwargs = self._directories[reference.parent]
+                self.__add_placeholders__(reference, args, kwargs, change.components)
+            else: continue
+            self._references[reference.stem] = reference
+            applied[reference.name] = change.change
+        for directory, references in files.items():
+            manifest: Optional[Manifest] = self._manifests.get(directory)
+            if manifest:
+                manifest.prune(references)
+                self.__save_manifest__(manifest, list())
+
+        # swap in the rebuilt tables
+        if applied:
+            # register packages in filename order within each directory, as load() does, so added packages do not take precedence by being added last
+            order: Dict[Path, int] = {directory: index for index, directory in enumerate(self._directories)}
+            self._references = dict(sorted(self._references.items(), key=lambda item: (order.get(item[1].parent, len(order)), item[1].name)))
+            self.__rebuild__()
+            log.info('Reloaded %s', ', '.join(f'{name} ({change})' for name, change in applied.items()))
+        return applied
+
+
+    @staticmethod
+    def __stat__(reference: Path) -> Tuple[int, int]:
+        """
+        Get the modification time and size of a file.
+        """
+        stat: os.stat_result = reference.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+
+    def __save_manifest__(self, manifest: Manifest, packages: List[Package]) -> None:
+        """
+        Record the metadata of assembled packages and write the manifest.
+        Manifest failures are logged and never fail a load.
+        """
+        try:
+            for package in packages: manifest.update(package)
+            manifest.save()
+        except Exception as error:
+            log.warning('Failed to update manifest %s: %s', manifest.reference.name, error)
+
+
+    def __load_placeholders__(self, references: List[Path], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Register placeholders for each package file, measuring the time taken.
+        """
+        timings: Dict[str, float] = dict()
+        for reference in references:
+            start: float = time.perf_counter()
+            try:
+                self.__add_placeholders__(reference, args, kwargs)
+            except Exception as error:
+                log.error(HandlerLoadError(reference, error))
+            timings[reference.name] = time.perf_counter() - start
+        return timings
+
+
+    def __time_package__(self, ref: Path, *args: Any, **kwargs: Any) -> Tuple[Optional[Package], float]:
+        """
+        Build a package, measuring the time taken.
+        """
+        start: float = time.perf_counter()
+        package: Optional[Package] = self.__build_package__(ref, *args, **kwargs)
+        return package, time.perf_counter() - start
 
     
     def __build_package__(self, ref: Path, *args: Any, **kwargs: Any) -> Optional[Package]:
+        # the module of the version already registered, restored if this version fails to build
+        previous: Optional[ModuleType] = sys.modules.get(Package.__module_name__(ref.resolve()))
         try:
             # instantiate package
             package: Package = Package(ref)
-            # load the package
-            package.load(*args, **kwargs)
+            # load the package, skipping the introspection of members a fresh manifest record already names
+            manifest: Optional[Manifest] = self._manifests.get(ref.parent)
+            components: Optional[Dict[str, List[str]]] = manifest.commands(ref) if manifest else None
+            try:
+                if components is None: package.load(*args, **kwargs)
+                else: package.restore(components, *args, **kwargs)
+            except BaseException:
+                package.unregister(previous)
+                raise
             # return the package
             return package
         except Exception as error:
@@ -103,12 +647,20 @@ class Handler():
 
 
 
-    async def process(self, message: str, *, args: List[Any] = list()) -> None:
+    async def process(self, message: str, *, args: List[Any] = list(), timeout: Optional[float] = None, deadline: Optional[float] = None) -> Any:
         """
         Process a message, parsing it for:
         - a primary command name
         - delimited parameter key-value pairs
 
+        Returns the command's result.
+
+        Parameters:
+        - timeout:
+            the seconds the call may take, including waiting for admission by the command's limits
+        - deadline:
+            the time.monotonic() time by which the call must complete
+
         Raises:
         - TypeError
             upon invalid message type provided
@@ -116,54 +668,404 @@ class Handler():
             upon failure to bind command arguments or a parameter mismatch
         - HandlerLookupError
             upon failure to lookup command object from the registry
+        - HandlerOverloadError
+            upon the command's limits shedding the call
+        - HandlerTimeoutError
+            upon the call running past its timeout or deadline, or the command past its own timeout
         """
 
-        try:
-            # filter non-string message parameters
-            if not isinstance(message, str): raise TypeError(f'Expected type {type(str)}; received type {type(message)}')
+        # bound the call by its timeout and deadline, naming the command in its error like run()
+        if timeout is not None or deadline is not None:
+            command_name: Optional[str] = self._parser.get_name(message) if isinstance(message, str) else None
+            # a message without a command name fails before there is anything to bound
+            if command_name: return await self.__bound__(command_name, self.__process__(message, args), timeout, deadline)
+        return await self.__process__(message, args)
 
-            command_name: Optional[str] = self.__get_name__(message)
-            if not command_name: raise MissingCommandError()
-            log.debug('Determined command name to be \'%s\'', command_name)
 
-            kwargs: Dict[str, str] = self.__get_kwargs__(message)
-            log.debug('Determined parameter list to be %s', kwargs)
+    async def __process__(self, message: str, args: List[Any]) -> Any:
+        """
+        Process a message without bounds, the path shared by process() and process_many().
+        """
+        # observe the call if hooks are registered
+        if self._hooks: return await self.__observe_message__(message, args)
+        # reuse the plans of repeated messages if the message cache is enabled
+        if self._messages is not None: return await self.__replay__(message, args)
+
+        try:
+            # parse the command name and parameters
+            command_name, kwargs = self.__parse__(message)
 
             # run the command
-            await self.run(command_name, args, kwargs)
+            return await self.run(command_name, args, kwargs)
 
         except Exception as error:
             raise error
 
 
-    async def run(self, command_name: str, args: List[Any], kwargs: Dict[str, str]):
+    def __parse__(self, message: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Parse a message for its command name and parameters in a single pass.
+
+        Raises:
+        - TypeError
+            upon invalid message type provided
+        - MissingCommandError
+            upon failure to determine a command name
+        """
+
+        # filter non-string message parameters
+        if not isinstance(message, str): raise TypeError(f'Expected type {type(str)}; received type {type(message)}')
+
+        # parse the command name and parameters in a single pass
+        command_name, kwargs = self._parser.parse(message)
+        if not command_name: raise MissingCommandError()
+        log.debug('Determined command name to be \'%s\'', command_name)
+        log.debug('Determined parameter list to be %s', kwargs)
+        return command_name, kwargs
+
+
+    def __plan__(self, message: str) -> Plan:
+        """
+        Get the cached plan of a message, or parse the message and cache its plan.
+        Messages that fail to parse are not cached.
+
+        Raises:
+        - TypeError
+            upon invalid message type provided
+        - MissingCommandError
+            upon failure to determine a command name
+        """
+        if not isinstance(message, str): raise TypeError(f'Expected type {type(str)}; received type {type(message)}')
+        plan: Optional[Plan] = self._messages.get(message)
+        if plan is None: plan = self._messages.put(message, Plan(*self.__parse__(message)))
+        return plan
+
+
+    async def __replay__(self, message: str, args: List[Any]) -> Any:
+        """
+        Process a message through its cached plan, skipping the parse, the lookup and,
+        for the same number of positional arguments, the conversion and validation of its parameters.
+        """
+        plan: Plan = self.__plan__(message)
+        return await self.__execute__(plan.command_name, self.__invoker__(plan.command_name, plan), args, plan.kwargs, plan=plan)
+
+
+    async def process_many(self, messages: Union[Iterable[str], AsyncIterable[str]], *, args: List[Any] = list(), concurrency: int = 16, ordered: bool = True) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Process a batch or stream of messages, dispatching up to `concurrency` commands at once.
+
+        Yields (index, outcome) pairs, where index is the message's position in the input and
+        outcome is what run() returns for the message, or the exception raised while processing it,
+        including the CancelledError of a command that was cancelled.
+        Outcomes are yielded in input order if `ordered` is set, otherwise as they complete.
+
+        Raises:
+        - ValueError
+            upon a concurrency limit below 1
+        """
+
+        if concurrency < 1: raise ValueError(f'Expected a concurrency of at least 1; received {concurrency}')
+
+        # tasks in input order, used when ordered
+        window: Deque[Tuple[int, asyncio.Future]] = deque()
+        # tasks keyed to their input index, used when unordered
+        pending: Dict[asyncio.Future, int] = dict()
+
+        try:
+            index: int = 0
+            async for message in self.__iterate__(messages):
+                future: asyncio.Future = self.__dispatch__(message, args)
+                if ordered: window.append((index, future))
+                else: pending[future] = index
+                index += 1
+
+                # wait for a slot once the concurrency limit is reached
+                if ordered:
+                    while len(window) >= concurrency:
+                        position, future = window.popleft()
+                        yield position, await self.__outcome__(future)
+                else:
+                    while len(pending) >= concurrency:
+                        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for future in done: yield pending.pop(future), await self.__outcome__(future)
+
+            # drain the remaining tasks
+            while window:
+                position, future = window.popleft()
+                yield position, await self.__outcome__(future)
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done: yield pending.pop(future), await self.__outcome__(future)
+
+        finally:
+            # cancel outstanding tasks if the consumer stops early
+            for _, future in window: future.cancel()
+            for future in pending: future.cancel()
+
+
+    def __dispatch__(self, message: str, args: List[Any]) -> asyncio.Future:
+        """
+        Schedule a message to be processed like process() processes it, returning a future for the outcome.
+        Messages are parsed by the task, so parsing failures are outcomes too, observed by the hooks.
+        """
+        return asyncio.ensure_future(self.__process__(message, args))
+
+
+    @staticmethod
+    async def __iterate__(messages: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+        """
+        Iterate over a synchronous or asynchronous iterable of messages.
+        """
+        if isinstance(messages, AsyncIterable):
+            async for message in messages: yield message
+        else:
+            for message in messages: yield message
+
+
+    @staticmethod
+    async def __outcome__(future: asyncio.Future) -> Any:
+        """
+        Wait for a future, returning its result or the exception it raised.
+        A command that was cancelled on its own is an outcome too, while cancelling the caller cancels the future.
+        """
+        # waiting does not raise the future's exception, so its cancellation is told apart from the caller's
+        if not future.done():
+            try:
+                await asyncio.wait((future,))
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+        if future.cancelled(): return asyncio.CancelledError()
+        error: Optional[BaseException] = future.exception()
+        if error is None: return future.result()
+        if isinstance(error, Exception): return error
+        raise error
+
+
+    async def run(self, command_name: str, args: List[Any], kwargs: Dict[str, str], *, timeout: Optional[float] = None, deadline: Optional[float] = None) -> Any:
         """
         Run a command given its name, args and kwargs, as well as any optional objects the command requires.
+        Returns the command's result.
+
+        Parameters:
+        - timeout:
+            the seconds the call may take, including waiting for admission by the command's limits
+        - deadline:
+            the time.monotonic() time by which the call must complete
 
         Raises:
         - HandlerExecutionError
-            upon failure to bind command arguments or a parameter mismatch
+            upon failure to bind or convert command arguments or a parameter mismatch
         - HandlerLookupError
             upon failure to lookup command object from the registry
+        - HandlerOverloadError
+            upon the command's limits shedding the call
+        - HandlerTimeoutError
+            upon the call running past its timeout or deadline, or the command past its own timeout
         """
 
+        # bound the call by its timeout and deadline
+        if timeout is not None or deadline is not None: return await self.__bound__(command_name, self.run(command_name, args, kwargs), timeout, deadline)
+        # observe the call if hooks are registered
+        if self._hooks: return await self.__observe__(Call(command_name), args, kwargs)
+
         try:
-            # get the command entry from the registry
-            entry: Entry = self._registry[command_name]
-            # get the command from the package source
-            command: Command = self._packages[entry.package][entry.component][entry.command]
-            # bind the processed arguments to the command signature
-            bound_arguments: BoundArguments = command.signature.bind(*args, **kwargs)
-            # run the command with the assembled signature
-            await command.run(bound_arguments)
+            # get the prepared invoker from the dispatch table
+            invoker: Invoker = self._dispatch[command_name]
         except KeyError as error:
-            raise HandlerLookupError(command_name, error)
+            invoker = self.__lookup__(command_name, error)
+        return await self.__execute__(command_name, invoker, args, kwargs)
+
+
+    async def __execute__(self, command_name: str, invoker: 'Invoker', args: List[Any], kwargs: Mapping[str, Any], call: Optional[Call] = None, plan: Optional[Plan] = None) -> Any:
+        """
+        Bind and run a looked up command, raising its errors as handler errors.
+        The bind and execute phases are measured into the call record, if provided.
+        Arguments a message plan already validated for the same number of positional arguments are reused.
+        """
+        try:
+            if call is not None: start: float = time.perf_counter()
+            if plan is not None and plan.width == len(args):
+                call_args, call_kwargs = args, plan.converted
+            else:
+                # convert parameter values according to the command's annotations
+                if invoker.converts: kwargs = invoker.command.convert(kwargs)
+                # validate the processed arguments with the compiled binder
+                call_args, call_kwargs = invoker.binder.bind(args, kwargs)
+                if plan is not None: plan.__bound__(len(args), call_kwargs)
+            if call is not None:
+                call.bind = time.perf_counter() - start
+                start = time.perf_counter()
+            # get the executor required by the command's execution policy
+            executor: Optional[Executor] = self.__get_executor__(invoker.policy) if invoker.offloaded else None
+            # run the command with the validated arguments, within its limits if it has any
+            try:
+                if invoker.limited and invoker.cache:
+                    # cached results are served without taking the limits' tokens or slots
+                    found, result = invoker.cache.lookup(call_args, call_kwargs)
+                    if found: return result
+                if invoker.limited:
+                    await invoker.acquire()
+                    # the work an executor started for the call, which keeps running if the call is cancelled
+                    submitted: List[Future] = list()
+                    try:
+                        result: Any = await invoker.invoke(call_args, call_kwargs, executor, submitted.append if executor else None)
+                    except BaseException:
+                        # the slots are held until a thread or process still running the command finishes
+                        if submitted and not submitted[0].done(): invoker.release_after(submitted[0])
+                        else: invoker.release()
+                        raise
+                else:
+                    result: Any = await invoker.invoke(call_args, call_kwargs, executor)
+            finally:
+                if call is not None: call.execute = time.perf_counter() - start
+            # a stream holds its limiter slots until it ends
+            if invoker.streaming: return self.__stream__(command_name, invoker, result)
+            if invoker.limited: invoker.release()
+            return result
+        except LoadShedError as error:
+            raise HandlerOverloadError(command_name, error)
         except TypeError as error:
             raise HandlerExecutionError(command_name, error)
+        except CommandTimeoutError as error:
+            raise HandlerTimeoutError(command_name, error.timeout, error)
         except CommandError as error:
             raise HandlerExecutionError(command_name, error)
 
+
+    @staticmethod
+    async def __bound__(name: str, call: Awaitable[Any], timeout: Optional[float], deadline: Optional[float]) -> Any:
+        """
+        Await a call, cancelling it once the earlier of its timeout and deadline passes.
+        The items of a returned stream are bounded by the time remaining.
+
+        Raises:
+        - HandlerTimeoutError
+            upon the call running past its timeout or deadline
+        """
+        start: float = time.monotonic()
+        remaining: float = timeout if timeout is not None else math.inf
+        if deadline is not None: remaining = min(remaining, deadline - start)
+        remaining = max(remaining, 0.0)
+        try:
+            result: Any = await asyncio.wait_for(call, remaining)
+        except asyncio.TimeoutError as error:
+            raise HandlerTimeoutError(name, remaining, error)
+        # a stream runs on after it is returned, so its items are bounded by the time remaining
+        if isinstance(result, Stream): result.__bound__(start + remaining, functools.partial(HandlerTimeoutError, name, remaining))
+        return result
+
+
+    @staticmethod
+    def __stream__(command_name: str, invoker: 'Invoker', stream: Stream) -> Stream:
+        """
+        Prepare a command's stream: its exceptions are raised like run() raises them,
+        and the command's limiter slots are released once it ends.
+        """
+        return stream.__attach__(invoker.release if invoker.limited else None, functools.partial(Handler.__translate__, command_name))
+
+
+    @staticmethod
+    def __translate__(command_name: str, error: Exception) -> Exception:
+        """
+        Convert an exception raised while streaming a command's items like run() converts it.
+        """
+        if isinstance(error, HandlerError): return error
+        if isinstance(error, CommandTimeoutError): return HandlerTimeoutError(command_name, error.timeout, error)
+        return HandlerExecutionError(command_name, error)
+
+
+    def __invoker__(self, command_name: str, plan: Optional[Plan] = None) -> 'Invoker':
+        """
+        Get the invoker of a command name, reusing and recording the one resolved for a message plan.
+
+        Raises:
+        - HandlerLookupError
+            upon a command name that cannot be resolved
+        """
+        if plan is not None and plan.invoker is not None: return plan.invoker
+        try:
+            invoker: Invoker = self._dispatch[command_name]
+        except KeyError as error:
+            invoker = self.__lookup__(command_name, error)
+        if plan is not None: plan.invoker = invoker
+        return invoker
+
+
+    def __lookup__(self, command_name: str, error: KeyError) -> 'Invoker':
+        """
+        Get the invoker of a command name that missed the dispatch table.
+
+        Raises:
+        - HandlerLookupError
+            upon a command name that cannot be resolved
+        """
+        # import a lazily registered package on first dispatch
+        resolved: Optional[Invoker] = self.__resolve__(command_name)
+        if not resolved: raise HandlerLookupError(command_name, error, self._index.suggest(command_name))
+        return resolved
+
+
+    async def __observe_message__(self, message: str, args: List[Any]) -> Any:
+        """
+        Process a message while notifying the hooks, measuring the parse phase.
+        """
+        start: float = time.perf_counter()
+        plan: Optional[Plan] = None
+        try:
+            # parse the message, or reuse its cached plan
+            if self._messages is not None:
+                plan = self.__plan__(message)
+                command_name, kwargs = plan.command_name, plan.kwargs
+            else:
+                command_name, kwargs = self.__parse__(message)
+        except Exception as error:
+            call: Call = Call(None, time.perf_counter() - start)
+            call.error = error
+            for hook in self._hooks: self.__notify__(hook.error, call, error)
+            raise
+        return await self.__observe__(Call(command_name, time.perf_counter() - start), args, kwargs, plan)
+
+
+    async def __observe__(self, call: Call, args: List[Any], kwargs: Mapping[str, Any], plan: Optional[Plan] = None) -> Any:
+        """
+        Run a command while notifying the hooks, once it is looked up, and measuring its phases.
+        """
+        hooks: Tuple[Hook, ...] = self._hooks
+        try:
+            try:
+                invoker: Invoker = self.__invoker__(call.command, plan)
+                call.target = invoker.entry.qualified_name
+            finally:
+                # hooks see calls to missing commands too, with no target
+                for hook in hooks: self.__notify__(hook.before, call)
+            result: Any = await self.__execute__(call.command, invoker, args, kwargs, call, plan)
+        except BaseException as error:
+            call.error = error
+            for hook in hooks: self.__notify__(hook.error, call, error)
+            raise
+        for hook in hooks: self.__notify__(hook.after, call, result)
+        return result
+
+
+    @staticmethod
+    def __notify__(callback: Callable[..., None], *args: Any) -> None:
+        """
+        Call a hook, logging instead of raising its exceptions.
+        """
+        try:
+            callback(*args)
+        except Exception as error:
+            log.warning('Instrumentation hook %s failed: %s', callback, error)
+
+
 class Entry():
+    """
+    A registry entry naming a command's package, component and command.
+    Names are interned, so entries share the strings of every other entry naming the same package or component.
+    """
+
+    __slots__ = ('_package', '_component', '_command')
 
     @property
     def package(self) -> str:
@@ -177,10 +1079,207 @@ class Entry():
     def command(self) -> str:
         return self._command
 
+    @property
+    def qualified_name(self) -> str:
+        return f'{self._package}.{self._component}.{self._command}'
+
     def __init__(self, package: str, component: str, command: str) -> None:
-        self._package: str = package
-        self._component: str = component
-        self._command: str = command
+        self._package: str = sys.intern(package)
+        self._component: str = sys.intern(component)
+        self._command: str = sys.intern(command)
+
+
+class Placeholder(Entry):
+    """
+    A registry entry for a command whose package has not been imported yet.
+    """
+
+    __slots__ = ('_reference', '_args', '_kwargs')
+
+    @property
+    def reference(self) -> Path:
+        return self._reference
+
+    @property
+    def args(self) -> Tuple[Any, ...]:
+        return self._args
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        return self._kwargs
+
+    def __init__(self, package: str, component: str, command: str, reference: Path, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        super().__init__(package, component, command)
+        self._reference: Path = reference
+        # the arguments passed to the package's component initializers
+        self._args: Tuple[Any, ...] = args
+        self._kwargs: Dict[str, Any] = kwargs
+
+
+class Change():
+    """
+    A package file added, changed or removed since it was loaded, prepared by a reload:
+    the rebuilt package, or for lazy loads its scanned command names.
+    """
+
+    __slots__ = ('reference', 'change', 'stat', 'package', 'components')
+
+    def __init__(self, reference: Path, change: str, stat: Optional[Tuple[int, int]] = None) -> None:
+        self.reference: Path = reference
+        # 'added', 'changed' or 'removed'
+        self.change: str = change
+        self.stat: Optional[Tuple[int, int]] = stat
+        # None if the package failed to build or scan
+        self.package: Optional[Package] = None
+        self.components: Optional[Dict[str, List[str]]] = None
+
+
+class Invoker():
+    """
+    A prepared dispatch target for a registered command.
+    Holds everything the hot path needs so dispatch costs a single table lookup.
+    """
+
+    __slots__ = ('_entry', '_command', '_method', '_signature', '_coroutine', '_streaming', '_binder', '_converts', '_policy', '_offloaded', '_limiters', '_limited', '_cache', '_timeout')
+
+    @property
+    def entry(self) -> Entry:
+        return self._entry
+
+    @property
+    def command(self) -> Command:
+        return self._command
+
+    @property
+    def method(self) -> MethodType:
+        return self._method
+
+    @property
+    def signature(self) -> Signature:
+        return self._signature
+
+    @property
+    def coroutine(self) -> bool:
+        return self._coroutine
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    @property
+    def binder(self) -> Binder:
+        return self._binder
+
+    @property
+    def converts(self) -> bool:
+        return self._converts
+
+    @property
+    def policy(self) -> ExecutionPolicy:
+        return self._policy
+
+    @property
+    def offloaded(self) -> bool:
+        return self._offloaded
+
+    @property
+    def limiters(self) -> Tuple[Limiter, ...]:
+        return self._limiters
+
+    @property
+    def limited(self) -> bool:
+        return self._limited
+
+    @property
+    def cache(self) -> Optional[ResultCache]:
+        return self._cache
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    def __init__(self, entry: Entry, command: Command, limiter: Optional[Limiter] = None, timeout: Optional[float] = None) -> None:
+        self._entry: Entry = entry
+        self._command: Command = command
+        self._method: MethodType = command.method
+        self._signature: Signature = command.signature
+        # reuse the invocation strategy determined by the command
+        self._coroutine: bool = command.coroutine
+        self._streaming: bool = command.streaming
+        # reuse the argument binder compiled by the command
+        self._binder: Binder = command.binder
+        # determine whether any parameter values require conversion
+        self._converts: bool = bool(command.converters)
+        # reuse the execution policy determined by the command
+        self._policy: ExecutionPolicy = command.policy
+        self._offloaded: bool = self._policy is not ExecutionPolicy.INLINE
+        # the command's own limiter, then the limiter shared with its component
+        self._limiters: Tuple[Limiter, ...] = tuple(candidate for candidate in (command.limiter, limiter) if candidate)
+        self._limited: bool = bool(self._limiters)
+        # reuse the result cache of a memoized command
+        self._cache: Optional[ResultCache] = command.cache
+        # the command's declared timeout takes precedence over the handler's
+        self._timeout: Optional[float] = command.timeout if command.timeout is not None else timeout
+
+
+    async def acquire(self) -> None:
+        """
+        Wait for admission by each of the command's limiters.
+
+        Raises:
+        - LoadShedError
+            upon a limiter shedding the call
+        """
+        acquired: List[Limiter] = list()
+        try:
+            for limiter in self._limiters:
+                await limiter.acquire()
+                acquired.append(limiter)
+        except BaseException:
+            for limiter in reversed(acquired): limiter.release()
+            raise
+
+
+    def release(self) -> None:
+        """
+        Release the command's limiters.
+        """
+        for limiter in reversed(self._limiters): limiter.release()
+
+
+    def release_after(self, future: Future) -> None:
+        """
+        Release the command's limiters on the running event loop once work submitted to an executor finishes.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        def finished(_: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self.release)
+            # the event loop closed while the work was running
+            except RuntimeError:
+                self.release()
+
+        future.add_done_callback(finished)
+
+
+    async def invoke(self, args: Sequence[Any], kwargs: Mapping[str, Any], executor: Optional[Executor] = None, submitted: Optional[Callable[[Future], None]] = None) -> Any:
+        """
+        Invoke the command with arguments validated by its binder, returning its result.
+        Synchronous commands are run in the provided executor, if any, instead of on the event loop.
+        Results of memoized commands are served from the command's cache when possible.
+        Generator and async generator commands return a Stream of their items.
+        Work submitted to the executor is passed to submitted, if provided, as it keeps running if the call is cancelled.
+
+        Raises:
+        - CommandError
+            upon an exception raised by the command
+        - CommandTimeoutError
+            upon the command running past its timeout
+        """
+        # the command's own execution path, skipped into directly when there is nothing to serve or bound
+        if self._timeout is None and not self._cache: return await self._command.__execute__(args, kwargs, executor, submitted)
+        return await self._command.__invoke__(args, kwargs, executor, self._timeout, submitted)
 
 
 class HandlerError(Exception):
@@ -223,6 +1322,34 @@ class HandlerExecutionError(HandlerError):
 class HandlerLookupError(HandlerError):
     """Raised when a command cannot be looked up by command name."""
 
-    def __init__(self, command_name: str, exception: Exception = None):
+    @property
+    def suggestions(self) -> List[str]:
+        return self._suggestions
+
+    def __init__(self, command_name: str, exception: Exception = None, suggestions: Optional[List[str]] = None):
+        self._suggestions: List[str] = suggestions if suggestions else list()
         message: str = f'Lookup for command \'{command_name}\' failed.'
+        if self._suggestions: message += f' Did you mean {", ".join(repr(suggestion) for suggestion in self._suggestions)}?'
+        super().__init__(message, exception)
+
+
+class HandlerOverloadError(HandlerError):
+    """Raised when a command's limits shed a call."""
+
+    def __init__(self, command_name: str, exception: Optional[Exception] = None):
+        message: str = f'Command \'{command_name}\' is overloaded: {exception}'
+        super().__init__(message, exception)
+
+
+class HandlerTimeoutError(HandlerError):
+    """Raised when a call runs past its timeout or deadline, or a command past its own timeout."""
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    def __init__(self, command_name: str, timeout: Optional[float] = None, exception: Optional[Exception] = None):
+        self._timeout: Optional[float] = timeout
+        message: str = f'Timed out while executing \'{command_name}\''
+        if timeout is not None: message += f' after {timeout:g}s'
         super().__init__(message, exception)
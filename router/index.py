@@ -0,0 +1,151 @@
+import bisect
+import difflib
+import logging
+import math
+from logging import Logger
+from typing import Dict, Generic, List, Mapping, Optional, Set, Tuple, TypeVar
+
+__all__: List[str] = [
+    "CommandIndex"
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the separator of namespaced command names, e.g. package.Component.command
+SEPARATOR: str = '.'
+# the length of the character n-grams used for suggestions
+GRAM: int = 3
+# the minimum n-gram similarity of a suggested name
+THRESHOLD: float = 0.3
+# the number of n-gram candidates reranked by edit similarity per suggestion
+CANDIDATES: int = 4
+# the number of names above which a trigram is too common to look up candidates by
+FREQUENT: int = 256
+
+T = TypeVar('T')
+
+
+def _grams(name: str) -> Set[str]:
+    """
+    Get the character trigrams of a name, padded so short names and name boundaries produce grams.
+    """
+    padded: str = f'^{name}$'
+    return {padded[index:index + GRAM] for index in range(max(len(padded) - GRAM + 1, 1))}
+
+
+class CommandIndex(Generic[T]):
+    """
+    A name index over registered commands, updated as commands are registered and removed.
+
+    Names map to targets; several names (a command name, its namespaced name and aliases)
+    can share a target. Names are also kept sorted, so a prefix is resolved by bisecting to
+    the names it starts and stopping at the first name of another target.
+    Misses are answered with suggestions: candidates are only looked up by the rarest trigrams
+    of the miss, and only the best few of those are reranked by edit similarity.
+    """
+
+    @property
+    def names(self) -> Mapping[str, T]:
+        return self._names
+
+
+    def __init__(self, names: Mapping[str, T]) -> None:
+        # the exact names and their targets
+        self._names: Dict[str, T] = dict(names)
+        # the names in order, for prefix lookups
+        self._sorted: List[str] = sorted(self._names)
+        # the names containing each trigram
+        self._grams: Dict[str, List[str]] = dict()
+        for name in self._sorted:
+            for gram in _grams(name): self._grams.setdefault(gram, list()).append(name)
+
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+    def get(self, name: str) -> Optional[T]:
+        """
+        Get the target of an exact name.
+        """
+        return self._names.get(name)
+
+
+    def add(self, name: str, target: T) -> None:
+        """
+        Map a name to a target, replacing its previous target if any.
+        """
+        if name not in self._names:
+            bisect.insort(self._sorted, name)
+            for gram in _grams(name): self._grams.setdefault(gram, list()).append(name)
+        self._names[name] = target
+
+
+    def discard(self, name: str) -> None:
+        """
+        Remove a name, if indexed.
+        """
+        if self._names.pop(name, None) is None: return
+        del self._sorted[bisect.bisect_left(self._sorted, name)]
+        for gram in _grams(name):
+            names: List[str] = self._grams[gram]
+            names.remove(name)
+            if not names: del self._grams[gram]
+
+
+    def resolve(self, name: str, prefixes: bool = True) -> Optional[T]:
+        """
+        Get the target of an exact name, or of a prefix shared only by names of one target.
+        """
+        target: Optional[T] = self._names.get(name)
+        if target is not None or not prefixes or not name: return target
+        # the names starting with the prefix are adjacent in sorted order
+        for index in range(bisect.bisect_left(self._sorted, name), len(self._sorted)):
+            candidate: str = self._sorted[index]
+            if not candidate.startswith(name): break
+            if target is None: target = self._names[candidate]
+            elif self._names[candidate] is not target: return None
+        return target
+
+
+    def suggest(self, name: str, limit: int = 3) -> List[str]:
+        """
+        Get up to limit names of distinct targets similar to a name, most similar first.
+        """
+        grams: Set[str] = _grams(name)
+        # a candidate scoring at least THRESHOLD shares this many trigrams with the name, since it shares at most all of its own
+        required: int = max(1, math.ceil(THRESHOLD * len(grams) / (2 - THRESHOLD)))
+        # so it shares at least one of the rarest trigrams beyond those it may miss; common ones would only add noise
+        ordered: List[str] = sorted(grams, key=lambda gram: len(self._grams.get(gram, ())))
+        candidates: Set[str] = set()
+        for gram in ordered[:len(grams) - required + 1]:
+            postings: List[str] = self._grams.get(gram, list())
+            if len(postings) <= FREQUENT: candidates.update(postings)
+        # rank by the Dice coefficient of the trigram sets
+        scores: List[Tuple[float, str]] = list()
+        for candidate in candidates:
+            other: Set[str] = _grams(candidate)
+            score: float = 2 * len(grams & other) / (len(grams) + len(other))
+            if score >= THRESHOLD: scores.append((-score, candidate))
+        scores.sort()
+        # rerank the best candidates by edit similarity, which handles transpositions better
+        matcher: difflib.SequenceMatcher = difflib.SequenceMatcher(b=name)
+        ranked: List[Tuple[float, str]] = list()
+        for _, candidate in scores[:limit * CANDIDATES]:
+            matcher.set_seq1(candidate)
+            ranked.append((-matcher.ratio(), candidate))
+        ranked.sort()
+        # suggest one name per target
+        suggestions: List[str] = list()
+        targets: List[T] = list()
+        for _, candidate in ranked:
+            target: T = self._names[candidate]
+            if any(target is other for other in targets): continue
+            targets.append(target)
+            suggestions.append(candidate)
+            if len(suggestions) == limit: break
+        return suggestions
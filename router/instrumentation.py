@@ -0,0 +1,216 @@
+import bisect
+import json
+import logging
+import math
+from logging import Logger
+from typing import Any, Dict, List, Optional
+
+__all__: List[str] = [
+    "Call",
+    "Hook",
+    "Histogram",
+    "Metrics",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the key metrics record calls to commands that could not be looked up under
+MISSING: str = '<missing>'
+
+# the upper bounds of the latency histogram buckets, in seconds: 1µs doubling up to about 16s
+BOUNDS: List[float] = [1e-6 * 2 ** exponent for exponent in range(25)]
+
+
+class Call():
+    """
+    The record of a single command call, passed to every hook.
+
+    Phase durations are in seconds, and None for phases that did not run:
+    parse is only measured for calls made through process().
+    """
+
+    __slots__ = ('command', 'target', 'parse', 'bind', 'execute', 'error')
+
+    def __init__(self, command: Optional[str], parse: Optional[float] = None) -> None:
+        # the command name as dispatched; None if the message could not be parsed
+        self.command: Optional[str] = command
+        # the qualified name of the command looked up; None if it could not be
+        self.target: Optional[str] = None
+        self.parse: Optional[float] = parse
+        self.bind: Optional[float] = None
+        self.execute: Optional[float] = None
+        self.error: Optional[BaseException] = None
+
+
+class Hook():
+    """
+    Base class for instrumentation hooks registered on a handler.
+
+    Hooks are called on the event loop, so they should be cheap and must not block.
+    Exceptions raised by hooks are logged and never fail the call.
+    """
+
+    def before(self, call: Call) -> None:
+        """
+        Called before a command runs, once it is looked up; the call's target is None if the lookup failed.
+        """
+        pass
+
+
+    def after(self, call: Call, result: Any) -> None:
+        """
+        Called after a command returns.
+        """
+        pass
+
+
+    def error(self, call: Call, error: BaseException) -> None:
+        """
+        Called after a call fails, including failures to parse, look up or bind.
+        """
+        pass
+
+
+class Histogram():
+    """
+    A latency histogram with fixed exponential buckets.
+    Quantiles are estimated as the upper bound of the bucket they fall in.
+    """
+
+    __slots__ = ('_counts', '_count', '_sum', '_min', '_max')
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+
+    def __init__(self) -> None:
+        # one count per bound, plus one for durations above the last bound
+        self._counts: List[int] = [0] * (len(BOUNDS) + 1)
+        self._count: int = 0
+        self._sum: float = 0.0
+        self._min: float = math.inf
+        self._max: float = 0.0
+
+
+    def record(self, duration: float) -> None:
+        """
+        Record a duration in seconds.
+        """
+        self._counts[bisect.bisect_left(BOUNDS, duration)] += 1
+        self._count += 1
+        self._sum += duration
+        if duration < self._min: self._min = duration
+        if duration > self._max: self._max = duration
+
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """
+        Estimate a quantile, e.g. 0.99, or None if nothing was recorded.
+        """
+        if not self._count: return None
+        rank: float = quantile * self._count
+        seen: int = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank: return min(BOUNDS[index], self._max) if index < len(BOUNDS) else self._max
+        return self._max
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the histogram's statistics.
+        """
+        if not self._count: return {'count': 0}
+        return {
+            'count': self._count,
+            'sum': self._sum,
+            'mean': self._sum / self._count,
+            'min': self._min,
+            'max': self._max,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+        }
+
+
+class Metrics(Hook):
+    """
+    A hook collecting per-command call counts, error counts, in-flight gauges
+    and parse, bind and execute latency histograms.
+
+    Commands are keyed by qualified name, so aliases and prefixes of a command share its metrics.
+    Calls to commands that could not be looked up share a single MISSING key, so arbitrary names never grow the metrics.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, int] = dict()
+        self._errors: Dict[str, Dict[str, int]] = dict()
+        self._in_flight: Dict[str, int] = dict()
+        self._latencies: Dict[str, Dict[str, Histogram]] = dict()
+        # failures to parse a message, which have no command name
+        self._unparsed: int = 0
+
+
+    def before(self, call: Call) -> None:
+        key: str = call.target or MISSING
+        self._calls[key] = self._calls.get(key, 0) + 1
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+
+    def after(self, call: Call, result: Any) -> None:
+        self._in_flight[call.target] -= 1
+        self.__record__(call.target, call)
+
+
+    def error(self, call: Call, error: BaseException) -> None:
+        if call.command is None:
+            self._unparsed += 1
+            return
+        key: str = call.target or MISSING
+        self._in_flight[key] -= 1
+        errors: Dict[str, int] = self._errors.setdefault(key, dict())
+        errors[type(error).__name__] = errors.get(type(error).__name__, 0) + 1
+        self.__record__(key, call)
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the collected metrics, keyed by qualified command name.
+        """
+        return {
+            'commands': {
+                command: {
+                    'calls': calls,
+                    'errors': dict(self._errors.get(command, dict())),
+                    'in_flight': self._in_flight.get(command, 0),
+                    'latency': {phase: histogram.snapshot() for phase, histogram in self._latencies.get(command, dict()).items()},
+                } for command, calls in self._calls.items()
+            },
+            'unparsed': self._unparsed,
+        }
+
+
+    def export(self) -> str:
+        """
+        Get the collected metrics as JSON.
+        """
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+
+    def reset(self) -> None:
+        """
+        Discard the collected metrics, keeping the in-flight gauges.
+        """
+        self._calls = {command: 0 for command, count in self._in_flight.items() if count}
+        self._errors.clear()
+        self._latencies.clear()
+        self._unparsed = 0
+
+
+    def __record__(self, key: str, call: Call) -> None:
+        latencies: Optional[Dict[str, Histogram]] = self._latencies.get(key)
+        if latencies is None: latencies = self._latencies[key] = {'parse': Histogram(), 'bind': Histogram(), 'execute': Histogram()}
+        if call.parse is not None: latencies['parse'].record(call.parse)
+        if call.bind is not None: latencies['bind'].record(call.bind)
+        if call.execute is not None: latencies['execute'].record(call.execute)
@@ -0,0 +1,138 @@
+import logging
+from collections import OrderedDict
+from enum import Enum
+from logging import Logger
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from .handler import Invoker
+
+__all__: List[str] = [
+    "Plan",
+    "MessageCache",
+    "MessageCacheInfo",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the types of converted values that are safe to share between calls
+IMMUTABLE: tuple = (str, bytes, int, float, complex, bool, type(None), Enum, frozenset)
+
+class Plan():
+    """
+    The parsed form of a message, and what later dispatches of the same message can reuse:
+    the resolved invoker, and the converted keyword arguments once validated for a number of positional arguments.
+    """
+
+    __slots__ = ('command_name', 'kwargs', 'invoker', 'converted', 'width')
+
+    def __init__(self, command_name: str, kwargs: Dict[str, str]) -> None:
+        self.command_name: str = command_name
+        self.kwargs: Dict[str, str] = kwargs
+        # set on the first dispatch that resolves the command
+        self.invoker: Optional['Invoker'] = None
+        # the converted keyword arguments, and the number of positional arguments they were validated with
+        self.converted: Optional[Mapping[str, Any]] = None
+        self.width: int = -1
+
+
+    def __bound__(self, width: int, converted: Mapping[str, Any]) -> None:
+        """
+        Record arguments validated for a number of positional arguments.
+        Converted values that could be mutated by a command are never shared, so the plan only keeps immutable ones.
+        """
+        if converted is not self.kwargs and not all(isinstance(value, IMMUTABLE) for value in converted.values()): return
+        self.converted = converted
+        self.width = width
+
+
+class MessageCacheInfo(NamedTuple):
+    """
+    The counters of a message cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    # times the cache was cleared because the registry changed
+    invalidations: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MessageCache():
+    """
+    A bounded cache of message plans, keyed by message string.
+    The least recently used plan is evicted first.
+    """
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Raises:
+        - ValueError
+            upon a maxsize below 1
+        """
+        if maxsize < 1: raise ValueError('maxsize must be at least 1')
+        self._maxsize: int = maxsize
+        self._plans: OrderedDict[str, Plan] = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+        self._invalidations: int = 0
+
+
+    def get(self, message: str) -> Optional[Plan]:
+        """
+        Get the plan of a message, if cached.
+        """
+        plan: Optional[Plan] = self._plans.get(message)
+        if plan is None:
+            self._misses += 1
+            return None
+        self._plans.move_to_end(message)
+        self._hits += 1
+        return plan
+
+
+    def put(self, message: str, plan: Plan) -> Plan:
+        """
+        Cache the plan of a message, returning it.
+        """
+        self._plans[message] = plan
+        while len(self._plans) > self._maxsize:
+            self._plans.popitem(last=False)
+            self._evictions += 1
+        return plan
+
+
+    def info(self) -> MessageCacheInfo:
+        """
+        Get a snapshot of the cache's counters.
+        """
+        return MessageCacheInfo(self._hits, self._misses, self._evictions, self._invalidations, len(self._plans), self._maxsize)
+
+
+    def clear(self) -> None:
+        """
+        Remove every cached plan. Counters are kept.
+        """
+        self._plans.clear()
+
+
+    def __invalidate__(self) -> None:
+        """
+        Remove every cached plan after the registry changed.
+        """
+        if self._plans: log.debug('Invalidating %d cached messages', len(self._plans))
+        self._plans.clear()
+        self._invalidations += 1
@@ -1,18 +1,48 @@
 from typing import List
 
-from .command import Command, CommandError, SignatureMismatchException
+from .binder import Binder
+from .command import Command, CommandError, CommandTimeoutError, ParameterConversionError, SignatureMismatchException
 from .component import Component, ComponentError, ComponentInitializationError
+from .discovery import discover
+from .execution import ExecutionPolicy, execution_policy
+from .limiting import Limiter, Limits, LoadShedError, limit
+from .manifest import Manifest
+from .memoization import CacheInfo, ResultCache, memoize
+from .naming import alias
 from .package import Package
+from .streaming import Stream
+from .timeouts import timeout
 
 __all__: List[str] = [
     # Classes
     "Package",
     "Component",
     "Command",
+    "Binder",
+    "Manifest",
+    "ExecutionPolicy",
+    "Limits",
+    "Limiter",
+    "ResultCache",
+    "CacheInfo",
+    "Stream",
+
+    # Decorators
+    "execution_policy",
+    "alias",
+    "limit",
+    "memoize",
+    "timeout",
+
+    # Functions
+    "discover",
 
     # Command Errors
     "CommandError",
     "SignatureMismatchException",
+    "ParameterConversionError",
+    "CommandTimeoutError",
+    "LoadShedError",
 
     # Component Errors
     "ComponentError",
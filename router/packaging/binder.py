@@ -0,0 +1,105 @@
+import logging
+import sys
+from inspect import Parameter, Signature
+from logging import Logger
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+__all__: List[str] = [
+    "Binder"
+]
+
+log: Logger = logging.getLogger(__name__)
+
+class Binder():
+    """
+    Validates call arguments against a signature.
+
+    The signature is analyzed once at construction, so binding only checks the provided
+    arguments instead of walking every parameter and building a BoundArguments object.
+    Binding raises the same TypeError conditions as Signature.bind.
+    """
+
+    __slots__ = ('_signature', '_width', '_keywords', '_positional_only', '_required', '_var_positional', '_var_keyword')
+
+    @property
+    def signature(self) -> Signature:
+        return self._signature
+
+
+    def __init__(self, signature: Signature) -> None:
+        """
+        Compile a binder from a signature.
+        """
+
+        # set the source signature
+        self._signature: Signature = signature
+        # the number of parameters that can be filled positionally
+        self._width: int = 0
+        # maps keyword-capable parameter names to their positional index, or sys.maxsize if keyword-only
+        self._keywords: Dict[str, int] = dict()
+        # the names of positional-only parameters
+        positional_only: List[str] = list()
+        # the parameters without defaults, as (name, positional index, accepts keyword) tuples
+        required_parameters: List[Tuple[str, int, bool]] = list()
+        # whether the signature accepts *args or **kwargs
+        self._var_positional: bool = False
+        self._var_keyword: bool = False
+
+        for parameter in signature.parameters.values():
+            required: bool = parameter.default is Parameter.empty
+            if parameter.kind is Parameter.POSITIONAL_ONLY:
+                positional_only.append(parameter.name)
+                if required: required_parameters.append((parameter.name, self._width, False))
+                self._width += 1
+            elif parameter.kind is Parameter.POSITIONAL_OR_KEYWORD:
+                self._keywords[parameter.name] = self._width
+                if required: required_parameters.append((parameter.name, self._width, True))
+                self._width += 1
+            elif parameter.kind is Parameter.VAR_POSITIONAL:
+                self._var_positional = True
+            elif parameter.kind is Parameter.KEYWORD_ONLY:
+                self._keywords[parameter.name] = sys.maxsize
+                if required: required_parameters.append((parameter.name, sys.maxsize, True))
+            elif parameter.kind is Parameter.VAR_KEYWORD:
+                self._var_keyword = True
+        # store the compiled lists as tuples, which are smaller and immutable
+        self._positional_only: Tuple[str, ...] = tuple(positional_only)
+        self._required: Tuple[Tuple[str, int, bool], ...] = tuple(required_parameters)
+
+
+    def bind(self, args: Sequence[Any], kwargs: Mapping[str, Any]) -> Tuple[Sequence[Any], Mapping[str, Any]]:
+        """
+        Validate the provided arguments, returning the positional and keyword arguments to call with.
+
+        Raises:
+        - TypeError
+            upon arguments that cannot be bound to the signature
+        """
+
+        count: int = len(args)
+        # reject surplus positional arguments
+        if count > self._width and not self._var_positional:
+            raise TypeError('too many positional arguments')
+
+        for name in kwargs:
+            index: int = self._keywords.get(name, -1)
+            # reject keyword arguments already provided positionally
+            if index >= 0:
+                if index < count: raise TypeError(f'multiple values for argument {name!r}')
+            # reject unknown keyword arguments unless they are collected by **kwargs
+            elif not self._var_keyword:
+                if name in self._positional_only:
+                    raise TypeError(f'{name!r} parameter is positional only, but was passed as a keyword')
+                raise TypeError(f'got an unexpected keyword argument {name!r}')
+
+        # reject missing required arguments
+        for name, index, keyword in self._required:
+            if index < count: continue
+            if keyword and name in kwargs: continue
+            raise TypeError(f'missing a required argument: {name!r}')
+
+        return args, kwargs
+
+
+    def __call__(self, args: Sequence[Any], kwargs: Mapping[str, Any]) -> Tuple[Sequence[Any], Mapping[str, Any]]:
+        return self.bind(args, kwargs)
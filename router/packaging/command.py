@@ -1,14 +1,33 @@
+import asyncio
+import functools
 import inspect
 import logging
-from inspect import BoundArguments, Signature
+import time
+import typing
+from concurrent.futures import Executor, Future
+from inspect import BoundArguments, Parameter, Signature
 from logging import Logger
-from types import MethodType
-from typing import Optional
+from types import MappingProxyType, MethodType
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+from .binder import Binder
+from .conversion import Converter, compile_converter
+from .execution import ExecutionPolicy, get_execution_policy
+from .limiting import Limiter, Limits, get_limits
+from .memoization import Memoization, ResultCache, get_memoization
+from .naming import get_aliases
+from .streaming import Stream
+from .timeouts import get_timeout
 
 log: Logger = logging.getLogger(__name__)
 
+# the converters of commands without parameters requiring conversion, shared to avoid a mapping per command
+NO_CONVERTERS: Mapping[str, Converter] = MappingProxyType(dict())
+
 class Command():
-    
+
+    __slots__ = ('_method', '_signature', '_coroutine', '_streaming', '_binder', '_converters', '_policy', '_aliases', '_limiter', '_cache', '_timeout')
+
     @property
     def name(self) -> str:
         return self._method.__name__
@@ -24,6 +43,46 @@ class Command():
     @property
     def signature(self) -> Signature:
         return self._signature
+
+    @property
+    def method(self) -> MethodType:
+        return self._method
+
+    @property
+    def coroutine(self) -> bool:
+        return self._coroutine
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    @property
+    def binder(self) -> Binder:
+        return self._binder
+
+    @property
+    def converters(self) -> Mapping[str, Converter]:
+        return self._converters
+
+    @property
+    def policy(self) -> ExecutionPolicy:
+        return self._policy
+
+    @property
+    def aliases(self) -> Tuple[str, ...]:
+        return self._aliases
+
+    @property
+    def limiter(self) -> Optional[Limiter]:
+        return self._limiter
+
+    @property
+    def cache(self) -> Optional[ResultCache]:
+        return self._cache
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
         
 
     def __init__(self, obj: MethodType) -> None:
@@ -37,33 +96,148 @@ class Command():
         self._method: MethodType = obj
         # get the method's signature
         self._signature: Signature = inspect.signature(self._method)
+        # determine the invocation strategy once
+        self._coroutine: bool = inspect.iscoroutinefunction(self._method)
+        # generator and async generator commands stream their items
+        self._streaming: bool = inspect.isgeneratorfunction(self._method) or inspect.isasyncgenfunction(self._method)
+        # compile the argument binder from the signature
+        self._binder: Binder = Binder(self._signature)
+        # compile the parameter converters from the annotations
+        converters: Dict[str, Converter] = self.__compile_converters__()
+        self._converters: Mapping[str, Converter] = MappingProxyType(converters) if converters else NO_CONVERTERS
+        # get the declared execution policy
+        self._policy: ExecutionPolicy = get_execution_policy(self._method)
+        # coroutines always run on the event loop
+        if self._coroutine and self._policy is not ExecutionPolicy.INLINE:
+            log.warning('Ignoring %s execution policy for coroutine command %s', self._policy.value, self.name)
+            self._policy = ExecutionPolicy.INLINE
+        # async generators always run on the event loop, and generators cannot be sent to other processes
+        if inspect.isasyncgenfunction(self._method) and self._policy is not ExecutionPolicy.INLINE:
+            log.warning('Ignoring %s execution policy for async generator command %s', self._policy.value, self.name)
+            self._policy = ExecutionPolicy.INLINE
+        elif self._streaming and self._policy is ExecutionPolicy.PROCESS:
+            log.warning('Running generator command %s in a thread instead of a process', self.name)
+            self._policy = ExecutionPolicy.THREAD
+        # get the declared aliases
+        self._aliases: Tuple[str, ...] = get_aliases(self._method)
+        # create the limiter enforcing the declared limits, if any
+        limits: Optional[Limits] = get_limits(self._method)
+        self._limiter: Optional[Limiter] = Limiter(self.name, limits) if limits else None
+        # create the result cache of a memoized command
+        memoization: Optional[Memoization] = get_memoization(self._method)
+        if memoization and self._streaming:
+            log.warning('Ignoring memoization of generator command %s, whose items are produced on demand', self.name)
+            memoization = None
+        self._cache: Optional[ResultCache] = ResultCache(memoization) if memoization else None
+        # get the declared timeout
+        self._timeout: Optional[float] = get_timeout(self._method)
 
 
-    async def run(self, arguments: BoundArguments) -> None:
+    def __compile_converters__(self) -> Dict[str, Converter]:
+        """
+        Compile a converter for each keyword-capable parameter whose annotation requires conversion.
         """
-        Run the command via provided BoundArguments.
+        # resolve postponed (string) annotations where possible
+        try: hints: Dict[str, Any] = typing.get_type_hints(self._method)
+        except Exception: hints: Dict[str, Any] = dict()
+
+        converters: Dict[str, Converter] = dict()
+        for parameter in self._signature.parameters.values():
+            if parameter.kind not in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY): continue
+            converter: Optional[Converter] = compile_converter(hints.get(parameter.name, parameter.annotation))
+            if converter: converters[parameter.name] = converter
+        return converters
+
+
+    def convert(self, kwargs: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Convert string keyword argument values according to the parameter annotations.
+        Non-string values and parameters without a converter are passed through unchanged.
+
+        Raises:
+        - ParameterConversionError
+            upon a value that cannot be converted to its annotated type
+        """
+        converted: Dict[str, Any] = dict(kwargs)
+        for name, value in kwargs.items():
+            converter: Optional[Converter] = self._converters.get(name)
+            if converter is None or not isinstance(value, str): continue
+            try:
+                converted[name] = converter(value)
+            except Exception as error:
+                raise ParameterConversionError(name, value, self._signature.parameters[name].annotation, error)
+        return converted
+
+
+    async def run(self, arguments: BoundArguments, executor: Optional[Executor] = None) -> Any:
+        """
+        Run the command via provided BoundArguments, returning its result.
+        Arguments bound from the command's own signature skip signature validation.
+        Synchronous commands are run in the provided executor, if any, instead of on the event loop.
+        Results of memoized commands are served from the command's cache when possible.
+        Generator and async generator commands return a Stream of their items.
+        Commands with a declared timeout are cancelled once it passes; a stream's items are bounded by the time remaining.
 
         Raises:
         - SignatureMismatchException
             upon failure to provide matching command arguments
+        - CommandTimeoutError
+            upon the command running past its timeout
+        """
+        # if the provided arguments were bound from another signature that does not match the command signature
+        if arguments.signature is not self._signature and arguments.signature.parameters != self._signature.parameters:
+            raise SignatureMismatchException(arguments.signature, self._signature)
+        return await self.__invoke__(arguments.args, arguments.kwargs, executor, self._timeout)
+
+
+    async def __invoke__(self, args: Sequence[Any], kwargs: Mapping[str, Any], executor: Optional[Executor], timeout: Optional[float], submitted: Optional[Callable[[Future], None]] = None) -> Any:
         """
+        Run the command with validated arguments, serving memoized results and cancelling it once the timeout passes.
+        """
+        if self._cache: execution: Awaitable[Any] = self._cache.call(args, kwargs, functools.partial(self.__execute__, args, kwargs, executor, submitted))
+        else: execution: Awaitable[Any] = self.__execute__(args, kwargs, executor, submitted)
+        if timeout is None: return await execution
+        deadline: float = time.monotonic() + timeout
         try:
-            # if the provided arguments do not match the command arguments
-            if arguments.signature.parameters != self._signature.parameters:
-                raise SignatureMismatchException(arguments.signature, self._signature)
-            if not inspect.iscoroutinefunction(self._method):
-                self._method(*arguments.args, **arguments.kwargs)
-            elif inspect.iscoroutinefunction(self._method):
-                await self._method(*arguments.args, **arguments.kwargs)
-        
-        except SignatureMismatchException:
-            raise
+            result: Any = await asyncio.wait_for(execution, timeout)
+        except asyncio.TimeoutError as error:
+            raise CommandTimeoutError(self.name, timeout, error)
+        # a stream runs on after it is returned, so its items are bounded by the time remaining
+        if self._streaming: result.__bound__(deadline, functools.partial(CommandTimeoutError, self.name, timeout))
+        return result
+
+
+    async def __execute__(self, args: Sequence[Any], kwargs: Mapping[str, Any], executor: Optional[Executor], submitted: Optional[Callable[[Future], None]] = None) -> Any:
+        """
+        Run the command with validated arguments.
+        Work submitted to the executor is passed to submitted, if provided: cancelling the call does not stop
+        a thread or process that already started it.
+        """
+        try:
+            if self._streaming:
+                return Stream(self._method(*args, **kwargs), executor, self.__wrap_error__)
+            elif self._coroutine:
+                return await self._method(*args, **kwargs)
+            elif executor:
+                future: Future = executor.submit(functools.partial(self._method, *args, **kwargs))
+                if submitted: submitted(future)
+                return await asyncio.wrap_future(future)
+            else:
+                return self._method(*args, **kwargs)
         except SyntaxError:
             raise
         except Exception as error:
             raise CommandError(str(error), error)
 
 
+    @staticmethod
+    def __wrap_error__(error: Exception) -> Exception:
+        """
+        Wrap an exception raised while streaming a command's items, like one raised by running it.
+        """
+        return error if isinstance(error, SyntaxError) else CommandError(str(error), error)
+
+
 class CommandError(Exception):
     """Base exception class for command related errors."""
 
@@ -82,3 +256,25 @@ class SignatureMismatchException(CommandError):
     def __init__(self, provided_signature: Signature, target_signature: Signature, exception: Optional[Exception] = None) -> None:
         message: str = f'Incompatible signature provided; received {provided_signature}, expected {target_signature}'
         super().__init__(message, exception)
+
+
+class ParameterConversionError(CommandError):
+    """Raised when a parameter value cannot be converted to its annotated type."""
+
+    def __init__(self, parameter_name: str, value: str, annotation: Any, exception: Optional[Exception] = None) -> None:
+        annotation_name: str = getattr(annotation, '__name__', str(annotation))
+        message: str = f'Could not convert parameter \'{parameter_name}\' value \'{value}\' to {annotation_name}: {exception}'
+        super().__init__(message, exception)
+
+
+class CommandTimeoutError(CommandError):
+    """Raised when a command runs past its timeout and is cancelled."""
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    def __init__(self, command_name: str, timeout: float, exception: Optional[Exception] = None) -> None:
+        self._timeout: float = timeout
+        message: str = f'Command {command_name} timed out after {timeout:g}s'
+        super().__init__(message, exception)
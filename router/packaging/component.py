@@ -4,14 +4,17 @@ from collections.abc import Mapping
 from inspect import BoundArguments, Signature
 from logging import Logger
 from types import MethodType
-from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Type
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Type
 
 from .command import Command
+from .limiting import Limiter, Limits, get_limits
 
 log: Logger = logging.getLogger(__name__)
 
 class Component(Mapping[str, Command]):
-    
+
+    __slots__ = ('_type', '_instance', '_commands', '_limiter', '_failures')
+
     @property
     def name(self) -> str:
         return self._type.__name__
@@ -26,7 +29,19 @@ class Component(Mapping[str, Command]):
 
     @property
     def signature(self) -> Signature:
-        return self._signature
+        return inspect.signature(self._type.__init__)
+
+    @property
+    def instance(self) -> Any:
+        return self._instance
+
+    @property
+    def limiter(self) -> Optional[Limiter]:
+        return self._limiter
+
+    @property
+    def failures(self) -> List[str]:
+        return self._failures
 
 
     def __init__(self, obj: Type, *args, **kwargs):
@@ -40,13 +55,11 @@ class Component(Mapping[str, Command]):
 
         # set the Type object
         self._type: Type = obj
-        # get the type's initializer signature
-        self._signature: Signature = inspect.signature(self._type.__init__)
-        # bind the provided parameters to the signature
+        # bind the provided parameters to the initializer signature; the bound arguments are only needed to initialize
         try:
-            self._arguments: BoundArguments = self._signature.bind(self, *args, **kwargs)
+            arguments: BoundArguments = self.signature.bind(self, *args, **kwargs)
             # initialize the class object
-            self._instance: Any = self._type(*self._arguments.args, **self._arguments.kwargs)
+            self._instance: Any = self._type(*arguments.args, **arguments.kwargs)
         # if an error occurred during binding
         except TypeError as error:
             raise ComponentInitializationError(self._type.__name__, error)
@@ -55,23 +68,39 @@ class Component(Mapping[str, Command]):
             raise ComponentInitializationError(self._type.__name__, error)
         # load all commands
         self._commands: Dict[str, Command] = dict()
+        # the names of methods that failed to build as commands
+        self._failures: List[str] = list()
+        # create the limiter shared by all commands, if the component declares limits
+        limits: Optional[Limits] = get_limits(self._type)
+        self._limiter: Optional[Limiter] = Limiter(self.name, limits) if limits else None
 
 
-    def load(self) -> None:
+    def load(self, names: Optional[Iterable[str]] = None) -> None:
         """
         Initializes and stores instances of each method contained by the component
         as command instances
+
+        Parameters:
+        - names:
+            the component's command names if already known, e.g. from a manifest record;
+            only those methods are looked up instead of scanning every member of the instance
         """
-        # get all method members of the instance
-        members: List[Tuple[str, MethodType]] = inspect.getmembers(self._instance, inspect.ismethod)
-        # filter members that start with a double underscore
-        members: List[Tuple[str, MethodType]] = [(method_name, method_object) for method_name, method_object, in members if not method_name.startswith('__')]
+        if names is None:
+            # get all method members of the instance
+            members: List[Tuple[str, MethodType]] = inspect.getmembers(self._instance, inspect.ismethod)
+            # filter members that start with a double underscore
+            members: List[Tuple[str, MethodType]] = [(method_name, method_object) for method_name, method_object, in members if not method_name.startswith('__')]
+        else:
+            # get the known method members of the instance
+            members: List[Tuple[str, MethodType]] = [(method_name, getattr(self._instance, method_name, None)) for method_name in names]
+            members: List[Tuple[str, MethodType]] = [(method_name, method_object) for method_name, method_object in members if inspect.ismethod(method_object)]
         # for each member
         for method_name, method_object in members:
             # instantiate command
             command: Optional[Command] = self.__build_command__(method_object)
             # add command to dictionary
             if command: self._commands[command.name] = command
+            else: self._failures.append(method_name)
 
 
     def __build_command__(self, met: MethodType) -> Optional[Command]:
@@ -0,0 +1,100 @@
+import enum
+import logging
+import types
+import typing
+from decimal import Decimal
+from enum import Enum
+from fractions import Fraction
+from inspect import Parameter
+from logging import Logger
+from pathlib import Path
+from typing import Any, Callable, List, Literal, Optional, Tuple, Union
+
+__all__: List[str] = [
+    "Converter",
+    "compile_converter",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+Converter = Callable[[str], Any]
+
+# string values accepted for boolean parameters
+TRUE_VALUES: Tuple[str, ...] = ('true', 'yes', 'on', '1', 't', 'y')
+FALSE_VALUES: Tuple[str, ...] = ('false', 'no', 'off', '0', 'f', 'n')
+# types constructed directly from the string value
+CONSTRUCTIBLE: Tuple[type, ...] = (int, float, complex, Decimal, Fraction, Path)
+
+
+def _to_bool(value: str) -> bool:
+    normalized: str = value.strip().lower()
+    if normalized in TRUE_VALUES: return True
+    if normalized in FALSE_VALUES: return False
+    raise ValueError(f'expected one of {", ".join(TRUE_VALUES + FALSE_VALUES)}')
+
+
+def _to_enum(annotation: typing.Type[Enum]) -> Converter:
+    # precompute the member lookups once
+    by_name: typing.Dict[str, Enum] = {name.lower(): member for name, member in annotation.__members__.items()}
+    by_value: typing.Dict[str, Enum] = {str(member.value).lower(): member for member in annotation}
+
+    def convert(value: str) -> Enum:
+        normalized: str = value.strip().lower()
+        if normalized in by_name: return by_name[normalized]
+        if normalized in by_value: return by_value[normalized]
+        raise ValueError(f'expected one of {", ".join(annotation.__members__)}')
+    return convert
+
+
+def _to_literal(choices: Tuple[Any, ...]) -> Converter:
+    # map the string form of each choice to the choice itself
+    lookup: typing.Dict[str, Any] = {str(choice): choice for choice in choices}
+
+    def convert(value: str) -> Any:
+        if value in lookup: return lookup[value]
+        raise ValueError(f'expected one of {", ".join(lookup)}')
+    return convert
+
+
+def _to_union(converters: List[Converter]) -> Converter:
+    def convert(value: str) -> Any:
+        errors: List[Exception] = list()
+        for converter in converters:
+            try: return converter(value)
+            except Exception as error: errors.append(error)
+        raise ValueError('; '.join(str(error) for error in errors))
+    return convert
+
+
+def compile_converter(annotation: Any) -> Optional[Converter]:
+    """
+    Compile a converter that parses a string value into the annotated type.
+    Returns None when the value should be passed through unchanged.
+    """
+
+    # unannotated and string parameters receive the raw value
+    if annotation is Parameter.empty or annotation is Any or annotation is str:
+        return None
+
+    origin: Any = typing.get_origin(annotation)
+    # Optional[T] and T | None convert to T
+    if origin is Union or origin is types.UnionType:
+        members: List[Any] = [member for member in typing.get_args(annotation) if member is not type(None)]
+        converters: List[Optional[Converter]] = [compile_converter(member) for member in members]
+        # a union including str accepts any value as-is
+        if any(converter is None for converter in converters): return None
+        return converters[0] if len(converters) == 1 else _to_union(converters)
+    if origin is Literal:
+        return _to_literal(typing.get_args(annotation))
+    # other generic aliases cannot be constructed from a string
+    if origin is not None:
+        return None
+
+    if annotation is bool:
+        return _to_bool
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return _to_enum(annotation)
+    if annotation in CONSTRUCTIBLE:
+        return annotation
+    # other annotations are left to the command
+    return None
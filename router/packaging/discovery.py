@@ -0,0 +1,51 @@
+import ast
+import logging
+from logging import Logger
+from pathlib import Path
+from typing import Dict, List, Optional
+
+__all__: List[str] = [
+    "discover"
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# decorators whose functions are not loaded as commands
+EXCLUDED_DECORATORS: List[str] = ['staticmethod', 'property', 'cached_property', 'setter', 'getter', 'deleter']
+
+
+def _decorator_name(node: ast.expr) -> Optional[str]:
+    """
+    Get the trailing name of a decorator expression, e.g. 'setter' for @value.setter.
+    """
+    if isinstance(node, ast.Call): node = node.func
+    if isinstance(node, ast.Name): return node.id
+    if isinstance(node, ast.Attribute): return node.attr
+    return None
+
+
+def discover(reference: Path) -> Dict[str, List[str]]:
+    """
+    Statically discover the component and command names of a package file without importing it.
+
+    Components are the classes defined at the top level of the file. Commands are the methods
+    defined in a component's body, excluding dunder methods, static methods and properties.
+    Methods inherited from other classes cannot be discovered statically.
+
+    Raises:
+    - SyntaxError
+        upon a package file that cannot be parsed
+    """
+
+    tree: ast.Module = ast.parse(reference.read_text(), filename=str(reference))
+    components: Dict[str, List[str]] = dict()
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef): continue
+        commands: List[str] = list()
+        for member in node.body:
+            if not isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)): continue
+            if member.name.startswith('__'): continue
+            if any(_decorator_name(decorator) in EXCLUDED_DECORATORS for decorator in member.decorator_list): continue
+            commands.append(member.name)
+        components[node.name] = commands
+    return components
@@ -0,0 +1,60 @@
+import logging
+from enum import Enum
+from logging import Logger
+from types import MethodType
+from typing import Any, Callable, List, TypeVar, Union
+
+__all__: List[str] = [
+    "ExecutionPolicy",
+    "execution_policy",
+    "get_execution_policy",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the attribute holding a declared policy on a method or a component class
+ATTRIBUTE: str = '__execution_policy__'
+
+T = TypeVar('T', bound=Callable[..., Any])
+
+class ExecutionPolicy(Enum):
+    """
+    Where a synchronous command is executed.
+
+    - INLINE runs the command on the event loop
+    - THREAD runs the command in the handler's thread pool
+    - PROCESS runs the command in the handler's process pool;
+      the component instance and arguments must be picklable
+    """
+
+    INLINE = 'inline'
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+
+def execution_policy(policy: Union[ExecutionPolicy, str]) -> Callable[[T], T]:
+    """
+    Declare the execution policy of a command method, or of every command in a component class.
+
+    The policy can also be declared on a component via the __execution_policy__ class attribute.
+    """
+
+    resolved: ExecutionPolicy = ExecutionPolicy(policy)
+
+    def decorator(obj: T) -> T:
+        setattr(obj, ATTRIBUTE, resolved)
+        return obj
+    return decorator
+
+
+def get_execution_policy(method: MethodType) -> ExecutionPolicy:
+    """
+    Get the declared execution policy of a method.
+    A policy declared on the method takes precedence over one declared on its component class.
+    """
+
+    declared: Any = getattr(method.__func__, ATTRIBUTE, None)
+    # classmethods are bound to the class itself
+    owner: type = method.__self__ if isinstance(method.__self__, type) else type(method.__self__)
+    if declared is None: declared = getattr(owner, ATTRIBUTE, None)
+    return ExecutionPolicy(declared) if declared is not None else ExecutionPolicy.INLINE
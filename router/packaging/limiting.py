@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from logging import Logger
+from types import MethodType
+from typing import Any, Callable, Deque, List, Optional, TypeVar
+
+__all__: List[str] = [
+    "Limits",
+    "Limiter",
+    "limit",
+    "get_limits",
+    "LoadShedError",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the attribute holding declared limits on a method or a component class
+ATTRIBUTE: str = '__limits__'
+
+T = TypeVar('T', bound=Callable[..., Any])
+
+class Limits():
+    """
+    The declared admission limits of a command or a component.
+
+    - concurrency: the maximum number of simultaneous executions
+    - rate: the sustained number of executions admitted per second, via a token bucket
+    - burst: the number of executions admitted at once before the rate applies;
+      defaults to the rate rounded up
+    - queue: the maximum number of callers waiting for admission; callers beyond it are shed
+    - timeout: the maximum seconds a caller waits for admission; None waits until admitted
+    """
+
+    @property
+    def concurrency(self) -> Optional[int]:
+        return self._concurrency
+
+    @property
+    def rate(self) -> Optional[float]:
+        return self._rate
+
+    @property
+    def burst(self) -> Optional[int]:
+        return self._burst
+
+    @property
+    def queue(self) -> int:
+        return self._queue
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+
+    def __init__(self, concurrency: Optional[int] = None, rate: Optional[float] = None, burst: Optional[int] = None, queue: int = 0, timeout: Optional[float] = None) -> None:
+        """
+        Raises:
+        - ValueError
+            upon a non-positive concurrency, rate or burst, or a negative queue or timeout
+        """
+        if concurrency is not None and concurrency < 1: raise ValueError('concurrency must be at least 1')
+        if rate is not None and rate <= 0: raise ValueError('rate must be positive')
+        if burst is not None and burst < 1: raise ValueError('burst must be at least 1')
+        if queue < 0: raise ValueError('queue must not be negative')
+        if timeout is not None and timeout < 0: raise ValueError('timeout must not be negative')
+        self._concurrency: Optional[int] = concurrency
+        self._rate: Optional[float] = rate
+        self._burst: Optional[int] = burst if burst is not None or rate is None else max(1, math.ceil(rate))
+        self._queue: int = queue
+        self._timeout: Optional[float] = timeout
+
+
+    def __repr__(self) -> str:
+        return f'Limits(concurrency={self._concurrency}, rate={self._rate}, burst={self._burst}, queue={self._queue}, timeout={self._timeout})'
+
+
+class Limiter():
+    """
+    Enforces limits on the executions sharing it, on the event loop that runs them.
+
+    Callers are admitted by the token bucket first, then by the concurrency limit,
+    in arrival order. Callers that cannot be admitted immediately wait if the queue has
+    room and their timeout allows, and are shed with a LoadShedError otherwise.
+    """
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def limits(self) -> Limits:
+        return self._limits
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+
+    def __init__(self, name: str, limits: Limits) -> None:
+        self._name: str = name
+        self._limits: Limits = limits
+        # the number of admitted executions that have not been released
+        self._active: int = 0
+        # the number of callers waiting for a token or a slot
+        self._waiting: int = 0
+        # the callers waiting for a slot, in arrival order
+        self._waiters: Deque[asyncio.Future] = deque()
+        # the token bucket, which goes negative while callers wait for reserved tokens
+        self._tokens: float = float(limits.burst) if limits.burst else 0.0
+        self._updated: float = time.monotonic()
+
+
+    async def acquire(self) -> None:
+        """
+        Wait for admission.
+
+        Raises:
+        - LoadShedError
+            upon a full queue, or a wait that would exceed the timeout
+        """
+        deadline: Optional[float] = None if self._limits.timeout is None else time.monotonic() + self._limits.timeout
+        if self._limits.rate is not None: await self.__take__(deadline)
+        if self._limits.concurrency is not None: await self.__occupy__(deadline)
+
+
+    def release(self) -> None:
+        """
+        Release an admitted execution, handing its slot to the next waiting caller.
+        """
+        if self._limits.concurrency is None: return
+        while self._waiters:
+            waiter: asyncio.Future = self._waiters.popleft()
+            if waiter.done(): continue
+            # the slot passes to the waiter, so the active count is unchanged
+            waiter.set_result(None)
+            return
+        self._active -= 1
+
+
+    async def __take__(self, deadline: Optional[float]) -> None:
+        """
+        Take a token from the bucket, waiting for a reserved token if none is available.
+        """
+        now: float = time.monotonic()
+        self._tokens = min(float(self._limits.burst), self._tokens + (now - self._updated) * self._limits.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return
+        # reserve the next token, waiting until it is due
+        delay: float = (1 - self._tokens) / self._limits.rate
+        if self._waiting >= self._limits.queue: raise LoadShedError(self._name, 'rate limit exceeded')
+        if deadline is not None and now + delay > deadline: raise LoadShedError(self._name, 'rate limit exceeded')
+        self._tokens -= 1
+        self._waiting += 1
+        try:
+            await asyncio.sleep(delay)
+        except BaseException:
+            # return the reservation of a cancelled caller
+            self._tokens += 1
+            raise
+        finally:
+            self._waiting -= 1
+
+
+    async def __occupy__(self, deadline: Optional[float]) -> None:
+        """
+        Take an execution slot, waiting for one if none is free.
+        """
+        if self._active < self._limits.concurrency and not self._waiters:
+            self._active += 1
+            return
+        if self._waiting >= self._limits.queue: raise LoadShedError(self._name, 'concurrency limit exceeded')
+        timeout: Optional[float] = None if deadline is None else deadline - time.monotonic()
+        if timeout is not None and timeout <= 0: raise LoadShedError(self._name, 'concurrency limit exceeded')
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException as error:
+            # a caller handed a slot as it was cancelled passes the slot on
+            if waiter.done() and not waiter.cancelled(): self.release()
+            elif waiter in self._waiters: self._waiters.remove(waiter)
+            if isinstance(error, asyncio.TimeoutError): raise LoadShedError(self._name, f'no execution slot within {self._limits.timeout}s')
+            raise
+        finally:
+            self._waiting -= 1
+
+
+def limit(concurrency: Optional[int] = None, rate: Optional[float] = None, burst: Optional[int] = None, queue: int = 0, timeout: Optional[float] = None) -> Callable[[T], T]:
+    """
+    Declare the admission limits of a command method, or of a component class.
+
+    Limits declared on a method apply to that command alone. Limits declared on a component
+    are shared by all of its commands. A command of a limited component with its own limits
+    must satisfy both.
+    """
+
+    limits: Limits = Limits(concurrency, rate, burst, queue, timeout)
+
+    def decorator(obj: T) -> T:
+        setattr(obj, ATTRIBUTE, limits)
+        return obj
+    return decorator
+
+
+def get_limits(obj: Any) -> Optional[Limits]:
+    """
+    Get the limits declared on a method or a component class.
+    """
+
+    if isinstance(obj, MethodType): obj = obj.__func__
+    limits: Any = getattr(obj, ATTRIBUTE, None)
+    return limits if isinstance(limits, Limits) else None
+
+
+class LoadShedError(Exception):
+    """Raised when an execution is rejected by its limits."""
+
+    def __init__(self, name: str, reason: str, exception: Optional[Exception] = None) -> None:
+        self._message = f'Shed load for {name}: {reason}'
+        self._inner_exception = exception
+
+    def __str__(self) -> str:
+        return self._message
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .package import Package
+
+__all__: List[str] = [
+    "Manifest"
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the manifest format version; manifests with another version are discarded
+VERSION: int = 2
+
+class Manifest():
+    """
+    A persistent cache of package metadata, keyed by package filename.
+
+    Each record stores the package, component and command names, command signatures and docs,
+    along with the file's mtime, size and content hash. A record is fresh while the file's
+    mtime and size are unchanged; otherwise the content hash decides whether it still applies.
+
+    Records also store the names of classes and methods that failed to build, and the mtime and size
+    of the files defining the components' base classes. A record of a package that partially failed
+    to build, or whose base class files changed, is never fresh.
+    """
+
+    @property
+    def reference(self) -> Path:
+        return self._reference
+
+    @property
+    def records(self) -> Dict[str, Dict[str, Any]]:
+        return self._records
+
+
+    def __init__(self, reference: Path) -> None:
+        """
+        Initialize a manifest via its path, reading any existing records.
+        """
+
+        # resolve the provided reference
+        self._reference: Path = reference.resolve()
+        # initialize the records, keyed by package filename
+        self._records: Dict[str, Dict[str, Any]] = dict()
+        # whether the records changed since they were read
+        self._dirty: bool = False
+        self.__read__()
+
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> 'Manifest':
+        """
+        Get the manifest kept next to a package directory.
+        """
+        directory = directory.resolve()
+        return cls(directory.parent.joinpath(f'.{directory.name}.manifest.json'))
+
+
+    def __read__(self) -> None:
+        try:
+            data: Dict[str, Any] = json.loads(self._reference.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as error:
+            log.warning('Discarding unreadable manifest %s: %s', self._reference.name, error)
+            return
+        if data.get('version') != VERSION:
+            log.debug('Discarding manifest %s with version %s', self._reference.name, data.get('version'))
+            return
+        self._records = data.get('packages', dict())
+
+
+    def save(self) -> None:
+        """
+        Write the manifest if its records changed, replacing the file atomically.
+        """
+        if not self._dirty: return
+        temporary: Path = self._reference.with_name(f'{self._reference.name}.{os.getpid()}.tmp')
+        temporary.write_text(json.dumps({'version': VERSION, 'packages': self._records}, indent=2, sort_keys=True))
+        os.replace(temporary, self._reference)
+        self._dirty = False
+        log.debug('Wrote manifest %s', self._reference.name)
+
+
+    def get(self, source: Path) -> Optional[Dict[str, Any]]:
+        """
+        Get the package record for a package file, or None if the record is missing or stale.
+        """
+        record: Optional[Dict[str, Any]] = self._records.get(source.name)
+        if not record or not self.__complete__(record): return None
+
+        stat: os.stat_result = source.stat()
+        # an unchanged mtime and size means an unchanged file
+        if record['mtime'] == stat.st_mtime_ns and record['size'] == stat.st_size: return record['package']
+        # otherwise compare the content hash
+        if record['hash'] != self.__digest__(source): return None
+        # the file was touched but not changed; refresh the cached stat
+        record['mtime'], record['size'] = stat.st_mtime_ns, stat.st_size
+        self._dirty = True
+        return record['package']
+
+
+    def commands(self, source: Path) -> Optional[Dict[str, List[str]]]:
+        """
+        Get the command names of each component of a package file, or None if the record is missing or stale.
+        """
+        package: Optional[Dict[str, Any]] = self.get(source)
+        if package is None: return None
+        return {component_name: list(component['commands']) for component_name, component in package['components'].items()}
+
+
+    def update(self, package: Package) -> None:
+        """
+        Record the metadata of an assembled package.
+        A fresh record of a completely built package is kept as is, so unchanged packages are neither hashed nor described again.
+        """
+        source: Path = package.reference
+        stat: os.stat_result = source.stat()
+        record: Optional[Dict[str, Any]] = self._records.get(source.name)
+        if package.complete and record and record['mtime'] == stat.st_mtime_ns and record['size'] == stat.st_size and self.__complete__(record): return
+        self._records[source.name] = {
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': self.__digest__(source),
+            'dependencies': {str(dependency): self.__stat__(dependency) for dependency in package.dependencies()},
+            'package': self.describe(package),
+        }
+        self._dirty = True
+
+
+    def prune(self, sources: Iterable[Path]) -> None:
+        """
+        Remove the records of package files that are not among the provided sources.
+        """
+        names: Set[str] = {source.name for source in sources}
+        for name in [name for name in self._records if name not in names]:
+            del self._records[name]
+            self._dirty = True
+
+
+    @staticmethod
+    def describe(package: Package) -> Dict[str, Any]:
+        """
+        Get the metadata of an assembled package, including the names of classes and methods that failed to build.
+        """
+        return {
+            'name': package.name,
+            'doc': package.doc,
+            'failures': {
+                'components': list(package.failures),
+                'commands': {component.name: list(component.failures) for component in package.values() if component.failures},
+            },
+            'components': {
+                component.name: {
+                    'doc': component.doc,
+                    'commands': {
+                        command.name: {
+                            'signature': str(command.signature),
+                            'doc': command.doc,
+                        } for command in component.values()
+                    },
+                } for component in package.values()
+            },
+        }
+
+
+    @classmethod
+    def __complete__(cls, record: Dict[str, Any]) -> bool:
+        """
+        Whether a record describes a completely built package whose base class files are unchanged.
+        """
+        failures: Dict[str, Any] = record['package']['failures']
+        if failures['components'] or failures['commands']: return False
+        return all(cls.__stat__(Path(dependency)) == stat for dependency, stat in record['dependencies'].items())
+
+
+    @staticmethod
+    def __stat__(source: Path) -> Optional[List[int]]:
+        try:
+            stat: os.stat_result = source.stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+
+    @staticmethod
+    def __digest__(source: Path) -> str:
+        return hashlib.sha256(source.read_bytes()).hexdigest()
@@ -0,0 +1,230 @@
+import asyncio
+import functools
+import logging
+import time
+from collections import OrderedDict
+from logging import Logger
+from types import MethodType
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+__all__: List[str] = [
+    "Memoization",
+    "ResultCache",
+    "CacheInfo",
+    "memoize",
+    "get_memoization",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the attribute holding the declared memoization on a method
+ATTRIBUTE: str = '__memoization__'
+
+T = TypeVar('T', bound=Callable[..., Any])
+
+class Memoization():
+    """
+    The declared memoization of a command.
+
+    - maxsize: the maximum number of cached results; the least recently used is evicted first
+    - ttl: the seconds a result stays cached; None keeps results until evicted
+    - key: computes the cache key from the call arguments; by default every argument is part
+      of the key, and calls with unhashable arguments bypass the cache
+    """
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self._ttl
+
+    @property
+    def key(self) -> Optional[Callable[..., Hashable]]:
+        return self._key
+
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None, key: Optional[Callable[..., Hashable]] = None) -> None:
+        """
+        Raises:
+        - ValueError
+            upon a maxsize below 1 or a non-positive ttl
+        """
+        if maxsize < 1: raise ValueError('maxsize must be at least 1')
+        if ttl is not None and ttl <= 0: raise ValueError('ttl must be positive')
+        self._maxsize: int = maxsize
+        self._ttl: Optional[float] = ttl
+        self._key: Optional[Callable[..., Hashable]] = key
+
+
+class CacheInfo(NamedTuple):
+    """
+    The counters of a result cache.
+    """
+
+    hits: int
+    misses: int
+    # calls that awaited an identical call already executing
+    shared: int
+    # calls whose arguments could not be used as a key
+    bypassed: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class ResultCache():
+    """
+    Caches the results of a command, keyed on its bound arguments.
+
+    Concurrent calls with the same key share a single execution, which keeps running while any of them awaits it.
+    Only results are cached; a call that raises is not cached and its exception is raised to every call sharing it.
+    """
+
+    @property
+    def memoization(self) -> Memoization:
+        return self._memoization
+
+
+    def __init__(self, memoization: Memoization) -> None:
+        self._memoization: Memoization = memoization
+        # the cached results and their expiry times, least recently used first
+        self._entries: OrderedDict[Hashable, Tuple[Any, Optional[float]]] = OrderedDict()
+        # the executions in flight, keyed like the results
+        self._pending: Dict[Hashable, 'Execution'] = dict()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._shared: int = 0
+        self._bypassed: int = 0
+        self._evictions: int = 0
+
+
+    async def call(self, args: Sequence[Any], kwargs: Mapping[str, Any], execute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get the cached result of a call, or execute it and cache its result.
+        """
+        key: Optional[Hashable] = self.__key__(args, kwargs)
+        if key is None:
+            self._bypassed += 1
+            return await execute()
+
+        # serve a fresh cached result
+        found, result = self.__fresh__(key)
+        if found: return result
+
+        # share an identical execution in flight, or start one
+        execution: Optional[Execution] = self._pending.get(key)
+        if execution is not None: self._shared += 1
+        else:
+            self._misses += 1
+            execution = self._pending[key] = Execution(asyncio.ensure_future(execute()))
+            execution.task.add_done_callback(functools.partial(self.__complete__, key, execution))
+        execution.waiters += 1
+        try:
+            # the execution is detached from its callers, so a caller's cancellation never cancels it for the others
+            return await asyncio.shield(execution.task)
+        except asyncio.CancelledError:
+            # the last caller to leave cancels the execution nobody awaits any more
+            if execution.waiters == 1 and not execution.task.done():
+                # later identical calls start a new execution instead of sharing the cancelled one
+                if self._pending.get(key) is execution: del self._pending[key]
+                execution.task.cancel()
+            raise
+        finally:
+            execution.waiters -= 1
+
+
+    def lookup(self, args: Sequence[Any], kwargs: Mapping[str, Any]) -> Tuple[bool, Any]:
+        """
+        Get the fresh cached result of a call without executing it, as a (found, result) pair.
+        Only hits are counted; a call that is not found counts once it is made.
+        """
+        key: Optional[Hashable] = self.__key__(args, kwargs)
+        return self.__fresh__(key) if key is not None else (False, None)
+
+
+    def info(self) -> CacheInfo:
+        """
+        Get a snapshot of the cache's counters.
+        """
+        return CacheInfo(self._hits, self._misses, self._shared, self._bypassed, self._evictions, len(self._entries), self._memoization.maxsize)
+
+
+    def clear(self) -> None:
+        """
+        Remove every cached result. Counters are kept.
+        """
+        self._entries.clear()
+
+
+    def __key__(self, args: Sequence[Any], kwargs: Mapping[str, Any]) -> Optional[Hashable]:
+        try:
+            key: Hashable = self._memoization.key(*args, **kwargs) if self._memoization.key else (tuple(args), tuple(sorted(kwargs.items())))
+            hash(key)
+            return key
+        except TypeError:
+            return None
+
+
+    def __fresh__(self, key: Hashable) -> Tuple[bool, Any]:
+        entry: Optional[Tuple[Any, Optional[float]]] = self._entries.get(key)
+        if entry is None: return False, None
+        result, expires = entry
+        if expires is None or expires > time.monotonic():
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, result
+        del self._entries[key]
+        return False, None
+
+
+    def __complete__(self, key: Hashable, execution: 'Execution', task: asyncio.Future) -> None:
+        if self._pending.get(key) is execution: del self._pending[key]
+        if task.cancelled(): return
+        # the exception is raised to the callers; none retrieving it is not an error
+        if task.exception() is None: self.__store__(key, task.result())
+
+
+    def __store__(self, key: Hashable, result: Any) -> None:
+        expires: Optional[float] = time.monotonic() + self._memoization.ttl if self._memoization.ttl else None
+        self._entries[key] = (result, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._memoization.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+
+class Execution():
+    """
+    A call executing on behalf of every caller awaiting its result.
+    """
+
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Future) -> None:
+        self.task: asyncio.Future = task
+        # the callers awaiting the task
+        self.waiters: int = 0
+
+
+def memoize(maxsize: int = 128, ttl: Optional[float] = None, key: Optional[Callable[..., Hashable]] = None) -> Callable[[T], T]:
+    """
+    Declare a command method pure, caching its results keyed on its bound arguments.
+    """
+
+    memoization: Memoization = Memoization(maxsize, ttl, key)
+
+    def decorator(obj: T) -> T:
+        setattr(obj, ATTRIBUTE, memoization)
+        return obj
+    return decorator
+
+
+def get_memoization(method: MethodType) -> Optional[Memoization]:
+    """
+    Get the declared memoization of a method.
+    """
+
+    memoization: Any = getattr(method.__func__, ATTRIBUTE, None)
+    return memoization if isinstance(memoization, Memoization) else None
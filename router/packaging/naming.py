@@ -0,0 +1,42 @@
+import logging
+from logging import Logger
+from types import MethodType
+from typing import Any, Callable, List, Tuple, TypeVar
+
+__all__: List[str] = [
+    "alias",
+    "get_aliases",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the attribute holding the declared aliases on a method
+ATTRIBUTE: str = '__aliases__'
+
+T = TypeVar('T', bound=Callable[..., Any])
+
+
+def alias(*names: str) -> Callable[[T], T]:
+    """
+    Declare additional names a command method can be dispatched by.
+
+    Aliases never take precedence over command names; an alias claimed by several commands
+    resolves to the command registered last.
+    """
+
+    for name in names:
+        if not name or not all(character == '_' or character.isalnum() for character in name):
+            raise ValueError(f'Alias {name!r} is not a valid command name')
+
+    def decorator(obj: T) -> T:
+        setattr(obj, ATTRIBUTE, getattr(obj, ATTRIBUTE, tuple()) + names)
+        return obj
+    return decorator
+
+
+def get_aliases(method: MethodType) -> Tuple[str, ...]:
+    """
+    Get the declared aliases of a method.
+    """
+
+    return tuple(getattr(method.__func__, ATTRIBUTE, tuple()))
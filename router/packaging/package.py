@@ -1,21 +1,32 @@
+import hashlib
 import importlib.util
 import inspect
 import logging
+import sys
 from collections.abc import Mapping
 from importlib.machinery import ModuleSpec
 from logging import Logger
 from pathlib import Path
 from types import ModuleType
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
 
 from .component import Component
 
 log: Logger = logging.getLogger(__name__)
 
+# the prefix of the names package modules are registered under in sys.modules
+MODULE_PREFIX: str = '_router_package'
+
 class Package(Mapping[str, Component]):
-    
+
+    __slots__ = ('_reference', '_name', '_spec', '_module', '_components', '_failures')
+
     @property
     def name(self) -> str:
+        return self._name
+
+    @property
+    def module_name(self) -> str:
         return self._spec.name
     
     @property
@@ -30,6 +41,21 @@ class Package(Mapping[str, Component]):
     def components(self) -> Dict[str, Component]:
         return self._components
 
+    @property
+    def reference(self) -> Path:
+        return self._reference
+
+    @property
+    def failures(self) -> List[str]:
+        return self._failures
+
+    @property
+    def complete(self) -> bool:
+        """
+        Whether every component and command of the package was built.
+        """
+        return not self._failures and not any(component.failures for component in self._components.values())
+
 
     def __init__(self, reference: Path) -> None:
         """
@@ -42,16 +68,26 @@ class Package(Mapping[str, Component]):
 
         # resolve the provided reference
         self._reference: Path = reference.resolve()
-        # get the module spec located at the reference
-        self._spec: ModuleSpec = importlib.util.spec_from_file_location(reference.stem, reference)
+        self._name: str = reference.stem
+        # get the module spec located at the reference, named after its path so each file keeps one module
+        self._spec: ModuleSpec = importlib.util.spec_from_file_location(self.__module_name__(self._reference), reference)
         # create the module from the module spec
         self._module: ModuleType = importlib.util.module_from_spec(self._spec)
+        # the module registered by an earlier version of the package, restored if this version fails to import
+        previous: Optional[ModuleType] = sys.modules.get(self._spec.name)
+        # register the module so its classes and bound methods pickle by reference, e.g. for process execution
+        sys.modules[self._spec.name] = self._module
         # execute the module via the spec loader
         try: self._spec.loader.exec_module(self._module)
-        # if an error occurred during import
-        except ImportError as error: raise PackageInitializationError(self._spec.name, error)
+        except BaseException as error:
+            self.unregister(previous)
+            # if an error occurred during import
+            if isinstance(error, ImportError): raise PackageInitializationError(self._name, error)
+            raise
         # initialize the components dictionary
         self._components: Dict[str, Component] = dict()
+        # the names of classes that failed to build as components
+        self._failures: List[str] = list()
 
 
     def load(self, *args: Any, **kwargs: Any) -> None:
@@ -72,17 +108,71 @@ class Package(Mapping[str, Component]):
         # for each member
         for class_name, class_object in members:
             # instantiate component
-            component: Optional[Component] = self.__build_component__(class_object, *args, **kwargs)
+            component: Optional[Component] = self.__build_component__(class_object, args, kwargs)
             # add component to dictionary
             if component: self._components[component.name] = component
+            else: self._failures.append(class_name)
+
+
+    def restore(self, components: Mapping[str, Iterable[str]], *args: Any, **kwargs: Any) -> None:
+        """
+        Initializes and stores instances of known components and their commands, e.g. read from
+        a fresh manifest record, without scanning the module and the instances for members.
+        Falls back to load() if a known component or command is missing or fails to build.
+
+        Parameters:
+        - components:
+            the command names of each component, keyed by component name
+        """
+        classes: Dict[str, Any] = {class_name: getattr(self._module, class_name, None) for class_name in components}
+        if all(inspect.isclass(class_object) and class_object.__module__ == self._module.__name__ for class_object in classes.values()):
+            for class_name, command_names in components.items():
+                component: Optional[Component] = self.__build_component__(classes[class_name], args, kwargs, command_names)
+                if component is None or component.failures or set(component) != set(command_names): break
+                self._components[component.name] = component
+            else: return
+        log.debug('Package %s no longer matches its known components; introspecting it', self._name)
+        self._components.clear()
+        self.load(*args, **kwargs)
+
+
+    def dependencies(self) -> List[Path]:
+        """
+        Get the source files of the components' base classes that are defined outside the package file.
+        """
+        files: Set[Path] = set()
+        for component in self._components.values():
+            for base in type(component.instance).__mro__[1:]:
+                source: Optional[str] = getattr(sys.modules.get(base.__module__), '__file__', None)
+                if source and base.__module__ != self._module.__name__: files.add(Path(source).resolve())
+        return sorted(files)
+
+
+    def unregister(self, previous: Optional[ModuleType] = None) -> None:
+        """
+        Remove the package module from sys.modules, unless a newer version of the package replaced it.
+
+        Parameters:
+        - previous:
+            the module of the version this one replaced, registered again so its classes keep pickling
+        """
+        if sys.modules.get(self._spec.name) is not self._module: return
+        if previous is None: del sys.modules[self._spec.name]
+        else: sys.modules[self._spec.name] = previous
+
+
+    @staticmethod
+    def __module_name__(reference: Path) -> str:
+        digest: str = hashlib.sha1(str(reference).encode()).hexdigest()[:12]
+        return f'{MODULE_PREFIX}_{digest}_{reference.stem}'
 
 
-    def __build_component__(self, cls: Type, *args: Any, **kwargs: Any) -> Optional[Component]:
+    def __build_component__(self, cls: Type, args: Tuple[Any, ...], kwargs: Dict[str, Any], names: Optional[Iterable[str]] = None) -> Optional[Component]:
         try:
             # instantiate component
             component: Component = Component(cls, *args, **kwargs)
             # load the component
-            component.load()
+            component.load(names)
             # return the component
             return component
         except Exception as error:
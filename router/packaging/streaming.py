@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import math
+import time
+from concurrent.futures import Executor
+from logging import Logger
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, List, Optional, Union
+
+__all__: List[str] = [
+    "Stream",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# returned by next() once a generator is exhausted
+DONE: object = object()
+# returned in place of an item once a stream's deadline passes
+EXPIRED: object = object()
+
+class Stream():
+    """
+    The output of a generator or async generator command, consumed as an async iterator.
+
+    Items are produced on demand: the command only advances when the consumer awaits the next item,
+    so a slow consumer holds the command back instead of items piling up in memory.
+    Synchronous generators advance in the provided executor, if any, instead of on the event loop.
+
+    A stream that is not consumed to the end should be closed with aclose(), or used with async with,
+    so the command's cleanup runs and any limiter slots it holds are released.
+
+    A bounded stream ends with a timeout error once its deadline passes, including while an item is being produced.
+    Like commands, only generators that yield to the event loop can be interrupted mid-item: async generators,
+    and generators advancing in an executor, whose threads finish the item in the background.
+    """
+
+    __slots__ = ('_source', '_executor', '_wrap', '_asynchronous', '_closed', '_finalizer', '_translate', '_deadline', '_expire')
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+    def __init__(self, source: Union[Generator, AsyncGenerator], executor: Optional[Executor] = None, wrap: Optional[Callable[[Exception], Exception]] = None) -> None:
+        """
+        Stream the items of a generator.
+
+        Parameters:
+        - wrap:
+            converts exceptions raised by the generator, e.g. to the command's error type
+        """
+        self._source: Union[Generator, AsyncGenerator] = source
+        self._executor: Optional[Executor] = executor
+        self._wrap: Optional[Callable[[Exception], Exception]] = wrap
+        self._asynchronous: bool = isinstance(source, AsyncGenerator)
+        self._closed: bool = False
+        # called once when the stream ends, e.g. to release limiter slots
+        self._finalizer: Optional[Callable[[], None]] = None
+        # converts the command's exceptions to the caller's exception type
+        self._translate: Optional[Callable[[Exception], Exception]] = None
+        # the time.monotonic() time by which the stream must end, and the error raised once it passes
+        self._deadline: float = math.inf
+        self._expire: Optional[Callable[[Exception], Exception]] = None
+
+
+    def __attach__(self, finalizer: Optional[Callable[[], None]] = None, translate: Optional[Callable[[Exception], Exception]] = None) -> 'Stream':
+        """
+        Set the callback run once the stream ends, and the conversion of the command's exceptions.
+        """
+        self._finalizer = finalizer
+        self._translate = translate
+        return self
+
+
+    def __bound__(self, deadline: float, expire: Callable[[Exception], Exception]) -> 'Stream':
+        """
+        Bound the stream by a time.monotonic() deadline, raising the error made by expire once it passes.
+        The earliest of several deadlines applies.
+        """
+        if deadline < self._deadline:
+            self._deadline = deadline
+            self._expire = expire
+        return self
+
+
+    def __aiter__(self) -> 'Stream':
+        return self
+
+
+    async def __anext__(self) -> Any:
+        """
+        Get the command's next item.
+
+        Raises:
+        - Exception
+            upon an exception raised by the command, converted by the stream's wrap and attached conversion,
+            or upon the stream running past its deadline
+        """
+        if self._closed: raise StopAsyncIteration
+        try:
+            if self._asynchronous: item: Any = await self.__wait__(self._source.__anext__())
+            elif self._executor: item: Any = await self.__wait__(asyncio.get_running_loop().run_in_executor(self._executor, next, self._source, DONE))
+            else:
+                # a generator advancing on the event loop cannot be interrupted, but does not start past the deadline
+                item: Any = next(self._source, DONE) if self._deadline > time.monotonic() else EXPIRED
+        except StopAsyncIteration:
+            self.__finish__()
+            raise
+        except Exception as error:
+            self.__finish__()
+            wrapped: Exception = self._wrap(error) if self._wrap else error
+            raise self._translate(wrapped) if self._translate else wrapped
+        except BaseException:
+            # the consumer was cancelled; the command cannot resume consistently
+            self.__finish__()
+            raise
+        if item is DONE:
+            self.__finish__()
+            raise StopAsyncIteration
+        if item is EXPIRED:
+            # the items the command would still produce are abandoned
+            await self.aclose()
+            error: Exception = asyncio.TimeoutError()
+            expired: Exception = self._expire(error) if self._expire else error
+            raise self._translate(expired) if self._translate else expired
+        return item
+
+
+    async def __wait__(self, step: Awaitable[Any]) -> Any:
+        """
+        Await a step of the command, cancelling it once the stream's deadline passes.
+        Returns EXPIRED upon cancelling it, so a TimeoutError raised by the command itself stays the command's error.
+        """
+        if self._deadline == math.inf: return await step
+        future: asyncio.Future = asyncio.ensure_future(step)
+        try:
+            return await asyncio.wait_for(future, max(self._deadline - time.monotonic(), 0.0))
+        except asyncio.TimeoutError:
+            if future.cancelled(): return EXPIRED
+            raise
+
+
+    async def aclose(self) -> None:
+        """
+        Stop the command, running its cleanup.
+        """
+        try:
+            if self._asynchronous: await self._source.aclose()
+            else: self._source.close()
+        # the generator is still advancing for a consumer that was cancelled
+        except (RuntimeError, ValueError) as error:
+            log.warning('Could not close stream: %s', error)
+        finally:
+            self.__finish__()
+
+
+    async def __aenter__(self) -> 'Stream':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+    def __finish__(self) -> None:
+        self._closed = True
+        finalizer: Optional[Callable[[], None]] = self._finalizer
+        self._finalizer = None
+        if finalizer is None: return
+        try:
+            finalizer()
+        except Exception as error:
+            log.warning('Stream finalizer %s failed: %s', finalizer, error)
+
+
+    def __del__(self) -> None:
+        # release what an abandoned stream holds; the generator itself is closed by garbage collection
+        self.__finish__()
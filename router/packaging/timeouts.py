@@ -0,0 +1,50 @@
+import logging
+from logging import Logger
+from types import MethodType
+from typing import Any, Callable, List, Optional, TypeVar
+
+__all__: List[str] = [
+    "timeout",
+    "get_timeout",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the attribute holding a declared timeout on a method or a component class
+ATTRIBUTE: str = '__timeout__'
+
+T = TypeVar('T', bound=Callable[..., Any])
+
+def timeout(seconds: float) -> Callable[[T], T]:
+    """
+    Declare the seconds a command method, or every command in a component class, may run before it is cancelled.
+
+    The timeout can also be declared on a component via the __timeout__ class attribute.
+    Only commands that yield to the event loop can be interrupted: coroutines, and synchronous
+    commands run in an executor, whose threads or processes finish in the background.
+    Generator commands are bounded as a whole: their items must be produced before the timeout passes.
+
+    Raises:
+    - ValueError
+        upon a non-positive timeout
+    """
+
+    if seconds <= 0: raise ValueError('timeout must be positive')
+
+    def decorator(obj: T) -> T:
+        setattr(obj, ATTRIBUTE, float(seconds))
+        return obj
+    return decorator
+
+
+def get_timeout(method: MethodType) -> Optional[float]:
+    """
+    Get the declared timeout of a method, in seconds.
+    A timeout declared on the method takes precedence over one declared on its component class.
+    """
+
+    declared: Any = getattr(method.__func__, ATTRIBUTE, None)
+    # classmethods are bound to the class itself
+    owner: type = method.__self__ if isinstance(method.__self__, type) else type(method.__self__)
+    if declared is None: declared = getattr(owner, ATTRIBUTE, None)
+    return float(declared) if isinstance(declared, (int, float)) and not isinstance(declared, bool) and declared > 0 else None
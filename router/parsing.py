@@ -0,0 +1,187 @@
+import functools
+import logging
+import re
+from logging import Logger
+from typing import Dict, List, Match, Optional, Pattern, Tuple
+
+__all__: List[str] = [
+    "Parser",
+    "RegexParser",
+    "TokenParser",
+    "compile_parser",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# the character that terminates a parameter value when preceded by whitespace
+TERMINATOR: str = '-'
+# matches whitespace followed by the terminator, which ends a parameter value
+TERMINATOR_PATTERN: Pattern = re.compile(rf'\s{re.escape(TERMINATOR)}')
+# matches up to the last word character, backtracking only over the non-word characters after it
+LAST_WORD_PATTERN: Pattern = re.compile(r'.*\w', re.DOTALL)
+# the character separating the parts of a namespaced command name, e.g. package.Component.command
+SEPARATOR: str = '.'
+
+
+def _is_word(character: str) -> bool:
+    """
+    Determines if a character is a word character, matching the semantics of the regex \\w class.
+    """
+    return character == '_' or character.isalnum()
+
+
+class Parser():
+    """
+    Base class for message parsers.
+
+    A parser extracts the command name and the parameter key-value pairs from a message.
+    """
+
+    @property
+    def parameter_prefix(self) -> str:
+        return self._parameter_prefix
+
+
+    def __init__(self, parameter_prefix: str = '-') -> None:
+        # set the parameter prefix
+        self._parameter_prefix: str = parameter_prefix
+        # command names may be namespaced unless the separator begins a parameter
+        self._namespaced: bool = not parameter_prefix.startswith(SEPARATOR)
+
+
+    def parse(self, message: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Parses the message for its command name and parameter key-value pairs.
+        """
+        return self.get_name(message), self.get_kwargs(message)
+
+
+    def get_name(self, message: str) -> Optional[str]:
+        """
+        Searches the message for the command name.
+        """
+        raise NotImplementedError()
+
+
+    def get_kwargs(self, message: str) -> Dict[str, str]:
+        """
+        Searches the message for parameter key-value pairs.
+        """
+        raise NotImplementedError()
+
+
+class RegexParser(Parser):
+    """
+    Parses messages via a command pattern and a parameter pattern.
+
+    Each message is scanned once per pattern; the parameter pattern backtracks on long parameter values.
+    """
+
+    def __init__(self, parameter_prefix: str = '-') -> None:
+        super().__init__(parameter_prefix)
+        # compile the command pattern
+        self._command_pattern: Pattern = re.compile(rf'^[\w]+(?:{re.escape(SEPARATOR)}[\w]+)*' if self._namespaced else r'^[\w]+')
+        # compile the parameter pattern
+        self._parameter_pattern: Pattern = re.compile(rf'{re.escape(self._parameter_prefix)}([\w]+)[\s]+((?:(?!\s\-)[\s\S])+\b)')
+
+
+    def get_name(self, message: str) -> Optional[str]:
+        # find command name matches in the message
+        command_match: Optional[Match] = re.match(self._command_pattern, message)
+        # get the command name from the match
+        return command_match.group(0) if command_match else None
+
+
+    def get_kwargs(self, message: str) -> Dict[str, str]:
+        # find all parameter name-value pairs in the message
+        parameters: List[Tuple[str, str]] = re.findall(self._parameter_pattern, message)
+        # convert parameter name-value pairs into kwargs dictionary
+        return {parameter_name: parameter_value for parameter_name, parameter_value in parameters}
+
+
+class TokenParser(Parser):
+    """
+    Parses messages in a single linear pass.
+
+    Produces the same results as the RegexParser:
+    - the command name is the leading run of word characters, including any namespace separators between them
+    - a parameter is the prefix, a run of word characters, whitespace, then a value
+    - a value ends before the first whitespace followed by a '-', trimmed back to its last word boundary
+
+    Each step of the pass is a native search with a compiled pattern that never backtracks into a value,
+    so a parameter costs a few calls however long its value or however many dashes it contains.
+    """
+
+    def __init__(self, parameter_prefix: str = '-') -> None:
+        super().__init__(parameter_prefix)
+        # a prefix that does not begin with a word character cannot occur within the command name
+        self._skip_name: bool = bool(parameter_prefix) and not _is_word(parameter_prefix[0])
+        # compile the command name pattern
+        self._name_pattern: Pattern = re.compile(rf'[\w]+(?:{re.escape(SEPARATOR)}[\w]+)*' if self._namespaced else r'[\w]+')
+        # compile the pattern of a parameter name and the whitespace before its value; an empty prefix cannot delimit parameters
+        self._key_pattern: Optional[Pattern] = re.compile(rf'{re.escape(parameter_prefix)}([\w]+)[\s]+') if parameter_prefix else None
+
+
+    def parse(self, message: str) -> Tuple[Optional[str], Dict[str, str]]:
+        # get the end position of the command name
+        end: int = self.__scan_name__(message)
+        # get the command name from the message
+        command_name: Optional[str] = message[:end] if end else None
+        # continue scanning for parameters after the command name
+        kwargs: Dict[str, str] = self.__scan_kwargs__(message, end if self._skip_name else 0)
+        return command_name, kwargs
+
+
+    def get_name(self, message: str) -> Optional[str]:
+        end: int = self.__scan_name__(message)
+        return message[:end] if end else None
+
+
+    def get_kwargs(self, message: str) -> Dict[str, str]:
+        return self.__scan_kwargs__(message, 0)
+
+
+    def __scan_name__(self, message: str) -> int:
+        """
+        Gets the end position of the leading run of word characters, including namespace separators.
+        """
+        match: Optional[Match] = self._name_pattern.match(message)
+        return match.end() if match else 0
+
+
+    def __scan_kwargs__(self, message: str, position: int) -> Dict[str, str]:
+        """
+        Scans the message for parameter key-value pairs, starting at the provided position.
+        """
+
+        kwargs: Dict[str, str] = dict()
+        if self._key_pattern is None: return kwargs
+
+        # find the first parameter name followed by whitespace
+        key: Optional[Match] = self._key_pattern.search(message, position)
+        while key:
+            value_start: int = key.end()
+            # find the first whitespace followed by the terminator
+            terminator: Optional[Match] = TERMINATOR_PATTERN.search(message, value_start)
+            # trim the value back to its last word character, which a word boundary follows
+            value: Optional[Match] = LAST_WORD_PATTERN.match(message, value_start, terminator.start() if terminator else len(message))
+            # if the value has no word boundary, try the next prefix occurrence
+            if value is None:
+                key = self._key_pattern.search(message, key.start() + 1)
+                continue
+
+            # later parameters overwrite earlier parameters of the same name
+            kwargs[key.group(1)] = message[value_start:value.end()]
+            # resume after the value
+            key = self._key_pattern.search(message, value.end())
+
+        return kwargs
+
+
+@functools.lru_cache(maxsize=None)
+def compile_parser(parameter_prefix: str = '-') -> TokenParser:
+    """
+    Gets a precompiled single-pass parser for the provided parameter prefix.
+    Parsers are stateless, so a single instance is shared per prefix.
+    """
+    return TokenParser(parameter_prefix)
@@ -0,0 +1,410 @@
+import asyncio
+import atexit
+import itertools
+import logging
+import multiprocessing
+import pickle
+import threading
+import zlib
+from enum import Enum
+from logging import Logger
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .handler import Handler, HandlerError
+
+__all__: List[str] = [
+    "Routing",
+    "Supervisor",
+    "SupervisorError",
+    "WorkerCrashError",
+    "RemoteError",
+]
+
+log: Logger = logging.getLogger(__name__)
+
+# a request sent to a worker: (identifier, message, command name, args, kwargs); None stops the worker
+Request = Tuple[int, Optional[str], Optional[str], List[Any], Dict[str, str]]
+# a response sent by a worker: (identifier, succeeded, result or exception)
+Response = Tuple[int, bool, Any]
+
+class Routing(Enum):
+    """
+    How a supervisor picks the worker for a call.
+
+    - COMMAND shards by command name, so each command always runs in the same worker
+    - KEY shards by a key supplied with each call, e.g. a user or channel id
+    - LEAST_LOADED picks the worker with the fewest calls in flight
+
+    A key supplied with a call is used for sharding under any routing.
+    """
+
+    COMMAND = 'command'
+    KEY = 'key'
+    LEAST_LOADED = 'least_loaded'
+
+
+class Worker():
+    """
+    A forked worker process and the calls awaiting its responses.
+    """
+
+    __slots__ = ('_index', '_process', '_connection', '_pending', '_lock', '_restarts')
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def process(self) -> BaseProcess:
+        return self._process
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+
+    def __init__(self, index: int, process: BaseProcess, connection: Connection, restarts: int = 0) -> None:
+        self._index: int = index
+        self._process: BaseProcess = process
+        self._connection: Connection = connection
+        # the calls sent to the worker, keyed by request identifier
+        self._pending: Dict[int, asyncio.Future] = dict()
+        # serializes writes to the connection, which may come from several event loops
+        self._lock: threading.Lock = threading.Lock()
+        self._restarts: int = restarts
+
+
+class Supervisor():
+    """
+    Runs a loaded handler's commands in forked worker processes.
+
+    Packages are loaded once in the supervising process; each worker is forked from it and shares
+    the loaded state copy-on-write, running calls on its own event loop. Arguments, results and
+    exceptions are pickled between processes, so changes commands make to their arguments, and
+    state such as metrics hooks, limits and result caches, stay within each worker. Streams returned
+    by generator commands cannot leave their worker and raise RemoteError.
+
+    Crashed workers are restarted, and calls in flight on a crashed worker raise WorkerCrashError.
+    Workers require the fork start method, which is unavailable on Windows.
+    """
+
+    @property
+    def handler(self) -> Handler:
+        return self._handler
+
+    @property
+    def routing(self) -> Routing:
+        return self._routing
+
+    @property
+    def workers(self) -> Tuple[Worker, ...]:
+        return tuple(self._workers)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+
+    def __init__(self, handler: Handler, workers: Optional[int] = None, *, routing: Union[Routing, str] = Routing.COMMAND, restart: bool = True) -> None:
+        """
+        Supervise a handler whose packages were loaded.
+
+        Parameters:
+        - workers:
+            the number of worker processes, by default the number of CPUs
+        - restart:
+            whether to restart crashed workers
+        """
+        self._handler: Handler = handler
+        self._size: int = workers if workers else multiprocessing.cpu_count()
+        if self._size < 1: raise ValueError('workers must be at least 1')
+        self._routing: Routing = Routing(routing)
+        self._restart: bool = restart
+        self._workers: List[Optional[Worker]] = list()
+        self._identifiers: Iterator[int] = itertools.count()
+        # serializes starting, stopping and restarting workers
+        self._lock: threading.Lock = threading.Lock()
+        self._running: bool = False
+
+
+    def start(self) -> None:
+        """
+        Fork the worker processes.
+
+        Raises:
+        - SupervisorError
+            upon a platform without the fork start method
+        """
+        if 'fork' not in multiprocessing.get_all_start_methods(): raise SupervisorError('Workers require the fork start method')
+        with self._lock:
+            if self._running: return
+            self._running = True
+            self._workers = list()
+            for index in range(self._size): self._workers.append(self.__spawn__(index))
+        # stop the workers at exit if the caller did not, since they are not daemonic
+        atexit.register(self.stop)
+        log.info('Started %d workers', self._size)
+
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the worker processes after they finish their calls in flight.
+        Workers still running after the timeout are terminated.
+        """
+        with self._lock:
+            if not self._running: return
+            self._running = False
+            workers: List[Worker] = [worker for worker in self._workers if worker]
+        atexit.unregister(self.stop)
+        for worker in workers:
+            try:
+                with worker._lock: worker._connection.send(None)
+            except OSError: pass
+        for worker in workers:
+            worker._process.join(timeout)
+            if worker._process.is_alive():
+                log.warning('Terminating worker %d', worker.index)
+                worker._process.terminate()
+                worker._process.join()
+            worker._connection.close()
+            self.__fail__(worker, SupervisorError('The supervisor was stopped'))
+        log.info('Stopped %d workers', len(workers))
+
+
+    def __enter__(self) -> 'Supervisor':
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+
+    async def process(self, message: str, *, args: List[Any] = list(), key: Optional[Any] = None) -> Any:
+        """
+        Process a message in a worker, returning the command's result.
+
+        Raises:
+        - SupervisorError
+            upon a stopped supervisor, or a KEY routed call without a key
+        - WorkerCrashError
+            upon the worker exiting before responding
+        - HandlerError
+            upon the errors Handler.process raises in the worker
+        """
+        name: Optional[str] = self._handler.__get_name__(message) if key is None and self._routing is Routing.COMMAND else None
+        return await self.__send__(self.__route__(name, key), (next(self._identifiers), message, None, args, dict()))
+
+
+    async def run(self, command_name: str, args: List[Any], kwargs: Dict[str, str], *, key: Optional[Any] = None) -> Any:
+        """
+        Run a command in a worker, returning its result.
+
+        Raises:
+        - SupervisorError
+            upon a stopped supervisor, or a KEY routed call without a key
+        - WorkerCrashError
+            upon the worker exiting before responding
+        - HandlerError
+            upon the errors Handler.run raises in the worker
+        """
+        return await self.__send__(self.__route__(command_name, key), (next(self._identifiers), None, command_name, args, kwargs))
+
+
+    def __route__(self, command_name: Optional[str], key: Optional[Any]) -> Worker:
+        if not self._running: raise SupervisorError('The supervisor is not running')
+        if key is None and self._routing is Routing.KEY: raise SupervisorError('Calls routed by key require a key')
+        workers: List[Optional[Worker]] = self._workers
+        if key is None and self._routing is Routing.LEAST_LOADED:
+            worker: Optional[Worker] = min((worker for worker in workers if worker), key=lambda worker: worker.pending, default=None)
+        else:
+            if key is None:
+                # shard aliases and namespaced names with the command they name
+                entry: Any = self._handler.index.resolve(command_name, False) if command_name else None
+                key = entry.qualified_name if entry else command_name
+            worker = workers[zlib.crc32(str(key).encode()) % len(workers)]
+        if worker is None: raise WorkerCrashError(-1, None)
+        return worker
+
+
+    async def __send__(self, worker: Worker, request: Request) -> Any:
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        worker._pending[request[0]] = future
+        try:
+            with worker._lock: worker._connection.send(request)
+        except (OSError, ValueError) as error:
+            worker._pending.pop(request[0], None)
+            raise WorkerCrashError(worker.index, worker._process.exitcode, error)
+        except Exception:
+            # the request could not be pickled
+            worker._pending.pop(request[0], None)
+            raise
+        return await future
+
+
+    def __spawn__(self, index: int, restarts: int = 0) -> Worker:
+        """
+        Fork a worker process and start the thread reading its responses.
+        """
+        context: BaseContext = multiprocessing.get_context('fork')
+        parent, child = context.Pipe()
+        # the connections to the other workers are inherited by the fork, and closed in the worker
+        inherited: List[Connection] = [parent] + [worker._connection for worker in self._workers if worker]
+        # workers are not daemonic, so commands can use the process execution policy
+        process: BaseProcess = context.Process(target=_serve, args=(self._handler, child, inherited), name=f'router-worker-{index}')
+        process.start()
+        # the child's end is only used by the worker
+        child.close()
+        worker: Worker = Worker(index, process, parent, restarts)
+        threading.Thread(target=self.__receive__, args=(worker,), name=f'router-supervisor-{index}', daemon=True).start()
+        log.debug('Started worker %d with pid %d', index, process.pid)
+        return worker
+
+
+    def __receive__(self, worker: Worker) -> None:
+        """
+        Resolve the calls sent to a worker with its responses, until the worker exits.
+        """
+        while True:
+            try:
+                data: bytes = worker._connection.recv_bytes()
+            except (EOFError, OSError):
+                break
+            try:
+                identifier, succeeded, value = pickle.loads(data)
+            except Exception as error:
+                log.error('Discarding an unreadable response from worker %d: %s', worker.index, error)
+                continue
+            future: Optional[asyncio.Future] = worker._pending.pop(identifier, None)
+            if future is not None: self.__settle__(future, succeeded, value)
+        # the worker exited; reap it so its exit code is available
+        worker._process.join()
+        with self._lock:
+            if not self._running or self._workers[worker.index] is not worker: return
+            log.warning('Worker %d exited with code %s', worker.index, worker._process.exitcode)
+            self._workers[worker.index] = self.__spawn__(worker.index, worker.restarts + 1) if self._restart else None
+        worker._connection.close()
+        self.__fail__(worker, WorkerCrashError(worker.index, worker._process.exitcode))
+
+
+    def __fail__(self, worker: Worker, error: Exception) -> None:
+        """
+        Fail the calls still awaiting responses from a worker.
+        """
+        while True:
+            # the reading thread and stop() may fail the same worker
+            try: _, future = worker._pending.popitem()
+            except KeyError: return
+            self.__settle__(future, False, error)
+
+
+    @staticmethod
+    def __settle__(future: asyncio.Future, succeeded: bool, value: Any) -> None:
+        """
+        Resolve a call's future on its own event loop.
+        """
+        def settle() -> None:
+            if future.done(): return
+            if succeeded: future.set_result(value)
+            else: future.set_exception(value)
+        try: future.get_loop().call_soon_threadsafe(settle)
+        # the caller's event loop was closed
+        except RuntimeError: pass
+
+
+def _serve(handler: Handler, connection: Connection, inherited: List[Connection]) -> None:
+    """
+    The entry point of a worker process.
+    """
+    # the supervisor's ends of the pipes are only used by the supervisor
+    for connection_end in inherited: connection_end.close()
+    handler.__after_fork__()
+    try: asyncio.run(_listen(handler, connection))
+    finally: handler.shutdown()
+
+
+async def _listen(handler: Handler, connection: Connection) -> None:
+    """
+    Run requests as they arrive, until asked to stop or the supervisor exits.
+    Calls in flight are finished before returning.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    stopped: asyncio.Future = loop.create_future()
+    tasks: Set[asyncio.Task] = set()
+
+    def receive() -> None:
+        try:
+            while not stopped.done() and connection.poll():
+                request: Optional[Request] = connection.recv()
+                if request is None:
+                    stopped.set_result(None)
+                    return
+                task: asyncio.Task = loop.create_task(_respond(handler, connection, request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (EOFError, OSError):
+            if not stopped.done(): stopped.set_result(None)
+
+    loop.add_reader(connection.fileno(), receive)
+    try: await stopped
+    finally: loop.remove_reader(connection.fileno())
+    if tasks: await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _respond(handler: Handler, connection: Connection, request: Request) -> None:
+    """
+    Run a request and send its result or exception to the supervisor.
+    """
+    identifier, message, command_name, args, kwargs = request
+    try:
+        if message is not None: response: Response = (identifier, True, await handler.process(message, args=args))
+        else: response = (identifier, True, await handler.run(command_name, args, kwargs))
+    except Exception as error:
+        response = (identifier, False, _portable(error))
+    try:
+        connection.send(response)
+    except OSError:
+        # the supervisor exited
+        pass
+    except Exception as error:
+        # the result could not be pickled
+        connection.send((identifier, False, RemoteError(f'Could not return the result of {command_name or message!r}: {error}')))
+
+
+def _portable(error: Exception) -> Exception:
+    """
+    Get an exception that survives pickling, replacing it with a RemoteError if it does not.
+    """
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RemoteError(f'{type(error).__name__}: {error}')
+
+
+class SupervisorError(HandlerError):
+    """Raised when a supervisor cannot run a call."""
+
+    def __init__(self, message: str, exception: Optional[Exception] = None):
+        super().__init__(message, exception)
+
+
+class WorkerCrashError(SupervisorError):
+    """Raised when a worker exits before responding to a call."""
+
+    def __init__(self, index: int, exitcode: Optional[int], exception: Optional[Exception] = None):
+        message: str = f'Worker {index} exited with code {exitcode} before responding' if index >= 0 else 'No worker is available'
+        super().__init__(message, exception)
+
+
+class RemoteError(SupervisorError):
+    """Raised in place of an exception or result that could not be returned from a worker."""
+
+    def __init__(self, message: str, exception: Optional[Exception] = None):
+        super().__init__(message, exception)
@@ -0,0 +1,44 @@
+import inspect
+import pytest
+from router.packaging import Binder
+
+def positional(a, b, /, c=3): pass
+def keywords(a, *, b, c=3): pass
+def variadic(a, *args, b=2, **kwargs): pass
+def mixed(a, /, b, *args, c, **kwargs): pass
+
+CALLS = [
+    ((), {}),
+    ((1,), {}),
+    ((1, 2), {}),
+    ((1, 2, 3), {}),
+    ((1, 2, 3, 4), {}),
+    ((1,), {'b': 2}),
+    ((1,), {'b': 2, 'c': 3}),
+    ((1, 2), {'c': 3}),
+    ((1, 2), {'b': 2}),
+    ((), {'a': 1, 'b': 2}),
+    ((1,), {'a': 1}),
+    ((1,), {'d': 4}),
+    ((1, 2), {'a': 1, 'c': 3}),
+]
+
+class TestBinder:
+
+    @pytest.mark.parametrize('function', [positional, keywords, variadic, mixed])
+    @pytest.mark.parametrize('args, kwargs', CALLS)
+    def test_binder_matches_signature_bind(self, function, args, kwargs):
+        """
+        Check that the binder accepts and rejects the same arguments as Signature.bind
+        """
+        signature: inspect.Signature = inspect.signature(function)
+        binder: Binder = Binder(signature)
+        try:
+            signature.bind(*args, **kwargs)
+        except TypeError:
+            with pytest.raises(TypeError):
+                binder.bind(args, kwargs)
+        else:
+            call_args, call_kwargs = binder.bind(args, kwargs)
+            # the validated arguments must be callable
+            function(*call_args, **call_kwargs)
@@ -0,0 +1,327 @@
+import asyncio
+import enum
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import pytest
+from router.packaging import CacheInfo, Command, CommandError, CommandTimeoutError, ExecutionPolicy, Stream, ParameterConversionError, SignatureMismatchException, execution_policy, memoize, timeout
+
+class Sample:
+
+    def echo(self, value):
+        return value
+
+    async def aecho(self, value):
+        return value
+
+    def other(self, first, second):
+        return first
+
+class Memoized:
+
+    def __init__(self):
+        self.executions: int = 0
+
+    @memoize(maxsize=2)
+    async def lookup(self, value):
+        self.executions += 1
+        await asyncio.sleep(0.01)
+        return value.upper()
+
+    @memoize()
+    async def slow(self, value):
+        self.executions += 1
+        await asyncio.sleep(0.1)
+        return value.upper()
+
+    @memoize(ttl=60, key=lambda context, value: value)
+    def keyed(self, context, value):
+        self.executions += 1
+        return value
+
+@execution_policy(ExecutionPolicy.THREAD)
+class Threaded:
+
+    def inherited(self): pass
+
+    @execution_policy('process')
+    def declared(self): pass
+
+    @execution_policy('thread')
+    async def coroutine(self): pass
+
+class Streamed:
+
+    def __init__(self):
+        self.produced: list = list()
+        self.closed: bool = False
+
+    def lines(self, count: int):
+        for index in range(count):
+            self.produced.append(index)
+            yield index
+
+    @execution_policy('process')
+    async def alines(self, count: int):
+        try:
+            for index in range(count):
+                self.produced.append(index)
+                yield index
+                if index == 2: raise ValueError('failed')
+        finally:
+            self.closed = True
+
+@timeout(0.05)
+class Slow:
+
+    def __init__(self):
+        self.cancelled: bool = False
+
+    async def hang(self):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    async def drip(self):
+        try:
+            yield 'first'
+            await asyncio.sleep(10)
+            yield 'second'
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    @timeout(1)
+    async def quick(self):
+        await asyncio.sleep(0.1)
+        return 'done'
+
+class TestCommand:
+
+    def test_command_caches_coroutine_detection(self):
+        """
+        Check that the invocation strategy is determined at construction
+        """
+        assert Command(Sample().echo).coroutine is False
+        assert Command(Sample().aecho).coroutine is True
+
+    def test_command_run_own_signature(self):
+        """
+        Check that arguments bound from the command signature are accepted
+        """
+        command: Command = Command(Sample().aecho)
+        assert asyncio.run(command.run(command.signature.bind('value'))) == 'value'
+
+    def test_command_run_matching_signature(self):
+        """
+        Check that externally bound arguments with matching parameters are accepted
+        """
+        command: Command = Command(Sample().echo)
+        arguments: inspect.BoundArguments = inspect.signature(Sample().echo).bind('value')
+        asyncio.run(command.run(arguments))
+
+    def test_command_run_mismatched_signature(self):
+        """
+        Check that externally bound arguments with mismatched parameters are rejected
+        """
+        command: Command = Command(Sample().echo)
+        arguments: inspect.BoundArguments = inspect.signature(Sample().other).bind('first', 'second')
+        with pytest.raises(SignatureMismatchException):
+            asyncio.run(command.run(arguments))
+
+    def test_command_convert(self):
+        """
+        Check that string values are converted according to parameter annotations
+        """
+        class Mode(enum.Enum):
+            FAST = 'fast'
+            SLOW = 'slow'
+
+        class Annotated:
+            def run(self, count: int, ratio: float, enabled: bool, mode: Mode, limit: Optional[int] = None, name: str = ''): pass
+
+        command: Command = Command(Annotated().run)
+        kwargs = command.convert({'count': '3', 'ratio': '0.5', 'enabled': 'yes', 'mode': 'SLOW', 'limit': '7', 'name': 'value'})
+        assert kwargs == {'count': 3, 'ratio': 0.5, 'enabled': True, 'mode': Mode.SLOW, 'limit': 7, 'name': 'value'}
+
+    def test_command_convert_error(self):
+        """
+        Check that unconvertible values raise a conversion error
+        """
+        class Annotated:
+            def run(self, count: int): pass
+
+        command: Command = Command(Annotated().run)
+        with pytest.raises(ParameterConversionError):
+            command.convert({'count': 'three'})
+
+    def test_command_execution_policy(self):
+        """
+        Check that execution policies are resolved from methods, then components
+        """
+        assert Command(Sample().echo).policy is ExecutionPolicy.INLINE
+        assert Command(Threaded().inherited).policy is ExecutionPolicy.THREAD
+        assert Command(Threaded().declared).policy is ExecutionPolicy.PROCESS
+        # coroutines always run on the event loop
+        assert Command(Threaded().coroutine).policy is ExecutionPolicy.INLINE
+
+    def test_command_run_in_executor(self):
+        """
+        Check that synchronous commands run in the provided executor
+        """
+        class Recorder:
+            def record(self, calls):
+                calls.append(threading.current_thread().name)
+
+        calls: list = list()
+        command: Command = Command(Recorder().record)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='worker') as executor:
+            asyncio.run(command.run(command.signature.bind(calls), executor))
+        assert calls[0].startswith('worker')
+
+    def test_command_memoize(self):
+        """
+        Check that memoized results are cached, evicted and shared by concurrent identical calls
+        """
+        component: Memoized = Memoized()
+        command: Command = Command(component.lookup)
+
+        async def run(*values: str) -> list:
+            return await asyncio.gather(*(command.run(command.signature.bind(value)) for value in values))
+
+        assert asyncio.run(run('a', 'a', 'a')) == ['A', 'A', 'A']
+        assert component.executions == 1
+        assert asyncio.run(run('a', 'b', 'c', 'a')) == ['A', 'B', 'C', 'A']
+        # 'a' is served from the cache, then evicted once 'b' and 'c' complete
+        assert component.executions == 3
+        assert command.cache.info() == CacheInfo(hits=2, misses=3, shared=2, bypassed=0, evictions=1, size=2, maxsize=2)
+
+    def test_command_memoize_cancellation(self):
+        """
+        Check that a caller timing out leaves a shared execution running for the others, and the last one leaving cancels it
+        """
+        component: Memoized = Memoized()
+        command: Command = Command(component.slow)
+
+        async def run() -> list:
+            owner: asyncio.Task = asyncio.ensure_future(asyncio.wait_for(command.run(command.signature.bind('x')), 0.05))
+            await asyncio.sleep(0.01)
+            return await asyncio.gather(owner, command.run(command.signature.bind('x')), return_exceptions=True)
+
+        owner, shared = asyncio.run(run())
+        assert isinstance(owner, asyncio.TimeoutError)
+        assert shared == 'X'
+        assert component.executions == 1
+        assert command.cache.info().size == 1
+
+        async def abandon() -> None:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(command.run(command.signature.bind('y')), 0.01)
+            # nobody awaits the execution, so it is cancelled instead of cached
+            await asyncio.sleep(0.15)
+
+        asyncio.run(abandon())
+        assert component.executions == 2
+        assert command.cache.info().size == 1
+
+    def test_command_memoize_key(self):
+        """
+        Check that a key function excludes unhashable context arguments from the key
+        """
+        component: Memoized = Memoized()
+        command: Command = Command(component.keyed)
+        for context in ([1], [2]): asyncio.run(command.run(command.signature.bind(context, 'value')))
+        assert component.executions == 1
+        assert command.cache.info().hits == 1
+        # cached results can be looked up without executing the command
+        assert command.cache.lookup(([3], 'value'), {}) == (True, 'value')
+        assert command.cache.lookup(([3], 'other'), {}) == (False, None)
+        assert command.cache.info().hits == 2 and command.cache.info().misses == 1
+
+    def test_command_stream(self):
+        """
+        Check that generator commands stream items on demand, in an executor if provided
+        """
+        component: Streamed = Streamed()
+        command: Command = Command(component.lines)
+        assert command.streaming and not command.coroutine
+
+        async def consume(executor: Optional[ThreadPoolExecutor] = None) -> list:
+            stream: Stream = await command.run(command.signature.bind(3), executor)
+            assert isinstance(stream, Stream)
+            # nothing is produced until the consumer asks
+            assert component.produced == []
+            items: list = list()
+            async for item in stream:
+                # the command only advances one item ahead of the consumer
+                assert component.produced == items + [item]
+                items.append(item)
+            assert stream.closed
+            return items
+
+        assert asyncio.run(consume()) == [0, 1, 2]
+        component.produced.clear()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert asyncio.run(consume(executor)) == [0, 1, 2]
+
+    def test_command_stream_async(self):
+        """
+        Check that async generator commands run inline, wrap their errors and run their cleanup on close
+        """
+        component: Streamed = Streamed()
+        command: Command = Command(component.alines)
+        assert command.streaming and command.policy is ExecutionPolicy.INLINE
+
+        async def consume(count: int) -> list:
+            items: list = list()
+            async with await command.run(command.signature.bind(count)) as stream:
+                async for item in stream:
+                    items.append(item)
+                    if len(items) == 2: break
+            return items
+
+        # closing a stream early runs the command's cleanup
+        assert asyncio.run(consume(5)) == [0, 1]
+        assert component.closed
+
+        async def fail() -> list:
+            return [item async for item in await command.run(command.signature.bind(5))]
+
+        with pytest.raises(CommandError):
+            asyncio.run(fail())
+
+    def test_command_timeout(self):
+        """
+        Check that commands running past their timeout are cancelled, with method timeouts taking precedence
+        """
+        component: Slow = Slow()
+        hang: Command = Command(component.hang)
+        assert hang.timeout == 0.05
+        with pytest.raises(CommandTimeoutError):
+            asyncio.run(hang.run(hang.signature.bind()))
+        # the command observed the cancellation
+        assert component.cancelled
+        quick: Command = Command(component.quick)
+        assert quick.timeout == 1
+        assert asyncio.run(quick.run(quick.signature.bind())) == 'done'
+
+    def test_command_timeout_stream(self):
+        """
+        Check that the items of a streaming command are bounded by its timeout
+        """
+        component: Slow = Slow()
+        drip: Command = Command(component.drip)
+
+        async def consume() -> Stream:
+            stream: Stream = await drip.run(drip.signature.bind())
+            assert await stream.__anext__() == 'first'
+            with pytest.raises(CommandTimeoutError):
+                await stream.__anext__()
+            return stream
+
+        assert asyncio.run(consume()).closed
+        # the command observed the cancellation
+        assert component.cancelled
@@ -0,0 +1,219 @@
+import configparser
+import os
+import pathlib
+import time
+import pytest
+from router.configuration import Backend, Configuration, ConfigurationFile, MemoryBackend, Section, SQLiteBackend
+
+class TestConfiguration:
+
+    def test_configuration_set_and_delete(self, tmp_path: pathlib.Path):
+        """
+        Check that section entries are written to the file and can be deleted
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        configuration: Configuration = Configuration(reference)
+        configuration['general'] = Section('general', configuration._parser, reference)
+        configuration['general']['key'] = 'value'
+        assert 'key = value' in reference.read_text()
+        del configuration['general']['key']
+        assert 'key' not in reference.read_text()
+
+    def test_configuration_cached_reads(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+        """
+        Check that cached reads only parse the file when it changes
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\nkey = value\n')
+        configuration: Configuration = Configuration(reference, cached=True)
+        reads: list = list()
+        read = configparser.ConfigParser.read
+        monkeypatch.setattr(configparser.ConfigParser, 'read', lambda parser, *args, **kwargs: reads.append(args) or read(parser, *args, **kwargs))
+        for _ in range(10): assert configuration['general']['key'] == 'value'
+        assert not reads
+        # an external change is picked up on the next read
+        reference.write_text('[general]\nkey = changed value\n')
+        os.utime(reference, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        assert configuration['general']['key'] == 'changed value'
+        assert len(reads) == 1
+
+    def test_configuration_write_behind(self, tmp_path: pathlib.Path):
+        """
+        Check that cached writes are deferred until flushed
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\n')
+        configuration: Configuration = Configuration(reference, cached=True)
+        for index in range(10): configuration['general'][f'key_{index}'] = str(index)
+        assert 'key_0' not in reference.read_text()
+        configuration.flush()
+        assert 'key_9 = 9' in reference.read_text()
+
+    def test_configuration_flush_interval(self, tmp_path: pathlib.Path):
+        """
+        Check that cached writes are flushed after the flush interval
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\n')
+        configuration: Configuration = Configuration(reference, cached=True, flush_interval=0.01)
+        configuration['general']['key'] = 'value'
+        deadline: float = time.monotonic() + 5
+        while 'key' not in reference.read_text() and time.monotonic() < deadline: time.sleep(0.01)
+        assert 'key = value' in reference.read_text()
+
+    def test_configuration_transaction(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+        """
+        Check that a transaction commits many changes with one read and one write
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\nstale = value\n')
+        configuration: Configuration = Configuration(reference)
+        writes: list = list()
+        write = ConfigurationFile.__write__
+        monkeypatch.setattr(ConfigurationFile, '__write__', lambda file: writes.append(file) or write(file))
+        with configuration.transaction():
+            section: Section = configuration['general']
+            with section.batch():
+                for index in range(10): section[f'key_{index}'] = str(index)
+                del section['stale']
+        assert len(writes) == 1
+        text: str = reference.read_text()
+        assert 'key_9 = 9' in text and 'stale' not in text
+
+    def test_configuration_transaction_rollback(self, tmp_path: pathlib.Path):
+        """
+        Check that a failed transaction discards its changes
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\nkey = value\n')
+        configuration: Configuration = Configuration(reference)
+        with pytest.raises(RuntimeError):
+            with configuration['general'].batch():
+                configuration['general']['key'] = 'changed'
+                raise RuntimeError()
+        assert configuration['general']['key'] == 'value'
+        assert 'key = value' in reference.read_text()
+
+    def test_configuration_shared_reads(self, tmp_path: pathlib.Path):
+        """
+        Check that shared configurations observe each other's committed changes
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\nkey = value\n')
+        first: Configuration = Configuration(reference, shared=True)
+        second: Configuration = Configuration(reference, shared=True)
+        versions: list = list()
+        second.subscribe(versions.append)
+        first['general']['key'] = 'changed'
+        assert second['general']['key'] == 'changed'
+        assert versions == [1]
+        # an unchanged version is not read or notified again
+        assert second['general']['key'] == 'changed'
+        assert versions == [1]
+
+    def test_configuration_shared_writes(self, tmp_path: pathlib.Path):
+        """
+        Check that shared writes merge with changes committed by others instead of clobbering them
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\n')
+        first: Configuration = Configuration(reference, shared=True)
+        second: Configuration = Configuration(reference, shared=True)
+        first['general']['first'] = '1'
+        second['general']['second'] = '2'
+        text: str = reference.read_text()
+        assert 'first = 1' in text and 'second = 2' in text
+        assert first['general']['second'] == '2'
+
+    def test_configuration_shared_sections(self, tmp_path: pathlib.Path):
+        """
+        Check that shared configurations follow sections removed by others
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\nkey = value\n[extra]\nkey = value\n')
+        first: Configuration = Configuration(reference, shared=True)
+        second: Configuration = Configuration(reference, shared=True)
+        del first['extra']
+        with pytest.raises(KeyError):
+            second['extra']
+        assert list(second) == ['general']
+
+    def test_configuration_shared_watch(self, tmp_path: pathlib.Path):
+        """
+        Check that a watching shared configuration is notified of changes without reading
+        """
+        reference: pathlib.Path = tmp_path.joinpath('settings.ini')
+        reference.write_text('[general]\nkey = value\n')
+        first: Configuration = Configuration(reference, shared=True)
+        second: Configuration = Configuration(reference, shared=True)
+        versions: list = list()
+        second.subscribe(versions.append)
+        second.watch(0.01)
+        try:
+            first['general']['key'] = 'changed'
+            deadline: float = time.monotonic() + 5
+            while not versions and time.monotonic() < deadline: time.sleep(0.01)
+            assert versions == [1]
+        finally:
+            second.close()
+
+
+def _backend(kind: str, tmp_path: pathlib.Path) -> Backend:
+    if kind == 'memory': return MemoryBackend()
+    return SQLiteBackend(tmp_path.joinpath('settings.db'))
+
+
+class TestBackend:
+
+    @pytest.mark.parametrize('kind', ['memory', 'sqlite'])
+    def test_backend_section_semantics(self, kind: str, tmp_path: pathlib.Path):
+        """
+        Check that sections behave the same over every backend
+        """
+        configuration: Configuration = Configuration(tmp_path.joinpath('settings.ini'), backend=_backend(kind, tmp_path))
+        configuration['general'] = Section('general', None, tmp_path, configuration._backend)
+        section: Section = configuration['general']
+        section['Key'] = 'value'
+        section['other'] = 'other value'
+        assert section['key'] == 'value'
+        assert list(section) == ['key', 'other']
+        assert len(section) == 2
+        del section['KEY']
+        with pytest.raises(KeyError):
+            section['key']
+        with pytest.raises(KeyError):
+            del section['key']
+        del configuration['general']
+        assert 'general' not in configuration
+        with pytest.raises(configparser.NoSectionError):
+            section['other'] = 'value'
+
+    @pytest.mark.parametrize('kind', ['memory', 'sqlite'])
+    def test_backend_transaction_rollback(self, kind: str, tmp_path: pathlib.Path):
+        """
+        Check that a failed batch discards its changes on every backend
+        """
+        configuration: Configuration = Configuration(tmp_path.joinpath('settings.ini'), backend=_backend(kind, tmp_path))
+        configuration['general'] = Section('general', None, tmp_path, configuration._backend)
+        configuration['general']['key'] = 'value'
+        with pytest.raises(RuntimeError):
+            with configuration['general'].batch():
+                configuration['general']['key'] = 'changed'
+                configuration['general']['added'] = 'value'
+                raise RuntimeError()
+        assert dict(configuration['general'].items()) == {'key': 'value'}
+
+    def test_backend_sqlite_import(self, tmp_path: pathlib.Path):
+        """
+        Check that an INI file imported into a SQLite backend persists across connections
+        """
+        source: pathlib.Path = tmp_path.joinpath('settings.ini')
+        source.write_text('[general]\nkey = value\npath = %(home)s/bin\n[empty]\n')
+        backend: SQLiteBackend = SQLiteBackend(tmp_path.joinpath('settings.db'))
+        assert backend.import_ini(source) == 2
+        backend.close()
+        configuration: Configuration = Configuration(tmp_path.joinpath('settings.db'), backend=SQLiteBackend(tmp_path.joinpath('settings.db')))
+        assert list(configuration) == ['general', 'empty']
+        assert configuration['general']['path'] == '%(home)s/bin'
+        assert len(configuration['empty']) == 0
+        configuration.close()
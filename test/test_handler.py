@@ -1,7 +1,221 @@
+import asyncio
+import os
 import pathlib
+import threading
+import time
 from pathlib import Path
+from typing import AsyncIterator, List
 import pytest
-from router.handler import Handler, HandlerLoadError
+from router.handler import Handler, HandlerError, HandlerExecutionError, HandlerLoadError, HandlerLookupError, HandlerOverloadError, HandlerTimeoutError, MissingCommandError
+from router.index import CommandIndex
+from router.instrumentation import Metrics
+from router.packaging import Manifest, Stream
+
+PACKAGE: str = '''
+from router.packaging import execution_policy
+
+class Sample:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def record(self, calls, value):
+        calls.append(value)
+
+    async def arecord(self, calls, value):
+        calls.append(value)
+
+    def echo(self, calls, value):
+        return value
+
+    @execution_policy('thread')
+    def threaded(self, calls, value):
+        import threading
+        calls.append(threading.current_thread().name)
+
+    @execution_policy('process')
+    def processed(self, calls, value):
+        import os
+        return os.getpid(), value
+
+    async def delay(self, calls, value):
+        import asyncio
+        await asyncio.sleep(float(value))
+        calls.append(value)
+
+    async def abort(self, calls):
+        import asyncio
+        raise asyncio.CancelledError()
+'''
+
+CONFLICT: str = '''
+class Component{index}:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def shared(self):
+        pass
+
+    def unique_{index}(self):
+        pass
+'''
+
+INHERITED: str = '''
+class Base:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def base(self):
+        pass
+
+class Child(Base):
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def child(self):
+        pass
+'''
+
+ALIASED: str = '''
+from router.packaging import alias
+
+class Sample:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @alias('rec', 'log')
+    def record(self, calls, value):
+        calls.append(value)
+
+    def remove(self, calls, value):
+        calls.remove(value)
+'''
+
+LIMITED: str = '''
+import asyncio
+from router.packaging import execution_policy, limit, memoize
+
+class Single:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @limit(concurrency=1, queue=1, timeout=5)
+    async def queued(self, calls, value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+
+    @limit(rate=1, burst=2)
+    def rated(self, calls, value):
+        calls.append(value)
+
+    @limit(concurrency=1)
+    @execution_policy('thread')
+    def blocking(self, calls, value):
+        calls.wait(5)
+
+    @limit(concurrency=1)
+    @memoize(key=lambda calls, value: value)
+    async def lookup(self, calls, value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value
+
+@limit(concurrency=1)
+class Shared:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def first(self, calls, value):
+        await asyncio.sleep(0.01)
+
+    async def second(self, calls, value):
+        await asyncio.sleep(0.01)
+'''
+
+STREAMED: str = '''
+import asyncio
+from router.packaging import limit
+
+class Report:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @limit(concurrency=1)
+    async def rows(self, calls, count: int):
+        for index in range(count):
+            await asyncio.sleep(0)
+            yield f'row {index}'
+
+    def broken(self, calls):
+        yield 'first'
+        raise ValueError('failed')
+
+    @limit(concurrency=1)
+    async def drip(self, calls):
+        yield 'first'
+        await asyncio.sleep(10)
+        yield 'second'
+'''
+
+VERSIONED: str = '''
+from router.packaging import execution_policy
+
+class Versioned{index}:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @execution_policy('process')
+    def version_{index}(self):
+        return '{version}'
+
+    @execution_policy('process')
+    def crash_{index}(self):
+        import os
+        os._exit(1)
+'''
+
+FLAKY: str = '''
+class Ping:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def ping(self):
+        return 'pong'
+
+class Query:
+
+    def __init__(self, *args, fail=False, **kwargs):
+        if fail: raise ConnectionError('unavailable')
+
+    def query(self):
+        return 'result'
+'''
+
+PROBED: str = '''
+class Probed:
+
+    def __init__(self, *args, **kwargs):
+        self.probes = list()
+
+    @property
+    def probe(self):
+        self.probes.append('probe')
+
+    def first(self):
+        return 'first'
+
+    def second(self):
+        return 'second'
+'''
 
 class TestHandler:
     
@@ -24,4 +238,629 @@ class TestHandler:
         # initialize Handler instance
         handler: Handler = Handler()
         # load the test component folder
-        handler.load(test_components)
\ No newline at end of file
+        handler.load(test_components)
+
+    def test_handler_dispatch_table(self, tmp_path: pathlib.Path):
+        """
+        Check that loaded commands are dispatched through the dispatch table
+        """
+        # write a package file with a sync and an async command
+        reference: pathlib.Path = tmp_path.joinpath('sample.py')
+        reference.write_text(PACKAGE)
+        # initialize Handler instance
+        handler: Handler = Handler()
+        # load the package folder
+        handler.load(tmp_path)
+        # dispatch both commands
+        calls: List[str] = list()
+        asyncio.run(handler.process('record -value first', args=[calls]))
+        asyncio.run(handler.process('arecord -value second', args=[calls]))
+        assert calls == ['first', 'second']
+        # command results are returned
+        assert asyncio.run(handler.process('echo -value third', args=[calls])) == 'third'
+        # check the prepared invokers
+        assert handler._dispatch['record'].coroutine is False
+        assert handler._dispatch['arecord'].coroutine is True
+
+    def test_handler_lookup_error(self):
+        """
+        Check that dispatching an unknown command raises a lookup error
+        """
+        handler: Handler = Handler()
+        with pytest.raises(HandlerLookupError):
+            asyncio.run(handler.process('missing -value x'))
+
+    def test_handler_process_many(self, tmp_path: pathlib.Path):
+        """
+        Check that batches are dispatched concurrently and yielded in order or as completed
+        """
+        # write a package file with a delayed command
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        messages: List[str] = ['delay -value 0.05', 'delay -value 0.01', 'missing -value x', '', 'abort']
+
+        async def collect(ordered: bool) -> List:
+            return [outcome async for outcome in handler.process_many(messages, args=[list()], concurrency=4, ordered=ordered)]
+
+        outcomes = asyncio.run(collect(True))
+        assert [index for index, _ in outcomes] == [0, 1, 2, 3, 4]
+        assert isinstance(outcomes[2][1], HandlerLookupError)
+        assert isinstance(outcomes[3][1], HandlerError)
+        # a command cancelled on its own does not abort the batch
+        assert isinstance(outcomes[4][1], asyncio.CancelledError)
+        outcomes = asyncio.run(collect(False))
+        assert sorted(index for index, _ in outcomes) == [0, 1, 2, 3, 4]
+        assert outcomes[-1][0] == 0
+
+        async def cancel() -> List[str]:
+            values: List[str] = list()
+            batch: AsyncIterator = handler.process_many(['delay -value 10', 'record -value x'], args=[values])
+            task: asyncio.Task = asyncio.ensure_future(batch.__anext__())
+            await asyncio.sleep(0.01)
+            # cancelling the consumer cancels the command it awaits
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await batch.aclose()
+            await asyncio.sleep(0.01)
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+            return values
+
+        assert asyncio.run(cancel()) == ['x']
+
+    def test_handler_process_many_path(self, tmp_path: pathlib.Path):
+        """
+        Check that batches reuse cached message plans and notify the hooks like process()
+        """
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler(message_cache=4)
+        handler.load(tmp_path)
+        messages: List[str] = ['echo -value a', 'echo -value a', 'echo -value a', '']
+
+        async def collect() -> List:
+            return [outcome async for _, outcome in handler.process_many(messages, args=[list()], concurrency=1)]
+
+        assert asyncio.run(collect())[:3] == ['a', 'a', 'a']
+        assert handler._messages.info().hits == 2
+        metrics: Metrics = handler.add_hook(Metrics())
+        outcomes: List = asyncio.run(collect())
+        assert isinstance(outcomes[3], MissingCommandError)
+        assert handler._messages.info().hits == 5
+        snapshot = metrics.snapshot()
+        assert snapshot['commands']['sample.Sample.echo']['calls'] == 3
+        # parse failures are observed too
+        assert snapshot['unparsed'] == 1
+
+    def test_handler_thread_policy(self, tmp_path: pathlib.Path):
+        """
+        Check that thread policy commands are offloaded to the handler's thread pool
+        """
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler(thread_workers=1)
+        handler.load(tmp_path)
+        names: List[str] = list()
+        try:
+            asyncio.run(handler.process('threaded -value x', args=[names]))
+        finally:
+            handler.shutdown()
+        assert names[0].startswith('router')
+
+    def test_handler_process_policy(self, tmp_path: pathlib.Path):
+        """
+        Check that process policy commands of loaded packages run in the handler's process pool
+        """
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler(process_workers=1)
+        handler.load(tmp_path)
+        try:
+            pid, value = asyncio.run(handler.process('processed -value x', args=[list()]))
+        finally:
+            handler.shutdown()
+        assert pid != os.getpid()
+        assert value == 'x'
+
+    def test_handler_process_policy_reload(self, tmp_path: pathlib.Path):
+        """
+        Check that the process pool is recycled once packages are imported lazily, changed or added
+        """
+        for index in range(2):
+            tmp_path.joinpath(f'versioned_{index}.py').write_text(VERSIONED.format(index=index, version='v1'))
+        handler: Handler = Handler(lazy=True, process_workers=1)
+        handler.load(tmp_path)
+
+        async def versions(*indices: int) -> List[str]:
+            return [await handler.process(f'version_{index}') for index in indices]
+
+        try:
+            # the second package is imported after the pool forked
+            assert asyncio.run(versions(0, 1)) == ['v1', 'v1']
+            tmp_path.joinpath('versioned_1.py').write_text(VERSIONED.format(index=1, version='v2'))
+            tmp_path.joinpath('versioned_2.py').write_text(VERSIONED.format(index=2, version='v1'))
+            handler.reload()
+            assert asyncio.run(versions(0, 1, 2)) == ['v1', 'v2', 'v1']
+            # a change that fails to import keeps the previous version running in the pool
+            tmp_path.joinpath('versioned_1.py').write_text('class Broken(:\n')
+            assert handler.reload() == {}
+            assert asyncio.run(versions(1)) == ['v2']
+            # a pool broken by a worker dying is replaced
+            with pytest.raises(HandlerExecutionError):
+                asyncio.run(handler.process('crash_0'))
+            assert asyncio.run(versions(0)) == ['v1']
+        finally:
+            handler.shutdown()
+
+    def test_handler_parallel_load(self, tmp_path: pathlib.Path):
+        """
+        Check that parallel loading registers the same commands as sequential loading
+        """
+        # write several packages that define a conflicting command
+        for index in range(8):
+            tmp_path.joinpath(f'package_{index}.py').write_text(CONFLICT.format(index=index))
+        sequential: Handler = Handler()
+        sequential_timings = sequential.load(tmp_path)
+        parallel: Handler = Handler(load_workers=4)
+        parallel_timings = parallel.load(tmp_path)
+        assert sorted(parallel_timings) == sorted(sequential_timings) == [f'package_{index}.py' for index in range(8)]
+        assert {name: entry.package for name, entry in parallel._registry.items()} == {name: entry.package for name, entry in sequential._registry.items()}
+        # the last package in filename order wins the conflicting command
+        assert parallel._registry['shared'].package == 'package_7'
+
+    def test_handler_lazy_load(self, tmp_path: pathlib.Path):
+        """
+        Check that lazy loading imports packages on first dispatch only
+        """
+        for index in range(3):
+            tmp_path.joinpath(f'package_{index}.py').write_text(CONFLICT.format(index=index))
+        handler: Handler = Handler(lazy=True)
+        handler.load(tmp_path)
+        # no package is imported at load
+        assert not handler._packages
+        assert set(handler._registry) == {'shared', 'unique_0', 'unique_1', 'unique_2'}
+        # dispatching a command imports only its package
+        asyncio.run(handler.process('unique_0'))
+        assert list(handler._packages) == ['package_0']
+        # the conflicting command still resolves to the last package
+        assert handler._registry['shared'].package == 'package_2'
+        asyncio.run(handler.process('shared'))
+        assert sorted(handler._packages) == ['package_0', 'package_2']
+        assert handler._dispatch['shared'].entry.package == 'package_2'
+        # the index is updated in place as packages are imported, matching a full rebuild
+        names = dict(handler.index.names)
+        handler.__reindex__()
+        assert names == dict(handler.index.names)
+        assert handler.index.resolve('package_0.Component0.uni') is handler._registry['unique_0']
+
+    def test_handler_manifest(self, tmp_path: pathlib.Path):
+        """
+        Check that the manifest caches metadata and is used by lazy loads of unchanged packages
+        """
+        directory: pathlib.Path = tmp_path.joinpath('packages')
+        directory.mkdir()
+        directory.joinpath('inherited.py').write_text(INHERITED)
+        handler: Handler = Handler(manifest=True)
+        handler.load(directory)
+        # the manifest records the introspected metadata, including inherited commands
+        manifest: Manifest = Manifest.for_directory(directory)
+        assert manifest.reference.parent == tmp_path
+        assert manifest.commands(directory.joinpath('inherited.py')) == {'Base': ['base'], 'Child': ['base', 'child']}
+        # a lazy load registers inherited commands from the manifest without importing
+        lazy: Handler = Handler(lazy=True, manifest=True)
+        lazy.load(directory)
+        assert not lazy._packages
+        assert set(lazy._registry) == {'base', 'child'}
+        assert lazy._registry['base'].component == 'Child'
+        # a changed package falls back to static discovery, which cannot see inherited commands
+        directory.joinpath('inherited.py').write_text(INHERITED + '\n# changed\n')
+        assert Manifest.for_directory(directory).commands(directory.joinpath('inherited.py')) is None
+        lazy = Handler(lazy=True, manifest=True)
+        lazy.load(directory)
+        assert lazy._registry['base'].component == 'Base'
+
+    def test_handler_manifest_failures(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+        """
+        Check that records of partially built packages or changed base classes are not used
+        """
+        directory: pathlib.Path = tmp_path.joinpath('packages')
+        directory.mkdir()
+        directory.joinpath('flaky.py').write_text(FLAKY)
+        # a component failing to initialize once is not dropped from later starts
+        Handler(manifest=True).load(directory, 'py', fail=True)
+        assert Manifest.for_directory(directory).commands(directory.joinpath('flaky.py')) is None
+        handler: Handler = Handler(manifest=True)
+        handler.load(directory, 'py')
+        assert set(handler._registry) == {'ping', 'query'}
+        assert Manifest.for_directory(directory).commands(directory.joinpath('flaky.py')) == {'Ping': ['ping'], 'Query': ['query']}
+        # a recorded command that no longer builds falls back to introspection
+        handler = Handler(manifest=True)
+        handler.load(directory, 'py', fail=True)
+        assert set(handler._registry) == {'ping'}
+        # a record is stale once the file defining a base class changes
+        monkeypatch.syspath_prepend(str(tmp_path))
+        tmp_path.joinpath('manifest_base.py').write_text('class Shared:\n\n    def shared(self):\n        pass\n')
+        directory.joinpath('derived.py').write_text('from manifest_base import Shared\n\nclass Derived(Shared):\n\n    def __init__(self, *args, **kwargs):\n        pass\n')
+        Handler(manifest=True).load(directory, 'py')
+        assert Manifest.for_directory(directory).commands(directory.joinpath('derived.py')) == {'Derived': ['shared']}
+        tmp_path.joinpath('manifest_base.py').write_text('class Shared:\n\n    def shared(self):\n        pass\n\n    def other(self):\n        pass\n')
+        assert Manifest.for_directory(directory).commands(directory.joinpath('derived.py')) is None
+
+    def test_handler_manifest_eager(self, tmp_path: pathlib.Path):
+        """
+        Check that eager loads of unchanged packages skip introspection and leave the manifest untouched
+        """
+        directory: pathlib.Path = tmp_path.joinpath('packages')
+        directory.mkdir()
+        directory.joinpath('probed.py').write_text(PROBED)
+        Handler(manifest=True).load(directory)
+        manifest: Manifest = Manifest.for_directory(directory)
+        written: int = manifest.reference.stat().st_mtime_ns
+        handler: Handler = Handler(manifest=True)
+        handler.load(directory)
+        # members are looked up by their recorded names, so the property is not evaluated by a scan
+        probes: List[str] = handler._packages['probed']['Probed'].instance.probes
+        assert probes == []
+        assert set(handler._registry) == {'first', 'second'}
+        assert asyncio.run(handler.process('first')) == 'first'
+        # fresh records are neither described again nor written
+        assert manifest.reference.stat().st_mtime_ns == written
+
+    def test_handler_reload(self, tmp_path: pathlib.Path):
+        """
+        Check that reloading applies added, changed and removed packages
+        """
+        for index in range(2):
+            tmp_path.joinpath(f'package_{index}.py').write_text(CONFLICT.format(index=index))
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        assert handler.reload() == {}
+        unchanged = handler._dispatch['unique_0']
+        # change a package, add a package and remove a package
+        tmp_path.joinpath('package_1.py').write_text(CONFLICT.format(index=1) + '\n    def extra(self):\n        pass\n')
+        tmp_path.joinpath('package_2.py').write_text(CONFLICT.format(index=2))
+        assert handler.reload() == {'package_1.py': 'changed', 'package_2.py': 'added'}
+        assert {'extra', 'unique_2'} <= set(handler._dispatch)
+        assert handler._registry['shared'].package == 'package_2'
+        # invokers of unaffected packages are kept
+        assert handler._dispatch['unique_0'] is unchanged
+        tmp_path.joinpath('package_2.py').unlink()
+        assert handler.reload() == {'package_2.py': 'removed'}
+        assert 'unique_2' not in handler._dispatch
+        # the conflicting command falls back to the previous package
+        assert handler._registry['shared'].package == 'package_1'
+        # an added package is registered in filename order, not after the packages already loaded
+        tmp_path.joinpath('package_05.py').write_text(CONFLICT.format(index=5))
+        assert handler.reload() == {'package_05.py': 'added'}
+        assert handler._registry['shared'].package == 'package_1'
+
+    def test_handler_watch(self, tmp_path: pathlib.Path):
+        """
+        Check that watching imports changed packages off the event loop and swaps them in
+        """
+        tmp_path.joinpath('package_0.py').write_text(CONFLICT.format(index=0))
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+
+        async def watch() -> None:
+            task: asyncio.Task = asyncio.ensure_future(handler.watch(0.01))
+            tmp_path.joinpath('package_1.py').write_text('import threading\nIMPORTER = threading.current_thread()\n' + CONFLICT.format(index=1))
+            for _ in range(200):
+                await asyncio.sleep(0.01)
+                if 'unique_1' in handler._dispatch: break
+            task.cancel()
+
+        asyncio.run(watch())
+        assert handler._registry['shared'].package == 'package_1'
+        assert handler._packages['package_1']._module.IMPORTER is not threading.main_thread()
+
+    def test_handler_namespaced_names(self, tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture):
+        """
+        Check that overridden commands warn and stay reachable by their namespaced names
+        """
+        for index in range(2):
+            tmp_path.joinpath(f'package_{index}.py').write_text(CONFLICT.format(index=index))
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        assert 'Command shared of package package_1 overrides package package_0' in caplog.text
+        assert handler._dispatch['shared'].entry.package == 'package_1'
+        assert handler._dispatch['package_0.Component0.shared'].entry.package == 'package_0'
+        asyncio.run(handler.process('package_0.Component0.shared'))
+        # namespaced names of lazily registered commands import their package
+        lazy: Handler = Handler(lazy=True)
+        lazy.load(tmp_path)
+        asyncio.run(lazy.process('package_0.Component0.shared'))
+        assert list(lazy._packages) == ['package_0']
+        assert lazy._registry['shared'].package == 'package_1'
+
+    def test_handler_aliases_and_prefixes(self, tmp_path: pathlib.Path):
+        """
+        Check that aliases and, when enabled, unique prefixes resolve to their commands
+        """
+        tmp_path.joinpath('aliased.py').write_text(ALIASED)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        values: List[str] = list()
+        asyncio.run(handler.process('rec -value first', args=[values]))
+        asyncio.run(handler.process('log -value second', args=[values]))
+        assert values == ['first', 'second']
+        # prefixes only resolve when enabled
+        with pytest.raises(HandlerLookupError):
+            asyncio.run(handler.process('reco -value third', args=[values]))
+        prefixed: Handler = Handler(prefix_matching=True)
+        prefixed.load(tmp_path)
+        asyncio.run(prefixed.process('reco -value third', args=[values]))
+        asyncio.run(prefixed.process('rem -value third', args=[values]))
+        assert values == ['first', 'second']
+        # a prefix shared by several commands is ambiguous
+        with pytest.raises(HandlerLookupError):
+            asyncio.run(prefixed.process('re -value third', args=[values]))
+
+    def test_handler_lookup_suggestions(self, tmp_path: pathlib.Path):
+        """
+        Check that lookup errors suggest similar command names
+        """
+        tmp_path.joinpath('aliased.py').write_text(ALIASED)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        with pytest.raises(HandlerLookupError) as error:
+            asyncio.run(handler.process('recrod -value x', args=[list()]))
+        assert error.value.suggestions[0] == 'record'
+        assert "Did you mean 'record'" in str(error.value)
+        with pytest.raises(HandlerLookupError) as error:
+            asyncio.run(handler.process('zzz'))
+        assert error.value.suggestions == []
+        # trigrams shared by most names do not pull every name into the candidates
+        index: CommandIndex = CommandIndex({f'command_{number}': number for number in range(1000)})
+        assert index.suggest('command_42x')[0] == 'command_42'
+        assert index.suggest('command_') == []
+        index.discard('command_42')
+        assert 'command_42' not in index.suggest('command_42x')
+        assert index.resolve('command_99') == 99
+        assert index.resolve('comm') is None
+        index.add('component', -1)
+        assert index.resolve('compo') == -1
+
+    def test_handler_limits(self, tmp_path: pathlib.Path):
+        """
+        Check that command and component limits queue and shed calls
+        """
+        tmp_path.joinpath('limited.py').write_text(LIMITED)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+
+        async def burst(messages: List[str]) -> List[object]:
+            values: List[str] = list()
+            return await asyncio.gather(*(handler.process(message, args=[values]) for message in messages), return_exceptions=True)
+
+        # one call runs, one waits in the queue and the third is shed
+        outcomes: List[object] = asyncio.run(burst([f'queued -value {index}' for index in range(3)]))
+        assert [type(outcome) for outcome in outcomes] == [type(None), type(None), HandlerOverloadError]
+        # the bucket admits the burst, then sheds until a token is due
+        outcomes = asyncio.run(burst([f'rated -value {index}' for index in range(3)]))
+        assert [type(outcome) for outcome in outcomes] == [type(None), type(None), HandlerOverloadError]
+        # a component limit is shared by its commands
+        outcomes = asyncio.run(burst(['first -value x', 'second -value x']))
+        assert isinstance(outcomes[1], HandlerOverloadError)
+        # slots are released after each call
+        assert handler._dispatch['queued'].limiters[0].active == 0
+        assert handler._dispatch['first'].limiters[0].active == 0
+
+    def test_handler_footprint(self, tmp_path: pathlib.Path):
+        """
+        Check that registry objects are slotted and the footprint attributes bytes per package, component and command
+        """
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        invoker: object = handler._dispatch['record']
+        # registry and command objects carry no instance dictionary
+        for obj in (invoker, invoker.entry, invoker.command, invoker.binder, handler._packages['sample'], handler._packages['sample']['Sample']):
+            assert not hasattr(obj, '__dict__')
+        footprint = handler.footprint()
+        snapshot = footprint.snapshot()
+        commands = snapshot['packages']['sample']['components']['Sample']['commands']
+        assert set(commands) == {'record', 'arecord', 'echo', 'threaded', 'processed', 'delay', 'abort'}
+        assert all(command['bytes'] > 0 for command in commands.values())
+        # totals add up across levels
+        package = footprint.children['sample']
+        assert package.total == package.bytes + package.children['Sample'].total
+        assert footprint.total == footprint.bytes + package.total
+
+    def test_handler_stream(self, tmp_path: pathlib.Path):
+        """
+        Check that generator commands are processed into streams holding their limits until they end
+        """
+        tmp_path.joinpath('report.py').write_text(STREAMED)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        limiter = handler._dispatch['rows'].limiters[0]
+
+        async def consume() -> List[str]:
+            stream: Stream = await handler.process('rows -count 3', args=[None])
+            # the limiter slot is held while the stream is open
+            assert limiter.active == 1
+            rows: List[str] = [row async for row in stream]
+            assert limiter.active == 0
+            return rows
+
+        assert asyncio.run(consume()) == ['row 0', 'row 1', 'row 2']
+
+        async def close() -> None:
+            async with await handler.process('rows -count 3', args=[None]) as stream:
+                assert await stream.__anext__() == 'row 0'
+            assert limiter.active == 0
+
+        asyncio.run(close())
+
+        async def broken() -> List[str]:
+            return [row async for row in await handler.process('broken', args=[None])]
+
+        # errors raised while streaming are raised like errors raised by running
+        with pytest.raises(HandlerExecutionError):
+            asyncio.run(broken())
+        # streams are returned to hooks as well
+        metrics: Metrics = handler.add_hook(Metrics())
+        assert asyncio.run(consume()) == ['row 0', 'row 1', 'row 2']
+        with pytest.raises(HandlerExecutionError):
+            asyncio.run(broken())
+        assert metrics.snapshot()['commands']['report.Report.rows']['calls'] == 1
+
+    def test_handler_limits_memoized(self, tmp_path: pathlib.Path):
+        """
+        Check that cached results are served without taking a limited command's slots
+        """
+        tmp_path.joinpath('limited.py').write_text(LIMITED)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        limiter = handler._dispatch['lookup'].limiters[0]
+        calls: List[str] = list()
+
+        async def lookup() -> None:
+            assert await handler.process('lookup -value a', args=[calls]) == 'a'
+            # another call holds the only slot
+            running: asyncio.Task = asyncio.ensure_future(handler.process('lookup -value b', args=[calls]))
+            await asyncio.sleep(0.01)
+            assert limiter.active == 1
+            assert await handler.process('lookup -value a', args=[calls]) == 'a'
+            assert limiter.active == 1
+            # calls that miss the cache are still limited
+            with pytest.raises(HandlerOverloadError):
+                await handler.process('lookup -value c', args=[calls])
+            assert await running == 'b'
+
+        asyncio.run(lookup())
+        assert calls == ['a', 'b']
+        assert limiter.active == 0
+
+    def test_handler_timeout_executor(self, tmp_path: pathlib.Path):
+        """
+        Check that a command timing out in an executor holds its limiter slot until its thread finishes
+        """
+        tmp_path.joinpath('limited.py').write_text(LIMITED)
+        handler: Handler = Handler(timeout=0.05)
+        handler.load(tmp_path)
+        limiter = handler._dispatch['blocking'].limiters[0]
+        event: threading.Event = threading.Event()
+
+        async def expire() -> None:
+            with pytest.raises(HandlerTimeoutError):
+                await handler.process('blocking -value x', args=[event])
+            # the thread is still running the command
+            assert limiter.active == 1
+            with pytest.raises(HandlerOverloadError):
+                await handler.process('blocking -value y', args=[event])
+            event.set()
+            for _ in range(100):
+                if limiter.active == 0: break
+                await asyncio.sleep(0.01)
+            assert limiter.active == 0
+
+        asyncio.run(expire())
+        # the slot is free for the next call
+        assert asyncio.run(handler.process('blocking -value z', args=[event])) is None
+
+    def test_handler_stream_timeout(self, tmp_path: pathlib.Path):
+        """
+        Check that the items of a stream are bounded by the call's timeout, and that expiring releases its limits
+        """
+        tmp_path.joinpath('report.py').write_text(STREAMED)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        limiter = handler._dispatch['drip'].limiters[0]
+
+        async def consume(message: str) -> None:
+            stream: Stream = await handler.process(message, args=[None], timeout=0.05)
+            assert await stream.__anext__() == 'first'
+            try:
+                await stream.__anext__()
+            finally:
+                assert stream.closed and limiter.active == 0
+
+        with pytest.raises(HandlerTimeoutError) as error:
+            asyncio.run(consume('drip'))
+        assert error.value.timeout == 0.05
+        # the handler's default timeout bounds streams like the command's own
+        handler = Handler(timeout=0.05)
+        handler.load(tmp_path)
+        limiter = handler._dispatch['drip'].limiters[0]
+        with pytest.raises(HandlerTimeoutError):
+            asyncio.run(consume('drip'))
+
+        async def collect() -> List[str]:
+            return [row async for row in await handler.process('rows -count 3', args=[None])]
+
+        # streams produced in time are unaffected
+        assert asyncio.run(collect()) == ['row 0', 'row 1', 'row 2']
+
+    def test_handler_message_cache(self, tmp_path: pathlib.Path):
+        """
+        Check that repeated messages reuse their cached plans until the registry changes
+        """
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler(message_cache=2)
+        handler.load(tmp_path)
+        values: List[str] = list()
+        for _ in range(3): assert asyncio.run(handler.process('echo -value cached', args=[values])) == 'cached'
+        info = handler.message_cache.info()
+        assert (info.hits, info.misses, info.size) == (2, 1, 1)
+        assert info.hit_rate == pytest.approx(2 / 3)
+        # a different number of positional arguments is validated again
+        with pytest.raises(HandlerExecutionError):
+            asyncio.run(handler.process('echo -value cached', args=[]))
+        # failures to parse or look up are raised on every dispatch
+        for _ in range(2):
+            with pytest.raises(HandlerLookupError):
+                asyncio.run(handler.process('missing', args=[values]))
+        # the least recently used message is evicted
+        asyncio.run(handler.process('record -value other', args=[values]))
+        assert handler.message_cache.info().evictions == 1
+        # registry changes invalidate the cache
+        tmp_path.joinpath('sample.py').write_text(PACKAGE.replace('return value', 'return value.upper()'))
+        handler.load(tmp_path)
+        assert handler.message_cache.info().size == 0
+        assert asyncio.run(handler.process('echo -value cached', args=[values])) == 'CACHED'
+        # plans are reused while hooks observe the calls
+        metrics: Metrics = handler.add_hook(Metrics())
+        hits: int = handler.message_cache.info().hits
+        assert asyncio.run(handler.process('echo -value cached', args=[values])) == 'CACHED'
+        assert handler.message_cache.info().hits == hits + 1
+        plan = handler._messages.get('echo -value cached')
+        assert plan.invoker is handler._dispatch['echo'] and plan.width == 1
+        assert metrics.snapshot()['commands']['sample.Sample.echo']['calls'] == 1
+
+    def test_handler_timeouts(self, tmp_path: pathlib.Path):
+        """
+        Check that handler defaults, per-call timeouts and deadlines cancel calls and release their limits
+        """
+        tmp_path.joinpath('limited.py').write_text(LIMITED)
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler(timeout=0.05)
+        handler.load(tmp_path)
+        values: List[str] = list()
+        assert handler._dispatch['delay'].timeout == 0.05
+        # the handler's default timeout cancels a slow command
+        with pytest.raises(HandlerTimeoutError) as error:
+            asyncio.run(handler.process('delay -value 1', args=[values]))
+        assert error.value.timeout == 0.05
+        assert values == []
+        # a per-call timeout also covers waiting for admission, and releases the slot
+        with pytest.raises(HandlerTimeoutError):
+            asyncio.run(handler.process('queued -value x', args=[values], timeout=0.001))
+        assert handler._dispatch['queued'].limiters[0].active == 0
+        # processing a message names the command in its error like running it
+        with pytest.raises(HandlerTimeoutError) as processed:
+            asyncio.run(handler.process('delay -value 1', args=[values], timeout=0.01))
+        with pytest.raises(HandlerTimeoutError) as ran:
+            asyncio.run(handler.run('delay', [values], {'value': '1'}, timeout=0.01))
+        assert str(processed.value) == str(ran.value) and '-value' not in str(processed.value)
+        # messages without a command name fail to parse rather than time out
+        with pytest.raises(MissingCommandError):
+            asyncio.run(handler.process('', args=[values], deadline=time.monotonic() - 1))
+        # a deadline that already passed fails the call
+        with pytest.raises(HandlerTimeoutError):
+            asyncio.run(handler.run('echo', [values], {'value': 'x'}, deadline=time.monotonic() - 1))
+        assert asyncio.run(handler.run('echo', [values], {'value': 'x'}, deadline=time.monotonic() + 5)) == 'x'
+        # hooks observe command timeouts
+        metrics: Metrics = handler.add_hook(Metrics())
+        with pytest.raises(HandlerTimeoutError):
+            asyncio.run(handler.process('delay -value 1', args=[values]))
+        assert metrics.snapshot()['commands']['sample.Sample.delay']['errors'] == {'HandlerTimeoutError': 1}
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import pathlib
+from typing import Any, List
+import pytest
+from router import Call, Handler, Histogram, Hook, Metrics
+from router.handler import HandlerExecutionError, HandlerLookupError, MissingCommandError
+from router.instrumentation import MISSING
+
+PACKAGE: str = '''
+class Sample:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def echo(self, value):
+        return value
+
+    def fail(self, value):
+        raise ValueError(value)
+'''
+
+class Recorder(Hook):
+
+    def __init__(self) -> None:
+        self.events: List[Any] = list()
+
+    def before(self, call: Call) -> None:
+        self.events.append(('before', call.command))
+
+    def after(self, call: Call, result: Any) -> None:
+        self.events.append(('after', call.command, result))
+
+    def error(self, call: Call, error: BaseException) -> None:
+        self.events.append(('error', call.command, type(error)))
+
+
+class TestInstrumentation:
+
+    def test_histogram_quantiles(self):
+        """
+        Check that histogram quantiles are estimated from their buckets
+        """
+        histogram: Histogram = Histogram()
+        assert histogram.quantile(0.5) is None
+        for _ in range(99): histogram.record(1e-6)
+        histogram.record(1.0)
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 100
+        assert snapshot['p50'] == pytest.approx(1e-6)
+        assert snapshot['max'] == 1.0
+
+    def test_hooks_observe_calls(self, tmp_path: pathlib.Path):
+        """
+        Check that hooks observe successful and failed calls
+        """
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        recorder: Recorder = handler.add_hook(Recorder())
+        assert asyncio.run(handler.process('echo -value x')) == 'x'
+        with pytest.raises(HandlerExecutionError):
+            asyncio.run(handler.process('fail -value x'))
+        with pytest.raises(HandlerLookupError):
+            asyncio.run(handler.run('missing', [], {}))
+        with pytest.raises(MissingCommandError):
+            asyncio.run(handler.process('!'))
+        assert recorder.events == [
+            ('before', 'echo'), ('after', 'echo', 'x'),
+            ('before', 'fail'), ('error', 'fail', HandlerExecutionError),
+            ('before', 'missing'), ('error', 'missing', HandlerLookupError),
+            ('error', None, MissingCommandError),
+        ]
+        # removed hooks are no longer called
+        handler.remove_hook(recorder)
+        asyncio.run(handler.process('echo -value x'))
+        assert len(recorder.events) == 7
+
+    def test_metrics_snapshot(self, tmp_path: pathlib.Path):
+        """
+        Check that metrics count calls and errors and measure each phase
+        """
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        metrics: Metrics = handler.add_hook(Metrics())
+        for _ in range(3): asyncio.run(handler.process('echo -value x'))
+        asyncio.run(handler.run('echo', [], {'value': 'x'}))
+        with pytest.raises(HandlerExecutionError):
+            asyncio.run(handler.process('fail -value x'))
+        snapshot = metrics.snapshot()
+        echo = snapshot['commands']['sample.Sample.echo']
+        assert echo['calls'] == 4 and echo['in_flight'] == 0 and echo['errors'] == {}
+        # parse is only measured for processed messages
+        assert echo['latency']['parse']['count'] == 3
+        assert echo['latency']['bind']['count'] == echo['latency']['execute']['count'] == 4
+        assert snapshot['commands']['sample.Sample.fail']['errors'] == {'HandlerExecutionError': 1}
+        # calls are keyed by qualified name, and misses share a single key
+        asyncio.run(handler.process('sample.Sample.echo -value x'))
+        for name in ('missing', 'other'):
+            with pytest.raises(HandlerLookupError):
+                asyncio.run(handler.process(name))
+        snapshot = metrics.snapshot()
+        assert snapshot['commands']['sample.Sample.echo']['calls'] == 5
+        assert snapshot['commands'][MISSING]['calls'] == 2
+        assert snapshot['commands'][MISSING]['errors'] == {'HandlerLookupError': 2}
+        assert set(snapshot['commands']) == {'sample.Sample.echo', 'sample.Sample.fail', MISSING}
+        assert json.loads(metrics.export()) == json.loads(json.dumps(snapshot))
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+from router.parsing import RegexParser, TokenParser, compile_parser
+
+MESSAGES = [
+    'command',
+    'command -a 1 -b two words -c',
+    'command -k  -x',
+    'command -a -b 1',
+    'command -k  !!! -j 2',
+    'command -k a!! ',
+    'command-k v',
+    'command --k v',
+    'command -k v\n-j w',
+    'command -k é ü',
+    'command -k v -k w',
+    ' command -k v',
+    '',
+    'package.Component.command -k v',
+    'command. -k v',
+    'command..name -k v',
+    '.command -k v',
+]
+
+class TestParsing:
+
+    @pytest.mark.parametrize('message', MESSAGES)
+    def test_token_parser_matches_regex_parser(self, message: str):
+        """
+        Check that the single-pass parser produces the same results as the regex parser
+        """
+        assert TokenParser().parse(message) == RegexParser().parse(message)
+
+    def test_token_parser_namespaced_names(self):
+        """
+        Check that namespaced command names are parsed whole unless the separator is the parameter prefix
+        """
+        assert TokenParser().parse('package.Component.command -k v') == ('package.Component.command', {'k': 'v'})
+        assert TokenParser('.').parse('command.k v') == RegexParser('.').parse('command.k v') == ('command', {'k': 'v'})
+
+    @pytest.mark.parametrize('prefix', ['--', '+', '/'])
+    def test_token_parser_matches_regex_parser_with_prefix(self, prefix: str):
+        """
+        Check that the single-pass parser honors custom parameter prefixes
+        """
+        message: str = f'command {prefix}a 1 {prefix}b two -c 3'
+        assert TokenParser(prefix).parse(message) == RegexParser(prefix).parse(message)
+
+    @pytest.mark.parametrize('prefix', ['-', '--'])
+    def test_token_parser_matches_regex_parser_randomly(self, prefix: str):
+        """
+        Check that the single-pass parser produces the same results as the regex parser on arbitrary messages
+        """
+        generator: random.Random = random.Random(0)
+        for _ in range(2000):
+            message: str = ''.join(generator.choice('ab_1.- \n!é') for _ in range(generator.randint(0, 24)))
+            assert TokenParser(prefix).parse(message) == RegexParser(prefix).parse(message), message
+
+    def test_compile_parser_is_cached(self):
+        """
+        Check that precompiled parsers are shared per parameter prefix
+        """
+        assert compile_parser('-') is compile_parser('-')
+        assert compile_parser('-') is not compile_parser('--')
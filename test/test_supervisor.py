@@ -0,0 +1,96 @@
+import asyncio
+import pathlib
+from typing import List
+import pytest
+from router.handler import Handler, HandlerExecutionError, HandlerLookupError
+from router.supervisor import Routing, Supervisor, SupervisorError, WorkerCrashError
+
+PACKAGE: str = '''
+import os
+
+class Sample:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def pid(self, context, value=None):
+        return os.getpid()
+
+    async def slow(self, context):
+        import asyncio
+        await asyncio.sleep(0.2)
+        return os.getpid()
+
+    def echo(self, context, value):
+        context.append(value)
+        return context
+
+    def fail(self, context):
+        raise ValueError('failed')
+
+    def crash(self, context):
+        os._exit(3)
+'''
+
+class TestSupervisor:
+
+    def __handler__(self, tmp_path: pathlib.Path) -> Handler:
+        tmp_path.joinpath('sample.py').write_text(PACKAGE)
+        handler: Handler = Handler()
+        handler.load(tmp_path)
+        return handler
+
+    def test_supervisor_routing(self, tmp_path: pathlib.Path):
+        """
+        Check that calls run in workers and are routed by command name, key or load
+        """
+        handler: Handler = self.__handler__(tmp_path)
+        with Supervisor(handler, 3) as supervisor:
+
+            async def call() -> List[int]:
+                return await asyncio.gather(*(supervisor.process(f'pid -value {index}', args=[list()]) for index in range(6)))
+
+            # one command always runs in the same worker
+            pids: List[int] = asyncio.run(call())
+            assert len(set(pids)) == 1
+            assert pids[0] in [worker.process.pid for worker in supervisor.workers]
+            # results reflect the worker's copy of the arguments
+            assert asyncio.run(supervisor.run('echo', [['a']], {'value': 'b'})) == ['a', 'b']
+            # a key shards calls consistently
+            first: int = asyncio.run(supervisor.process('pid', args=[None], key='user-1'))
+            assert all(asyncio.run(supervisor.process('pid', args=[None], key='user-1')) == first for _ in range(3))
+
+        with Supervisor(handler, 3, routing='least_loaded') as supervisor:
+            # concurrent calls spread across workers
+            async def slow() -> List[int]:
+                return await asyncio.gather(*(supervisor.process('slow', args=[None]) for _ in range(6)))
+
+            pids = asyncio.run(slow())
+            assert len(set(pids)) == 3
+
+        with Supervisor(handler, 2, routing=Routing.KEY) as supervisor:
+            with pytest.raises(SupervisorError):
+                asyncio.run(supervisor.process('pid', args=[None]))
+
+    def test_supervisor_errors(self, tmp_path: pathlib.Path):
+        """
+        Check that errors are returned from workers and crashed workers are restarted
+        """
+        handler: Handler = self.__handler__(tmp_path)
+        with Supervisor(handler, 2) as supervisor:
+            with pytest.raises(HandlerLookupError) as error:
+                asyncio.run(supervisor.process('ech -value x', args=[list()]))
+            assert 'echo' in str(error.value)
+            with pytest.raises(HandlerExecutionError):
+                asyncio.run(supervisor.process('fail', args=[None]))
+            # a crash fails the call in flight, then the worker is replaced
+            pid: int = asyncio.run(supervisor.process('pid', args=[None], key=0))
+            with pytest.raises(WorkerCrashError):
+                asyncio.run(supervisor.process('crash', args=[None], key=0))
+            for _ in range(100):
+                if sum(worker.restarts for worker in supervisor.workers) == 1: break
+                asyncio.run(asyncio.sleep(0.01))
+            assert sum(worker.restarts for worker in supervisor.workers) == 1
+            # the replacement serves the crashed worker's shard
+            assert asyncio.run(supervisor.process('pid', args=[None], key=0)) not in (pid, None)
+        assert not supervisor.running